@@ -0,0 +1 @@
+"""Reproducible performance benchmarks for migration-mcp (not shipped with the package)."""
@@ -0,0 +1,126 @@
+"""Compare two benchmark result files produced by :mod:`benchmarks.run`.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.10
+
+Prints the median time and size of every shared metric with the relative change,
+and exits with status 1 when any metric got slower (or larger) than ``--threshold``.
+Timing changes smaller than ``--min-delta`` seconds are treated as noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from .run import SCHEMA_VERSION
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_DELTA = 0.0005
+
+
+def load(path: Path) -> dict[str, Any]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(report, dict) or report.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} is not a version {SCHEMA_VERSION} benchmark results file")
+    return report
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> list[dict[str, Any]]:
+    """One row per metric present in both reports, flagged when it regressed."""
+
+    rows: list[dict[str, Any]] = []
+    old_results, new_results = baseline["results"], current["results"]
+    for name in sorted(old_results.keys() & new_results.keys()):
+        old, new = old_results[name], new_results[name]
+        time_change = _change(old.get("median_s"), new.get("median_s"))
+        size_change = _change(old.get("bytes"), new.get("bytes"))
+        slower = (
+            time_change is not None
+            and time_change > threshold
+            and new["median_s"] - old["median_s"] > min_delta
+        )
+        larger = size_change is not None and size_change > threshold
+        rows.append(
+            {
+                "name": name,
+                "old_s": old.get("median_s"),
+                "new_s": new.get("median_s"),
+                "time_change": time_change,
+                "old_bytes": old.get("bytes"),
+                "new_bytes": new.get("bytes"),
+                "size_change": size_change,
+                "regressed": slower or larger,
+            }
+        )
+    return rows
+
+
+def format_rows(rows: list[dict[str, Any]]) -> str:
+    width = max((len(row["name"]) for row in rows), default=4)
+    lines = [f"{'metric':<{width}}  {'old ms':>10}  {'new ms':>10}  {'time':>8}  {'size':>8}"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<{width}}  {_ms(row['old_s']):>10}  {_ms(row['new_s']):>10}  "
+            f"{_percent(row['time_change']):>8}  {_percent(row['size_change']):>8}"
+            + ("  REGRESSION" if row["regressed"] else "")
+        )
+    return "\n".join(lines)
+
+
+def _change(old: float | None, new: float | None) -> float | None:
+    if old is None or new is None or old <= 0:
+        return None
+    return new / old - 1.0
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.3f}"
+
+
+def _percent(change: float | None) -> str:
+    return "-" if change is None else f"{change:+.1%}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown or growth that counts as a regression (default: 0.10).",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help="Ignore timing changes smaller than this many seconds.",
+    )
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, threshold=args.threshold, min_delta=args.min_delta)
+    print(
+        f"baseline {baseline['meta'].get('commit') or '?'} -> "
+        f"current {current['meta'].get('commit') or '?'}"
+    )
+    print(format_rows(rows))
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,295 @@
+"""Benchmark discovery, route generation and serialization on a synthetic data root.
+
+    python -m benchmarks.run --out results.json           # full suite
+    python -m benchmarks.run --quick --out results.json   # small data, few repeats
+    python -m benchmarks.compare baseline.json results.json
+
+Every metric records timing statistics over ``--repeat`` runs (and a byte size where
+it applies). Results are written as JSON together with the commit, interpreter and
+data spec, so runs from different commits can be compared with
+:mod:`benchmarks.compare`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from migration_mcp import core, vector
+from migration_mcp.catalog import index_path
+from migration_mcp.columnar import sidecar_path
+from migration_mcp.datasets import (
+    DATA_ROOT_ENV,
+    birdcast_tile_index,
+    birdflow_dir,
+    clear_caches,
+    discover_birdcast_tiles,
+    discover_route_datasets,
+    routes_dir,
+)
+from migration_mcp.models import RouteRequest
+from migration_mcp.wire import encode_deckgl_binary
+
+from .synthetic import SyntheticSpec, build_data_root, species_code
+
+SCHEMA_VERSION = 1
+DEFAULT_WAYPOINTS = (20, 100, 500)
+QUICK_SPEC = SyntheticSpec(species=5, points=2_000, tile_dates=2, tile_zoom=3)
+
+Result = dict[str, Any]
+
+
+def measure(
+    func: Callable[[], Any], *, repeat: int, setup: Callable[[], None] | None = None
+) -> Result:
+    """Time ``func`` ``repeat`` times, calling ``setup`` (untimed) before each run."""
+
+    samples: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    ordered = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_s": ordered[0],
+        "median_s": statistics.median(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "p95_s": ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))],
+    }
+
+
+def bench_discovery(root: Path, repeat: int) -> dict[str, Result]:
+    key = str(root)
+    index = index_path(routes_dir(root))
+
+    def cold_scan() -> None:
+        clear_caches()
+        index.unlink(missing_ok=True)
+
+    results = {
+        "discovery.routes.cold_scan": measure(
+            lambda: discover_route_datasets(key), repeat=repeat, setup=cold_scan
+        ),
+        "discovery.routes.cold_indexed": measure(
+            lambda: discover_route_datasets(key), repeat=repeat, setup=clear_caches
+        ),
+        "discovery.routes.warm": measure(lambda: discover_route_datasets(key), repeat=repeat),
+        "discovery.tiles.cold": measure(
+            lambda: discover_birdcast_tiles(key), repeat=repeat, setup=clear_caches
+        ),
+        "discovery.tiles.warm": measure(lambda: discover_birdcast_tiles(key), repeat=repeat),
+        "discovery.tiles.query": measure(
+            lambda: birdcast_tile_index(key).query(bbox=(-100.0, 20.0, -60.0, 50.0), limit=1000),
+            repeat=repeat,
+        ),
+    }
+    results["discovery.tiles.cold"]["items"] = len(discover_birdcast_tiles(key))
+    results["discovery.routes.warm"]["items"] = sum(
+        len(entries) for entries in discover_route_datasets(key).values()
+    )
+    return results
+
+
+def bench_routes(root: Path, waypoints: tuple[int, ...], repeat: int) -> dict[str, Result]:
+    code = species_code(0)
+    path = birdflow_dir(root) / f"{code}.geojson"
+    results: dict[str, Result] = {}
+
+    def first_load() -> None:
+        clear_caches()
+        core.ROUTE_CACHE.clear()
+        sidecar_path(path).unlink(missing_ok=True)
+
+    request = RouteRequest(species_code=code, num_waypoints=DEFAULT_WAYPOINTS[0])
+    results["routes.first_load"] = measure(
+        lambda: core.generate_routes(request), repeat=max(1, repeat // 3), setup=first_load
+    )
+    for count in waypoints:
+        request = RouteRequest(species_code=code, num_waypoints=count)
+        results[f"routes.cold[{count}]"] = measure(
+            lambda request=request: core.generate_routes(request),
+            repeat=repeat,
+            setup=core.ROUTE_CACHE.clear,
+        )
+        results[f"routes.warm[{count}]"] = measure(
+            lambda request=request: core.generate_routes(request), repeat=repeat
+        )
+    return results
+
+
+def bench_serialization(waypoints: tuple[int, ...], repeat: int) -> dict[str, Result]:
+    results: dict[str, Result] = {}
+    for count in waypoints:
+        response = core.generate_routes(
+            RouteRequest(species_code=species_code(0), num_waypoints=count)
+        )
+        encoders: dict[str, Callable[[], bytes]] = {
+            "json": lambda response=response: response.model_dump_json().encode("utf-8"),
+            "json_gzip": lambda response=response: gzip.compress(
+                response.model_dump_json().encode("utf-8"), compresslevel=5
+            ),
+            "deckgl_float64": lambda response=response: encode_deckgl_binary(
+                response.deckgl, response.metadata, "float64"
+            ),
+            "deckgl_float32": lambda response=response: encode_deckgl_binary(
+                response.deckgl, response.metadata, "float32"
+            ),
+        }
+        for name, encode in encoders.items():
+            record = measure(encode, repeat=repeat)
+            record["bytes"] = len(encode())
+            results[f"serialize.{name}[{count}]"] = record
+    return results
+
+
+def bench_http(waypoints: tuple[int, ...], repeat: int) -> dict[str, Result]:
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:  # pragma: no cover - TestClient needs httpx
+        return {}
+
+    from migration_mcp.fastapi_app import create_app
+
+    results: dict[str, Result] = {}
+    with TestClient(create_app(watch=False, warmup=False)) as client:
+        for count in waypoints:
+            body = {"species_code": species_code(0), "num_waypoints": count}
+            # httpx asks for gzip by default; pin the encoding so sizes are comparable.
+            variants = {
+                "json": {"accept-encoding": "identity"},
+                "deckgl": {
+                    "accept": "application/vnd.migration.deckgl",
+                    "accept-encoding": "identity",
+                },
+                "json_gzip": {"accept-encoding": "gzip"},
+            }
+            for name, headers in variants.items():
+
+                def call(body: dict = body, headers: dict = headers) -> bytes:
+                    response = client.post("/routes", json=body, headers=headers)
+                    response.raise_for_status()
+                    return response.content
+
+                call()
+                record = measure(call, repeat=repeat)
+                record["bytes"] = len(_wire_body(client, body, headers))
+                results[f"http.routes.{name}[{count}]"] = record
+    return results
+
+
+def _wire_body(client: Any, body: dict, headers: dict) -> bytes:
+    # httpx decodes Content-Encoding transparently; read the raw bytes instead.
+    with client.stream("POST", "/routes", json=body, headers=headers) as response:
+        return b"".join(response.iter_raw())
+
+
+def run_suite(
+    root: Path, spec: SyntheticSpec, waypoints: tuple[int, ...], repeat: int
+) -> dict[str, Any]:
+    previous = os.environ.get(DATA_ROOT_ENV)
+    os.environ[DATA_ROOT_ENV] = str(root)
+    try:
+        results: dict[str, Result] = {}
+        results.update(bench_discovery(root, repeat))
+        results.update(bench_routes(root, waypoints, repeat))
+        results.update(bench_serialization(waypoints, repeat))
+        results.update(bench_http(waypoints, repeat))
+    finally:
+        if previous is None:
+            os.environ.pop(DATA_ROOT_ENV, None)
+        else:
+            os.environ[DATA_ROOT_ENV] = previous
+        clear_caches()
+        core.ROUTE_CACHE.clear()
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": vector.numpy_enabled(),
+            "spec": asdict(spec),
+            "waypoints": list(waypoints),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, help="Write JSON results here (default: stdout).")
+    parser.add_argument(
+        "--data-root", type=Path, help="Reuse (or create) this synthetic data root."
+    )
+    parser.add_argument("--quick", action="store_true", help="Small data set and few repeats.")
+    parser.add_argument("--species", type=int)
+    parser.add_argument("--points", type=int)
+    parser.add_argument("--individuals", type=int)
+    parser.add_argument("--tile-zoom", type=int)
+    parser.add_argument("--repeat", type=int)
+    parser.add_argument(
+        "--waypoints",
+        default=",".join(map(str, DEFAULT_WAYPOINTS)),
+        help="Comma-separated num_waypoints values.",
+    )
+    args = parser.parse_args(argv)
+
+    base = QUICK_SPEC if args.quick else SyntheticSpec()
+    overrides = {
+        name: getattr(args, name)
+        for name in ("species", "points", "individuals", "tile_zoom")
+        if getattr(args, name) is not None
+    }
+    spec = SyntheticSpec(**{**asdict(base), **overrides})
+    repeat = args.repeat or (5 if args.quick else 20)
+    waypoints = tuple(int(item) for item in args.waypoints.split(",") if item.strip())
+
+    with tempfile.TemporaryDirectory(prefix="migration-bench-") as scratch:
+        root = args.data_root or Path(scratch)
+        if not (birdflow_dir(root) / f"{species_code(0)}.geojson").exists():
+            build_data_root(root, spec)
+        report = run_suite(root, spec, waypoints, repeat)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out is None:
+        print(text)
+    else:
+        args.out.write_text(text + "\n", encoding="utf-8")
+        print(f"wrote {len(report['results'])} results to {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
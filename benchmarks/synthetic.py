@@ -0,0 +1,128 @@
+"""Synthetic data-root generator for benchmarks.
+
+Builds ``N`` species of ``M``-point BirdFlow-style tracks (optionally several
+individuals per file) plus a complete BirdCast ``date/product/level/x/y`` tile tree,
+laid out exactly as the server expects under ``BIRD_MIGRATION_DATA_ROOT``. Output is
+fully determined by the arguments, so runs on different commits see identical data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from migration_mcp.datasets import BIRDCAST_TILES_SUBDIR, BIRDFLOW_SUBDIR
+
+# A 1x1 transparent PNG; tile contents are never decoded by the server.
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+_START = datetime(2023, 3, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    species: int = 20
+    points: int = 5_000
+    individuals: int = 1
+    tile_dates: int = 3
+    tile_products: tuple[str, ...] = ("density",)
+    tile_zoom: int = 4
+    seed: int = 0
+
+
+def species_code(index: int) -> str:
+    return f"synth_{index:04d}"
+
+
+def build_data_root(root: Path, spec: SyntheticSpec) -> dict[str, int]:
+    """Write the synthetic tree under ``root``; returns file and point counts."""
+
+    rng = random.Random(spec.seed)
+    routes = root / BIRDFLOW_SUBDIR
+    routes.mkdir(parents=True, exist_ok=True)
+    for index in range(spec.species):
+        code = species_code(index)
+        features = [_track(rng, spec.points, f"{code}-{bird}") for bird in range(spec.individuals)]
+        payload = {
+            "type": "FeatureCollection",
+            "metadata": {"species_code": code, "generator": "synthetic", "seed": spec.seed},
+            "features": features,
+        }
+        (routes / f"{code}.geojson").write_text(
+            json.dumps(payload, separators=(",", ":")), encoding="utf-8"
+        )
+
+    tiles = 0
+    tiles_root = root / BIRDCAST_TILES_SUBDIR
+    first = date(2024, 4, 1)
+    for offset in range(spec.tile_dates):
+        day = (first + timedelta(days=offset)).isoformat()
+        for product in spec.tile_products:
+            for zoom in range(spec.tile_zoom + 1):
+                for x in range(1 << zoom):
+                    column = tiles_root / day / product / str(zoom) / str(x)
+                    column.mkdir(parents=True, exist_ok=True)
+                    for y in range(1 << zoom):
+                        (column / f"{y}.png").write_bytes(_PNG)
+                        tiles += 1
+    return {
+        "route_files": spec.species,
+        "route_points": spec.species * spec.individuals * spec.points,
+        "tiles": tiles,
+    }
+
+
+def _track(rng: random.Random, points: int, individual: str) -> dict:
+    """A northbound spring track: a gentle meander with hourly ISO timestamps."""
+
+    lon = rng.uniform(-120.0, -70.0)
+    lat = rng.uniform(15.0, 30.0)
+    heading = rng.uniform(-0.3, 0.3)
+    coords: list[list[float]] = []
+    timestamps: list[str] = []
+    for idx in range(points):
+        heading += rng.gauss(0.0, 0.05)
+        lon += 0.02 * math.sin(heading)
+        lat = min(lat + 0.02 * math.cos(heading), 80.0)
+        coords.append([round(lon, 5), round(lat, 5), round(rng.uniform(50.0, 1500.0), 1)])
+        stamp = _START + timedelta(hours=idx)
+        timestamps.append(stamp.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return {
+        "type": "Feature",
+        "id": individual,
+        "properties": {"label": individual, "timestamps": timestamps},
+        "geometry": {"type": "LineString", "coordinates": coords},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic migration data root.")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--species", type=int, default=SyntheticSpec.species)
+    parser.add_argument("--points", type=int, default=SyntheticSpec.points)
+    parser.add_argument("--individuals", type=int, default=SyntheticSpec.individuals)
+    parser.add_argument("--tile-dates", type=int, default=SyntheticSpec.tile_dates)
+    parser.add_argument("--tile-zoom", type=int, default=SyntheticSpec.tile_zoom)
+    parser.add_argument("--seed", type=int, default=SyntheticSpec.seed)
+    args = parser.parse_args(argv)
+    spec = SyntheticSpec(
+        species=args.species,
+        points=args.points,
+        individuals=args.individuals,
+        tile_dates=args.tile_dates,
+        tile_zoom=args.tile_zoom,
+        seed=args.seed,
+    )
+    print(json.dumps(build_data_root(args.root, spec)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,16 +1,83 @@
-"""Migration MCP helper exports."""
+"""Migration MCP helper exports.
 
-from .core import generate_routes, list_datasets, list_tiles, refresh_datasets
-from .fastapi_app import create_app
-from .models import AdminRefreshResponse, RouteRequest, RouteResponse
+Names are imported on first access so that light entry points (``migration-mcp
+--describe``, the catalog helpers) do not pay for FastAPI and pydantic.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .core import (
+        find_routes,
+        generate_routes,
+        generate_routes_batch,
+        list_datasets,
+        list_tiles,
+        refresh_datasets,
+    )
+    from .fastapi_app import create_app
+    from .models import (
+        AdminRefreshResponse,
+        DatasetQuery,
+        RegionQuery,
+        RouteBatchItem,
+        RouteBatchRequest,
+        RouteBatchResponse,
+        RouteRequest,
+        RouteResponse,
+        TileQuery,
+    )
+
+_EXPORTS = {
+    "AdminRefreshResponse": ".models",
+    "DatasetQuery": ".models",
+    "RegionQuery": ".models",
+    "RouteBatchItem": ".models",
+    "RouteBatchRequest": ".models",
+    "RouteBatchResponse": ".models",
+    "RouteRequest": ".models",
+    "RouteResponse": ".models",
+    "TileQuery": ".models",
+    "create_app": ".fastapi_app",
+    "find_routes": ".core",
+    "generate_routes": ".core",
+    "generate_routes_batch": ".core",
+    "list_datasets": ".core",
+    "list_tiles": ".core",
+    "refresh_datasets": ".core",
+}
 
 __all__ = [
     "AdminRefreshResponse",
+    "DatasetQuery",
+    "RegionQuery",
+    "RouteBatchItem",
+    "RouteBatchRequest",
+    "RouteBatchResponse",
     "RouteRequest",
     "RouteResponse",
+    "TileQuery",
     "create_app",
+    "find_routes",
     "generate_routes",
+    "generate_routes_batch",
     "list_datasets",
     "list_tiles",
     "refresh_datasets",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
@@ -1,23 +1,88 @@
-"""Command-line entry point for migration-mcp."""
+"""Command-line entry point for migration-mcp.
+
+MCP hosts spawn this per session, so startup stays light: FastMCP, FastAPI and the
+pydantic models are imported only once a server is actually started, and the
+route/tile catalogs are loaded on a background thread while those imports run.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+import threading
 
-from mcp.server.fastmcp import FastMCP
-
-from .tool import build_tool
+from .datasets import preload_catalog, resolve_data_root
+from .serve import DEFAULT_HOST, DEFAULT_PORT, serve
+from .snapshot import SNAPSHOT_ENV, snapshot_enabled
+from .warmup import WarmupScheduler, warmup_days, warmup_enabled, warmup_species
+from .watch import CatalogWatcher, watch_enabled
 
 SERVICE_NAME = "migration-mcp"
 SERVICE_DESCRIPTION = "Migration route synthesis helpers for MCP agents."
+SHUTDOWN_TIMEOUT = 5.0
+
+
+def _service_options(*, defaults: bool = True) -> argparse.ArgumentParser:
+    """Options shared by the stdio server and ``serve``.
+
+    The copy given to the ``serve`` subparser is built with ``defaults=False``:
+    its defaults are suppressed so options passed before ``serve`` are kept.
+    """
+
+    def default(value: object) -> object:
+        return value if defaults else argparse.SUPPRESS
+
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument(
+        "--watch",
+        action="store_true",
+        default=default(watch_enabled()),
+        help="Watch the data root and refresh catalog entries as files change.",
+    )
+    options.add_argument(
+        "--warmup",
+        action="store_true",
+        default=default(warmup_enabled()),
+        help="Prefetch BirdFlow species and recent BirdCast dates in the background.",
+    )
+    options.add_argument(
+        "--warmup-species",
+        default=default(None),
+        help="Comma-separated species codes to prefetch (defaults to the BirdFlow fallbacks).",
+    )
+    options.add_argument(
+        "--warmup-days",
+        type=int,
+        default=default(None),
+        help="Number of most recent BirdCast dates to prefetch.",
+    )
+    options.add_argument(
+        "--snapshot",
+        action="store_true",
+        default=default(snapshot_enabled()),
+        help="Reuse a serialized catalog snapshot across restarts (see MIGRATION_CATALOG_SNAPSHOT).",
+    )
+    return options
+
+
+def _warmup_scheduler(args: argparse.Namespace) -> WarmupScheduler | None:
+    if not args.warmup:
+        return None
+    species = args.warmup_species.split(",") if args.warmup_species else warmup_species()
+    return WarmupScheduler(
+        resolve_data_root(None),
+        species=[item.strip().lower() for item in species if item.strip()],
+        days=warmup_days() if args.warmup_days is None else args.warmup_days,
+    )
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         prog=SERVICE_NAME,
         description="Run the migration MCP server (STDIO transport).",
+        parents=[_service_options()],
     )
     parser.add_argument(
         "--describe",
@@ -30,12 +95,26 @@ def main(argv: list[str] | None = None) -> int:
         default="stdio",
         help="Transport to use (only stdio is supported today).",
     )
+    commands = parser.add_subparsers(dest="command")
+    serve_parser = commands.add_parser(
+        "serve",
+        parents=[_service_options(defaults=False)],
+        help="Serve the HTTP API with several worker processes sharing one catalog.",
+    )
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind.")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind.")
+    serve_parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes (default: 1)."
+    )
+    serve_parser.add_argument(
+        "--no-precompile",
+        dest="precompile",
+        action="store_false",
+        help="Skip building the catalog index and columnar sidecars before starting workers.",
+    )
     args = parser.parse_args(argv)
 
-    app = FastMCP(SERVICE_NAME, SERVICE_DESCRIPTION)
-    build_tool(app)
-
-    if args.describe:
+    if args.describe and args.command is None:
         metadata = {
             "name": SERVICE_NAME,
             "description": SERVICE_DESCRIPTION,
@@ -43,11 +122,53 @@ def main(argv: list[str] | None = None) -> int:
         }
         print(json.dumps(metadata, indent=2))
         return 0
+    if args.snapshot:
+        # Through the environment so ``serve`` workers pick it up as well.
+        os.environ[SNAPSHOT_ENV] = "1"
+
+    if args.command == "serve":
+        if args.workers < 1:
+            serve_parser.error("--workers must be at least 1")
+        serve(
+            resolve_data_root(None),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            precompile=args.precompile,
+            watch=args.watch,
+            warmup=_warmup_scheduler(args),
+        )
+        return 0
 
     if args.transport != "stdio":
         parser.error("only the stdio transport is supported at the moment")
 
-    app.run()
+    threading.Thread(
+        target=preload_catalog,
+        args=(resolve_data_root(None),),
+        name="migration-preload",
+        daemon=True,
+    ).start()
+    from mcp.server.fastmcp import FastMCP
+
+    from .tool import build_tool
+
+    app = FastMCP(SERVICE_NAME, SERVICE_DESCRIPTION)
+    build_tool(app)
+
+    watcher = CatalogWatcher(resolve_data_root(None)) if args.watch else None
+    if watcher is not None:
+        watcher.start()
+    scheduler = _warmup_scheduler(args)
+    if scheduler is not None:
+        scheduler.start()
+    try:
+        app.run()
+    finally:
+        if watcher is not None:
+            watcher.stop(SHUTDOWN_TIMEOUT)
+        if scheduler is not None:
+            scheduler.stop(SHUTDOWN_TIMEOUT)
     return 0
 
 
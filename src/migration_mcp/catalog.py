@@ -0,0 +1,236 @@
+"""Persistent on-disk index of route datasets for migration MCP."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .env import env_flag
+from .scanner import HeaderError, read_route_header
+
+CATALOG_INDEX_NAME = ".route-catalog.json"
+CATALOG_INDEX_VERSION = 3
+CATALOG_INDEX_ENV = "MIGRATION_CATALOG_INDEX"
+EXTENTS_INDEX_NAME = ".route-extents.json"
+EXTENTS_INDEX_VERSION = 1
+
+# Serialises every read-modify-write of the index files in this process.
+_WRITE_LOCK = threading.RLock()
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    species_code: str
+    path: Path
+    metadata: dict[str, Any]
+    source: str
+    point_count: int | None
+
+
+def index_enabled() -> bool:
+    return env_flag(CATALOG_INDEX_ENV, True)
+
+
+def index_path(routes_root: Path) -> Path:
+    return routes_root / CATALOG_INDEX_NAME
+
+
+def extents_path(routes_root: Path) -> Path:
+    return routes_root / EXTENTS_INDEX_NAME
+
+
+def load_index(routes_root: Path) -> dict[str, dict[str, Any]]:
+    return _load_records(index_path(routes_root), CATALOG_INDEX_VERSION)
+
+
+def save_index(routes_root: Path, records: dict[str, dict[str, Any]]) -> None:
+    _save_records(index_path(routes_root), CATALOG_INDEX_VERSION, records)
+
+
+def scan_routes(routes_root: Path, *, persist: bool | None = None) -> list[CatalogEntry]:
+    """Return catalog entries for every route file, parsing only new or changed files.
+
+    Records are keyed by path relative to ``routes_root`` and validated against the
+    file's ``mtime_ns`` and size, so unchanged files never get opened.
+    """
+
+    if not routes_root.exists():
+        return []
+    persist = index_enabled() if persist is None else persist
+    with _WRITE_LOCK:
+        return _scan_routes(routes_root, persist)
+
+
+def _scan_routes(routes_root: Path, persist: bool) -> list[CatalogEntry]:
+    previous = load_index(routes_root) if persist else {}
+    records: dict[str, dict[str, Any]] = {}
+    entries: list[CatalogEntry] = []
+    dirty = False
+
+    for path in sorted(routes_root.rglob("*.geojson")):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        key = path.relative_to(routes_root).as_posix()
+        record = previous.get(key)
+        if not _is_fresh(record, stat):
+            record = index_file(path, stat)
+            dirty = True
+        records[key] = record
+        entry = entry_from_record(path, record)
+        if entry is not None:
+            entries.append(entry)
+
+    if persist and (dirty or records.keys() != previous.keys()):
+        save_index(routes_root, records)
+    return entries
+
+
+def update_routes(routes_root: Path, paths: list[Path]) -> dict[Path, CatalogEntry | None]:
+    """Re-index ``paths`` in place and return their entries (``None`` when removed)."""
+
+    persist = index_enabled()
+    changes: dict[Path, CatalogEntry | None] = {}
+    with _WRITE_LOCK:
+        records = load_index(routes_root) if persist else {}
+        for path in paths:
+            key = path.relative_to(routes_root).as_posix()
+            try:
+                stat = path.stat()
+            except OSError:
+                records.pop(key, None)
+                changes[path] = None
+                continue
+            record = records.get(key)
+            if not _is_fresh(record, stat):
+                record = index_file(path, stat)
+            records[key] = record
+            changes[path] = entry_from_record(path, record)
+        if persist:
+            save_index(routes_root, records)
+    return changes
+
+
+def stored_extents(routes_root: Path) -> dict[str, tuple[int, int, Any]]:
+    """Return persisted route extents keyed by relative path, with their mtime/size."""
+
+    if not index_enabled():
+        return {}
+    return {
+        key: (record.get("mtime_ns"), record.get("size"), record.get("extent"))
+        for key, record in _load_records(extents_path(routes_root), EXTENTS_INDEX_VERSION).items()
+        if isinstance(record, dict)
+    }
+
+
+def store_extents(
+    routes_root: Path, extents: dict[Path, tuple[os.stat_result, dict[str, Any] | None]]
+) -> None:
+    """Persist computed extents in their own sidecar, next to the catalog index.
+
+    Extents are much larger than catalog records, so they are kept out of
+    ``.route-catalog.json`` and only read when the region index is built.
+    """
+
+    if not extents or not index_enabled():
+        return
+    target = extents_path(routes_root)
+    with _WRITE_LOCK:
+        records = _load_records(target, EXTENTS_INDEX_VERSION)
+        for key in [key for key in records if not (routes_root / key).is_file()]:
+            del records[key]
+        for path, (stat, extent) in extents.items():
+            records[path.relative_to(routes_root).as_posix()] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "extent": extent,
+            }
+        _save_records(target, EXTENTS_INDEX_VERSION, records)
+
+
+def index_file(path: Path, stat: os.stat_result) -> dict[str, Any]:
+    record: dict[str, Any] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    try:
+        header = read_route_header(path)
+    except (OSError, HeaderError):
+        record["invalid"] = True
+        return record
+    metadata = header.metadata or {}
+    record.update(
+        {
+            "species_code": extract_species_code(path, header.as_payload()),
+            "source": "birdflow" if "birdflow" in path.parts else "geojson",
+            "metadata": metadata if isinstance(metadata, dict) else {},
+            "point_count": header.point_count,
+        }
+    )
+    return record
+
+
+def entry_from_record(path: Path, record: dict[str, Any]) -> CatalogEntry | None:
+    if record.get("invalid"):
+        return None
+    return CatalogEntry(
+        species_code=record["species_code"],
+        path=path,
+        metadata=record.get("metadata") or {},
+        source=record["source"],
+        point_count=record.get("point_count"),
+    )
+
+
+def extract_species_code(path: Path, payload: dict[str, Any]) -> str:
+    metadata = payload.get("metadata") or {}
+    species_code = metadata.get("species_code") if isinstance(metadata, dict) else None
+    if not species_code and isinstance(metadata.get("study_id"), str):
+        species_code = path.stem.lower()
+    if not species_code:
+        features = payload.get("features")
+        if isinstance(features, list) and features:
+            props = (
+                (features[0] or {}).get("properties", {}) if isinstance(features[0], dict) else {}
+            )
+            species_code = props.get("species_code") or props.get("taxon")
+    if not species_code:
+        species_code = path.stem
+    return str(species_code).lower()
+
+
+def _is_fresh(record: dict[str, Any] | None, stat: os.stat_result) -> bool:
+    return (
+        isinstance(record, dict)
+        and record.get("mtime_ns") == stat.st_mtime_ns
+        and record.get("size") == stat.st_size
+    )
+
+
+def _load_records(target: Path, version: int) -> dict[str, dict[str, Any]]:
+    try:
+        raw = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("version") != version:
+        return {}
+    entries = raw.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_records(target: Path, version: int, records: dict[str, dict[str, Any]]) -> None:
+    # Every writer gets its own temporary file, so concurrent saves from threads or
+    # worker processes never replace each other's half-written output.
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    body = {"version": version, "entries": records}
+    try:
+        tmp.write_text(json.dumps(body, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, target)
+    except OSError:
+        # A read-only data root still works; we just rescan on the next cold start.
+        with suppress(OSError):
+            tmp.unlink()
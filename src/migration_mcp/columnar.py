@@ -0,0 +1,536 @@
+"""Compiled columnar sidecars for route GeoJSON files.
+
+A sidecar ``<name>.geojson.mcol`` stores every feature's coordinates and timestamps
+as contiguous float64 columns behind a small JSON header, so route generation can
+memory-map the file and gather only the waypoints it needs instead of parsing the
+whole GeoJSON document.
+
+Layout::
+
+    b"MIGCOL1\\n" | uint32 header length | JSON header (space padded) | columns
+
+Columns follow the header in ``header["columns"]`` order, each ``count`` float64
+values in the byte order recorded in the header. Features are stored back to back;
+``header["features"]`` lists each one's ``[start, count]`` and ``header["ordered"]``
+whether its timestamps never decrease.
+
+A level-of-detail pyramid follows the columns: ``count`` cumulative great-circle
+distances (restarting at 0 for each feature), then two ``header["lod"]["count"]``
+long columns holding each feature's Douglas–Peucker ranking (point index and rank,
+most important first, at most :data:`LOD_POINTS` per feature; ``header["lod"]
+["features"]`` gives each one's ``[start, count]``). Any prefix of a ranking is a
+simplification level, so arc-length and Douglas–Peucker resampling cost depends on
+the number of waypoints requested rather than the length of the track.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from . import vector
+from .env import env_flag
+from .resampling import Pyramid, cumulative_distances, douglas_peucker_ranking
+from .route_data import RouteData, Track, freeze, individual_id
+from .time_window import is_ordered
+
+COLUMNAR_SUFFIX = ".mcol"
+COLUMNAR_ENV = "MIGRATION_COLUMNAR"
+COLUMNAR_VERSION = 4
+# Levels stored per feature; covers the largest ``num_waypoints`` a request may ask for.
+LOD_POINTS = 512
+
+_MAGIC = b"MIGCOL1\n"
+_LENGTH = struct.Struct("<I")
+_PREFIX = len(_MAGIC) + _LENGTH.size
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MAX_EXACT_INT = 2**53
+# Source files whose last compile failed, with the (mtime_ns, size) it failed for.
+_FAILED: dict[str, tuple[int, int]] = {}
+_FAILED_LOCK = threading.Lock()
+_PENDING: set[str] = set()
+_PENDING_LOCK = threading.Lock()
+_QUEUE: queue.Queue[Path] = queue.Queue()
+_WORKER: threading.Thread | None = None
+_ISO_FORMATS = (
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%S+00:00",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+
+def columnar_enabled() -> bool:
+    return env_flag(COLUMNAR_ENV, True)
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + COLUMNAR_SUFFIX)
+
+
+class ColumnarFeature:
+    """Zero-copy view of one feature's columns inside a compiled route."""
+
+    def __init__(
+        self,
+        columns: dict[str, memoryview],
+        kinds: dict[str, str],
+        start: int,
+        count: int,
+        ordered: bool = False,
+        lod: dict[str, memoryview] | None = None,
+    ) -> None:
+        self.start = start
+        self.count = count
+        self.ordered = ordered
+        self._kinds = kinds
+        self._columns = columns
+        self._lod = lod or {}
+
+    def column(self, name: str) -> memoryview | None:
+        return self._columns.get(name)
+
+    def pyramid(self, positions: Sequence[int]) -> Pyramid | None:
+        """Level-of-detail data for the points at ``positions``, when precomputed.
+
+        Distances serve any contiguous stretch; the Douglas–Peucker ranking only the
+        whole feature.
+        """
+
+        distances = self._lod.get("distance")
+        if distances is None or not isinstance(positions, range) or positions.step != 1:
+            return None
+        if positions.start == 0 and positions.stop == self.count:
+            return Pyramid(distances, self._lod["order"], self._lod["rank"])
+        return Pyramid(distances[positions.start : positions.stop])
+
+    def coordinates(self, indices: Sequence[int]) -> tuple[tuple[float, ...], ...]:
+        columns = [self._gather(name, indices) for name in ("lon", "lat", "alt")]
+        return tuple(zip(*(column for column in columns if column is not None)))
+
+    def timestamps(self, indices: Sequence[int]) -> tuple[Any, ...] | None:
+        kind = self._kinds.get("t")
+        values = self._gather("t", indices)
+        if values is None:
+            return None
+        if kind in ("int", "float"):
+            return tuple(values)
+        return tuple(_format_timestamp(value, kind) for value in values)
+
+    def _gather(self, name: str, indices: Sequence[int]) -> list[Any] | None:
+        column = self._columns.get(name)
+        if column is None:
+            return None
+        integral = self._kinds[name] == "int"
+        if vector.numpy_enabled():
+            return vector.gather(column, indices, integral)
+        if integral:
+            return [int(column[idx]) for idx in indices]
+        return [column[idx] for idx in indices]
+
+    def release(self) -> None:
+        self._columns.clear()
+        self._lod.clear()
+
+
+class ColumnarRoute:
+    """Read-only, memory-mapped view over a compiled route sidecar.
+
+    ``column`` returns every feature's values back to back; ``features`` slices them
+    per feature without copying.
+    """
+
+    def __init__(self, path: Path, header: dict[str, Any], buffer: mmap.mmap, offset: int):
+        self.path = path
+        self.header = header
+        self.count: int = header["count"]
+        self._buffer = buffer
+        view = memoryview(buffer)
+        self._columns: dict[str, memoryview] = {}
+        for name in header["columns"]:
+            end = offset + 8 * self.count
+            self._columns[name] = view[offset:end].cast("d")
+            offset = end
+        self._lod: dict[str, memoryview] = {}
+        for name, length in _lod_columns(header):
+            end = offset + 8 * length
+            self._lod[name] = view[offset:end].cast("d")
+            offset = end
+        distances = self._lod["distance"]
+        order, rank = self._lod["order"], self._lod["rank"]
+        self.features = [
+            ColumnarFeature(
+                {name: column[start : start + count] for name, column in self._columns.items()},
+                header["kinds"],
+                start,
+                count,
+                ordered,
+                {
+                    "distance": distances[start : start + count],
+                    "order": order[first : first + levels],
+                    "rank": rank[first : first + levels],
+                },
+            )
+            for (start, count), ordered, (first, levels) in zip(
+                header["features"], header["ordered"], header["lod"]["features"]
+            )
+        ]
+
+    def column(self, name: str) -> memoryview | None:
+        return self._columns.get(name)
+
+    def route_data(self, selections: Sequence[tuple[int, Sequence[int]]]) -> RouteData:
+        """Build the route from ``(feature index, point indices)`` pairs.
+
+        Features are emitted in the order given; unselected features are dropped.
+        """
+
+        payload = self.header["payload"]
+        tracks = []
+        for position, indices in selections:
+            skeleton = payload["features"][position]
+            source = self.features[position]
+            tracks.append(
+                Track(
+                    freeze(skeleton),
+                    source.coordinates(indices),
+                    source.timestamps(indices),
+                    individual_id(skeleton, position),
+                )
+            )
+        return RouteData.from_geojson(payload, tracks)
+
+    def close(self) -> None:
+        for feature in self.features:
+            feature.release()
+        self._columns.clear()
+        self._lod.clear()
+        with suppress(BufferError):
+            self._buffer.close()
+
+
+def open_compiled(path: Path, stat: os.stat_result | None = None) -> ColumnarRoute | None:
+    """Open the sidecar for ``path`` when it exists and matches the source file."""
+
+    if not columnar_enabled():
+        return None
+    sidecar = sidecar_path(path)
+    try:
+        stat = stat or path.stat()
+        with sidecar.open("rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        if buffer[: len(_MAGIC)] != _MAGIC:
+            raise ValueError("bad magic")
+        (length,) = _LENGTH.unpack_from(buffer, len(_MAGIC))
+        header = json.loads(buffer[_PREFIX : _PREFIX + length])
+        if (
+            header.get("version") != COLUMNAR_VERSION
+            or header.get("byteorder") != sys.byteorder
+            or header.get("source_mtime_ns") != stat.st_mtime_ns
+            or header.get("source_size") != stat.st_size
+        ):
+            raise ValueError("stale sidecar")
+        expected = _PREFIX + length + 8 * header["count"] * len(header["columns"])
+        expected += 8 * sum(count for _, count in _lod_columns(header))
+        if len(buffer) < expected:
+            raise ValueError("truncated sidecar")
+    except (ValueError, KeyError, TypeError, struct.error):
+        buffer.close()
+        return None
+    return ColumnarRoute(sidecar, header, buffer, _PREFIX + length)
+
+
+def compile_route(
+    path: Path,
+    payload: dict[str, Any] | None = None,
+    stat: os.stat_result | None = None,
+) -> Path | None:
+    """Write the columnar sidecar for ``path``; returns ``None`` when it cannot be encoded.
+
+    Only collections whose features all have uniform 2D/3D coordinates and (for all
+    or none of them) numeric or round-trippable ISO timestamps are compiled; anything
+    else keeps using GeoJSON. Compiling also builds the level-of-detail pyramid, an
+    O(n log n) pass per feature paid once per source file.
+    Pass the ``stat`` taken before ``payload`` was read so a concurrent rewrite of the
+    source can never be recorded as matching stale columns.
+
+    Failures are remembered per source ``(mtime_ns, size)``, and directories that
+    cannot be written are detected up front. Unsupported or read-only routes
+    therefore pay for one failed attempt, not one per cache miss.
+    """
+
+    if not columnar_enabled():
+        return None
+    try:
+        stat = stat or path.stat()
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _FAILED_LOCK:
+        if _FAILED.get(str(path)) == version:
+            return None
+    target = _write_sidecar(path, payload, stat)
+    with _FAILED_LOCK:
+        if target is None:
+            _FAILED[str(path)] = version
+        else:
+            _FAILED.pop(str(path), None)
+    return target
+
+
+def compile_in_background(paths: Iterable[Path]) -> None:
+    """Queue sidecar compiles for ``paths`` on a background thread.
+
+    Used at ingest time (downloads, refreshes, watched changes) and after a request
+    had to fall back to GeoJSON, so building columns and the level-of-detail pyramid
+    never happens on a request. Paths already queued, or with a current sidecar, are
+    skipped.
+    """
+
+    global _WORKER
+    if not columnar_enabled():
+        return
+    with _PENDING_LOCK:
+        for path in paths:
+            if str(path) in _PENDING:
+                continue
+            _PENDING.add(str(path))
+            _QUEUE.put(path)
+        if _WORKER is None and _PENDING:
+            # Daemonic: a compile interrupted at exit only leaves a temporary file behind.
+            _WORKER = threading.Thread(
+                target=_compile_worker, name="migration-compile", daemon=True
+            )
+            _WORKER.start()
+
+
+def wait_for_compiles() -> None:
+    """Block until every queued background compile has finished."""
+
+    _QUEUE.join()
+
+
+def _compile_worker() -> None:
+    while True:
+        path = _QUEUE.get()
+        try:
+            route = open_compiled(path)
+            if route is not None:
+                route.close()
+            else:
+                compile_route(path)
+        except Exception:  # noqa: BLE001 - a bad file must not stop later compiles
+            with suppress(OSError):
+                stat = path.stat()
+                with _FAILED_LOCK:
+                    _FAILED[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        finally:
+            with _PENDING_LOCK:
+                _PENDING.discard(str(path))
+            _QUEUE.task_done()
+
+
+def _write_sidecar(path: Path, payload: dict[str, Any] | None, stat: os.stat_result) -> Path | None:
+    if not os.access(path.parent, os.W_OK):
+        return None
+    try:
+        if payload is None:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    encoded = _encode(payload)
+    if encoded is None:
+        return None
+    header, columns = encoded
+    header.update(
+        {
+            "version": COLUMNAR_VERSION,
+            "byteorder": sys.byteorder,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_size": stat.st_size,
+        }
+    )
+    raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    raw += b" " * (-(_PREFIX + len(raw)) % 8)
+
+    target = sidecar_path(path)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(_LENGTH.pack(len(raw)))
+            handle.write(raw)
+            for column in columns:
+                column.tofile(handle)
+        os.replace(tmp, target)
+    except OSError:
+        with suppress(OSError):
+            tmp.unlink()
+        return None
+    return target
+
+
+def _encode(payload: Any) -> tuple[dict[str, Any], list[array]] | None:
+    if not isinstance(payload, dict):
+        return None
+    features = payload.get("features")
+    if not isinstance(features, list) or not features:
+        return None
+    parsed: list[tuple[dict[str, Any], dict[str, Any], dict[str, Any], list[Any], Any]] = []
+    for feature in features:
+        if not isinstance(feature, dict):
+            return None
+        geometry = feature.get("geometry")
+        properties = feature.get("properties")
+        if not isinstance(geometry, dict) or not isinstance(properties, dict):
+            return None
+        coords = geometry.get("coordinates")
+        if not isinstance(coords, list) or not coords:
+            return None
+        parsed.append((feature, geometry, properties, coords, properties.get("timestamps")))
+
+    dims = len(parsed[0][3][0]) if isinstance(parsed[0][3][0], list) else 0
+    if dims not in (2, 3) or any(
+        not isinstance(c, list) or len(c) != dims for *_, coords, _ in parsed for c in coords
+    ):
+        return None
+
+    names = ["lon", "lat", "alt"][:dims]
+    columns: list[array] = []
+    kinds: dict[str, str] = {}
+    for axis, name in enumerate(names):
+        values = [coord[axis] for *_, coords, _ in parsed for coord in coords]
+        kind = _numeric_kind(values)
+        if kind is None:
+            return None
+        columns.append(array("d", values))
+        kinds[name] = kind
+
+    # Timestamps are all-or-nothing across features so the column stays aligned.
+    stamped = [isinstance(stamps, list) and bool(stamps) for *_, stamps in parsed]
+    has_timestamps = all(stamped)
+    if any(stamped) and not has_timestamps:
+        return None
+    if has_timestamps:
+        if any(len(stamps) != len(coords) for *_, coords, stamps in parsed):
+            return None
+        encoded = _encode_timestamps([value for *_, stamps in parsed for value in stamps])
+        if encoded is None:
+            return None
+        kinds["t"], values = encoded
+        columns.append(array("d", values))
+        names.append("t")
+
+    skeletons: list[dict[str, Any]] = []
+    bounds: list[list[int]] = []
+    start = 0
+    for feature, geometry, properties, coords, _ in parsed:
+        skeletons.append(
+            {
+                **feature,
+                "geometry": {**geometry, "coordinates": []},
+                "properties": {**properties, **({"timestamps": []} if has_timestamps else {})},
+            }
+        )
+        bounds.append([start, len(coords)])
+        start += len(coords)
+    skeleton = {key: value for key, value in payload.items() if key != "features"}
+    skeleton["features"] = skeletons
+    # Re-insert in the original key order so rebuilt payloads match the source.
+    skeleton = {key: skeleton[key] for key in payload if key in skeleton}
+    header = {
+        "count": start,
+        "columns": names,
+        "kinds": kinds,
+        "features": bounds,
+        # Per-feature "timestamps never decrease" flags, so time windows can bisect.
+        "ordered": [
+            has_timestamps and is_ordered(columns[-1][first : first + count])
+            for first, count in bounds
+        ],
+        "payload": skeleton,
+    }
+    lod_bounds: list[list[int]] = []
+    distances: list[float] = []
+    order: list[float] = []
+    ranks: list[float] = []
+    for first, count in bounds:
+        lon, lat = columns[0][first : first + count], columns[1][first : first + count]
+        distances.extend(cumulative_distances(lon, lat))
+        levels, values = douglas_peucker_ranking(lon, lat, LOD_POINTS)
+        lod_bounds.append([len(order), len(levels)])
+        order.extend(levels)
+        ranks.extend(values)
+    columns += [array("d", distances), array("d", order), array("d", ranks)]
+    header["lod"] = {"features": lod_bounds, "count": len(order)}
+    return header, columns
+
+
+def _lod_columns(header: dict[str, Any]) -> list[tuple[str, int]]:
+    """Names and lengths of the pyramid columns stored after the coordinate columns."""
+
+    levels = header["lod"]["count"]
+    return [("distance", header["count"]), ("order", levels), ("rank", levels)]
+
+
+def _numeric_kind(values: list[Any]) -> str | None:
+    kind = "int"
+    for value in values:
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            if abs(value) > _MAX_EXACT_INT:
+                return None
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return None
+            kind = "float"
+        else:
+            return None
+    return kind
+
+
+def _encode_timestamps(values: list[Any]) -> tuple[str, list[float]] | None:
+    if all(isinstance(value, (int, float)) for value in values):
+        kind = _numeric_kind(values)
+        return (kind, [float(value) for value in values]) if kind else None
+    if not all(isinstance(value, str) for value in values):
+        return None
+    fmt = next((fmt for fmt in _ISO_FORMATS if _parse(values[0], fmt) is not None), None)
+    if fmt is None:
+        return None
+    encoded: list[float] = []
+    for value in values:
+        seconds = _parse(value, fmt)
+        if seconds is None or _format_timestamp(seconds, fmt) != value:
+            return None
+        encoded.append(seconds)
+    return fmt, encoded
+
+
+def _parse(value: str, fmt: str) -> float | None:
+    try:
+        parsed = datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+    return (parsed.replace(tzinfo=timezone.utc) - _EPOCH).total_seconds()
+
+
+def _format_timestamp(seconds: float, fmt: str) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(fmt)
@@ -0,0 +1,96 @@
+"""Per-endpoint bounded offloading of blocking work with queueing metrics."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import anyio
+import anyio.to_thread
+
+T = TypeVar("T")
+
+LIMIT_ENV_PREFIX = "MIGRATION_LIMIT_"
+DEFAULT_LIMITS: dict[str, int] = {
+    "routes": 8,
+    "batch": 2,
+    "catalog": 4,
+    "tiles": 16,
+    "admin": 1,
+}
+
+
+class EndpointLimiter:
+    """Run blocking callables on worker threads, at most ``limit`` at a time.
+
+    Each limiter owns its own thread budget, so a backlog on one endpoint (e.g. slow
+    route generation) queues there instead of exhausting the shared threadpool used
+    by cheap catalog calls.
+    """
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = max(1, limit)
+        self._capacity = anyio.CapacityLimiter(self.limit)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._max_queued = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        enqueued = time.monotonic()
+        started = False
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        def call() -> T:
+            nonlocal started
+            waited = time.monotonic() - enqueued
+            with self._lock:
+                started = True
+                self._queued -= 1
+                self._active += 1
+                self._wait_total_s += waited
+                self._wait_max_s = max(self._wait_max_s, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        try:
+            return await anyio.to_thread.run_sync(call, limiter=self._capacity)
+        finally:
+            with self._lock:
+                if not started:  # cancelled while still waiting for a slot
+                    self._queued -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "active": self._active,
+                "queued": self._queued,
+                "max_queued": self._max_queued,
+                "completed": self._completed,
+                "wait_total_s": self._wait_total_s,
+                "wait_max_s": self._wait_max_s,
+            }
+
+
+def build_limiters(overrides: dict[str, int] | None = None) -> dict[str, EndpointLimiter]:
+    limits = dict(DEFAULT_LIMITS)
+    for name in limits:
+        value = os.getenv(f"{LIMIT_ENV_PREFIX}{name.upper()}")
+        if value and value.isdigit():
+            limits[name] = int(value)
+    limits.update(overrides or {})
+    return {name: EndpointLimiter(name, limit) for name, limit in limits.items()}
@@ -2,69 +2,112 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import shutil
+from contextlib import suppress
 from pathlib import Path
 
-import requests
-
 from .datasets import birdcast_tiles_dir, birdflow_dir, resolve_data_root, routes_dir
+from .fetch import Fetcher
 
 BIRDFLOW_FALLBACKS: dict[str, str] = {
     "grus_grus": "https://raw.githubusercontent.com/bbecquet/bird-tracking/master/data/grus_grus.geojson",
     "ciconia_ciconia": "https://raw.githubusercontent.com/bbecquet/bird-tracking/master/data/ciconia_ciconia.geojson",
     "ciconia_nigra": "https://raw.githubusercontent.com/bbecquet/bird-tracking/master/data/ciconia_nigra.geojson",
 }
+BIRDCAST_SUMMARY_URL = "https://birdcast.info/api/v1/migration/summary/{date}"
 
-SESSION = requests.Session()
+FETCHER = Fetcher()
 
 DATA_ROOT_ENV = "BIRD_MIGRATION_DATA_ROOT"
 
 
+def birdflow_route_path(species_code: str, data_root: Path | None = None) -> Path:
+    """Where the BirdFlow route for ``species_code`` is cached."""
+
+    return birdflow_dir(_data_root(data_root)) / f"{species_code.lower()}.geojson"
+
+
+def birdcast_tile_path(date: str, product: str, data_root: Path | None = None) -> Path:
+    """Where the BirdCast preview for ``date``/``product`` is cached."""
+
+    return birdcast_tiles_dir(_data_root(data_root)) / date / product / "preview.geojson"
+
+
 def ensure_birdflow_route(species_code: str, data_root: Path | None = None) -> Path | None:
-    species = species_code.lower()
-    root = resolve_data_root(os.getenv(DATA_ROOT_ENV)) if data_root is None else data_root
-    routes = routes_dir(root)
-    target = birdflow_dir(root) / f"{species}.geojson"
+    target, url = _birdflow_plan(species_code, data_root)
     if target.exists():
         return target
-
-    # Fallback: copy from generic routes if present
-    legacy = routes / f"{species}.geojson"
-    target.parent.mkdir(parents=True, exist_ok=True)
-    if legacy.exists():
-        shutil.copy2(legacy, target)
-        return target
-
-    url = BIRDFLOW_FALLBACKS.get(species) or os.getenv("BIRDFLOW_GEOJSON_URL")
-    if not url:
+    if url is None:
         return None
+    return target if FETCHER.fetch(url, target) else None
 
-    try:
-        resp = SESSION.get(url, timeout=30)
-        resp.raise_for_status()
-    except requests.RequestException:
-        return None
 
-    target.write_bytes(resp.content)
-    return target
+async def ensure_birdflow_route_async(
+    species_code: str, data_root: Path | None = None
+) -> Path | None:
+    # Planning may create directories and copy a legacy route file; keep that off
+    # the caller's event loop.
+    target, url = await asyncio.to_thread(_birdflow_plan, species_code, data_root)
+    if await asyncio.to_thread(target.exists):
+        return target
+    if url is None:
+        return None
+    return target if await FETCHER.fetch_async(url, target) else None
 
 
 def ensure_birdcast_tile(date: str, product: str, data_root: Path | None = None) -> Path | None:
-    root = resolve_data_root(os.getenv(DATA_ROOT_ENV)) if data_root is None else data_root
-    cache_dir = birdcast_tiles_dir(root) / date / product
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    expected = cache_dir / "preview.geojson"
+    expected, url = _birdcast_plan(date, product, data_root)
     if expected.exists():
         return expected
+    return expected if FETCHER.fetch(url, expected) else None
 
+
+async def ensure_birdcast_tile_async(
+    date: str, product: str, data_root: Path | None = None
+) -> Path | None:
+    expected, url = await asyncio.to_thread(_birdcast_plan, date, product, data_root)
+    if await asyncio.to_thread(expected.exists):
+        return expected
+    return expected if await FETCHER.fetch_async(url, expected) else None
+
+
+def _birdflow_plan(species_code: str, data_root: Path | None) -> tuple[Path, str | None]:
+    """Return the cache target and, when it is not cached yet, the URL to fetch it from."""
+
+    species = species_code.lower()
+    root = _data_root(data_root)
+    target = birdflow_route_path(species, root)
+    if target.exists():
+        return target, None
+
+    # Fallback: copy from generic routes if present
+    legacy = routes_dir(root) / f"{species}.geojson"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if legacy.exists():
+        _atomic_copy(legacy, target)
+        return target, None
+
+    return target, BIRDFLOW_FALLBACKS.get(species) or os.getenv("BIRDFLOW_GEOJSON_URL")
+
+
+def _birdcast_plan(date: str, product: str, data_root: Path | None) -> tuple[Path, str]:
+    target = birdcast_tile_path(date, product, data_root)
+    target.parent.mkdir(parents=True, exist_ok=True)
     # Minimal placeholder using public BirdCast API (returns JSON list)
-    url = f"https://birdcast.info/api/v1/migration/summary/{date}"
-    try:
-        resp = SESSION.get(url, timeout=30)
-        resp.raise_for_status()
-    except requests.RequestException:
-        return None
+    return target, BIRDCAST_SUMMARY_URL.format(date=date)
 
-    expected.write_text(resp.text, encoding="utf-8")
-    return expected
+
+def _data_root(data_root: Path | None) -> Path:
+    return resolve_data_root(os.getenv(DATA_ROOT_ENV)) if data_root is None else data_root
+
+
+def _atomic_copy(source: Path, target: Path) -> None:
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.part")
+    try:
+        shutil.copy2(source, tmp)
+        os.replace(tmp, target)
+    finally:
+        with suppress(OSError):
+            tmp.unlink()
@@ -2,28 +2,75 @@
 
 from __future__ import annotations
 
-import copy
 import json
 import math
 import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from .connectors import ensure_birdflow_route
+from . import resampling, vector
+from .cache import PayloadCache, route_cache_bytes
+from .columnar import ColumnarFeature, ColumnarRoute, compile_in_background, open_compiled
+from .connectors import ensure_birdflow_route, ensure_birdflow_route_async
+from .dataset_index import DatasetIndex, decode_dataset_cursor, project
 from .datasets import (
-    BirdCastTile,
     RouteDataset,
+    birdcast_tile_index,
+    birdcast_tiles_dir,
     clear_caches,
-    discover_birdcast_tiles,
     discover_route_datasets,
-    list_route_datasets,
+    invalidate_paths,
     resolve_data_root,
+    route_dataset_index,
 )
-from .models import AdminRefreshResponse, RouteRequest, RouteResponse
+from .metrics import collect, count, span
+from .models import (
+    AdminRefreshResponse,
+    DatasetQuery,
+    RegionQuery,
+    RouteBatchItem,
+    RouteBatchRequest,
+    RouteBatchResponse,
+    RouteRequest,
+    RouteResponse,
+    TileQuery,
+)
+from .pagination import encode_cursor
+from .resampling import ResampleSpec, timestamp_seconds
+from .route_data import RouteData, Track, freeze, individual_id
+from .shared import consume_change, publish_change
+from .snapshot import discard_snapshot
+from .spatial import SpatialIndex, clip_match, spatial_index
+from .streaming import FeatureStream, RouteStream
+from .tile_index import TileIndex, decode_tile_cursor
+from .tile_server import TileFile, open_tile, tile_cache_bytes
+from .time_window import TimeWindow, is_ordered, run_positions
 
 DATA_ROOT_ENV = "BIRD_MIGRATION_DATA_ROOT"
 ADMIN_TOKEN_ENV = "MCP_MIGRATION_ADMIN_TOKEN"
 
+BATCH_MAX_WORKERS = 8
+FEATURE_MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Below this many points per collection, thread hand-off costs more than it saves.
+FEATURE_PARALLEL_POINTS = 50_000
+
+ROUTE_CACHE = PayloadCache(route_cache_bytes())
+# Rough in-memory cost of a cached route: a coordinate row, its timestamp and the
+# derived deck.gl columns per point, plus the frozen skeleton per track.
+ROUTE_POINT_BYTES = 160
+ROUTE_TRACK_BYTES = 1024
+TILE_CACHE = PayloadCache(tile_cache_bytes())
+
+_T = TypeVar("_T")
+_FEATURE_POOL: ThreadPoolExecutor | None = None
+_FEATURE_POOL_LOCK = threading.Lock()
+
+# (resampled route, payload cache status)
+_DatasetRoute = tuple[RouteData, str]
+
 
 def _data_root() -> Path:
     override = os.getenv(DATA_ROOT_ENV)
@@ -41,14 +88,19 @@ def _discover_datasets(data_root: Path | None = None) -> dict[str, list[RouteDat
     return discover_route_datasets(str(root))
 
 
-def _list_datasets(data_root: Path | None = None) -> list[RouteDataset]:
+def _dataset_index(data_root: Path | None = None) -> DatasetIndex:
+    root = (data_root or _data_root()).expanduser()
+    return route_dataset_index(str(root))
+
+
+def _spatial_index(data_root: Path | None = None) -> SpatialIndex:
     root = (data_root or _data_root()).expanduser()
-    return list_route_datasets(root)
+    return spatial_index(str(root))
 
 
-def _discover_birdcast(data_root: Path | None = None) -> list[BirdCastTile]:
+def _birdcast_index(data_root: Path | None = None) -> TileIndex:
     root = (data_root or _data_root()).expanduser()
-    return discover_birdcast_tiles(str(root))
+    return birdcast_tile_index(str(root))
 
 
 def _first_dataset(species_code: str, data_root: Path | None = None) -> RouteDataset | None:
@@ -61,60 +113,176 @@ def _first_dataset(species_code: str, data_root: Path | None = None) -> RouteDat
 
 def _load_geojson(dataset: RouteDataset) -> dict[str, Any]:
     try:
-        return json.loads(dataset.path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError) as exc:  # pragma: no cover
+        raw = dataset.path.read_bytes()
+        count("migration_route_bytes_read_total", len(raw), format="geojson")
+        return json.loads(raw)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:  # pragma: no cover
         raise RuntimeError(f"Failed to read dataset {dataset.path}") from exc
 
 
-def _resample_geojson(payload: dict[str, Any], target: int) -> dict[str, Any]:
+def _load_resampled(dataset: RouteDataset, stat: os.stat_result, spec: ResampleSpec) -> RouteData:
+    with span("open_columnar"):
+        compiled = open_compiled(dataset.path, stat)
+    if compiled is not None:
+        count("migration_route_loads_total", format="columnar")
+        try:
+            with span("resample"):
+                return _resample_columnar(compiled, spec)
+        finally:
+            compiled.close()
+    count("migration_route_loads_total", format="geojson")
+    with span("load_geojson"):
+        payload = _load_geojson(dataset)
+    # Normally compiled at ingest; catch up off the request path if it was missed.
+    compile_in_background([dataset.path])
+    with span("resample"):
+        return _resample_geojson(payload, spec)
+
+
+def _resample_columnar(route: ColumnarRoute, spec: ResampleSpec) -> RouteData:
+    positions = _selected_features(route.header["payload"]["features"], spec.individuals)
+    selections = _map_features(
+        lambda position: (position, _columnar_indices(route.features[position], spec)),
+        positions,
+        route.count,
+    )
+    return route.route_data([selection for selection in selections if selection[1] is not None])
+
+
+def _columnar_indices(feature: ColumnarFeature, spec: ResampleSpec) -> Sequence[int] | None:
+    """Point indices to keep, or ``None`` when no point falls in the time window."""
+
+    t = feature.column("t")
+    positions: Sequence[int] = range(feature.count)
+    if spec.window is not None:
+        if t is None:
+            return None
+        positions = run_positions(spec.window.runs(t, feature.ordered))
+        if not positions:
+            return None
+    indices = resampling.select_indices(
+        spec,
+        len(positions),
+        lambda: (_take(feature.column("lon"), positions), _take(feature.column("lat"), positions)),
+        _take(t, positions) if t is not None else None,
+        _select_indices,
+        feature.pyramid(positions),
+    )
+    return positions if indices is None else [positions[idx] for idx in indices]
+
+
+def _resample_geojson(payload: dict[str, Any], spec: ResampleSpec) -> RouteData:
+    """Freeze the resampled features of ``payload``; ``payload`` itself is left untouched."""
+
     features = payload.get("features")
-    if not isinstance(features, list) or not features:
-        return payload
-    feature = features[0]
-    geometry = feature.get("geometry") or {}
-    coords = geometry.get("coordinates")
-    if not isinstance(coords, list):
-        return payload
-    if target <= 0 or len(coords) <= target:
-        return payload
-    indices = _select_indices(len(coords), target)
-    resampled = [coords[idx] for idx in indices]
-    geometry["coordinates"] = resampled
-    feature["geometry"] = geometry
-    properties = feature.get("properties") or {}
-    timestamps = properties.get("timestamps")
-    if isinstance(timestamps, list) and timestamps:
-        properties["timestamps"] = [timestamps[idx] for idx in indices]
-    feature["properties"] = properties
-    payload["features"][0] = feature
-    return payload
+    if not isinstance(features, list):
+        return RouteData.from_geojson(payload, ())
+    positions = _selected_features(features, spec.individuals)
+    points = sum(_point_count(features[position]) for position in positions)
+    tracks = _map_features(
+        lambda position: _resample_feature(features[position], position, spec), positions, points
+    )
+    return RouteData.from_geojson(payload, [track for track in tracks if track is not None])
 
 
-def _build_deckgl(payload: dict[str, Any]) -> list[dict[str, Any]]:
-    features = payload.get("features")
-    if not isinstance(features, list) or not features:
-        return []
-    feature = features[0]
+def _resample_feature(feature: dict[str, Any], position: int, spec: ResampleSpec) -> Track | None:
+    """Resample one feature; ``None`` drops it (no points in the time window)."""
+
     geometry = feature.get("geometry") or {}
     coords = geometry.get("coordinates")
     if not isinstance(coords, list) or not coords:
-        return []
+        return Track.from_feature(feature, position) if spec.window is None else None
     properties = feature.get("properties") or {}
     timestamps = properties.get("timestamps")
     if not isinstance(timestamps, list):
-        timestamps = list(range(len(coords)))
-    altitudes = [coord[2] if len(coord) >= 3 else 0.0 for coord in coords]
+        timestamps = None
+    positions: Sequence[int] = range(len(coords))
+    if spec.window is not None:
+        seconds = timestamp_seconds(timestamps) if timestamps is not None else None
+        if seconds is None or len(seconds) != len(coords):
+            return None
+        positions = run_positions(spec.window.runs(seconds, is_ordered(seconds)))
+        if not positions:
+            return None
+    indices = resampling.select_indices(
+        spec,
+        len(positions),
+        lambda: (
+            [coords[idx][0] for idx in positions],
+            [coords[idx][1] for idx in positions],
+        ),
+        _take(timestamps, positions) if timestamps is not None else None,
+        _select_indices,
+    )
+    if indices is None:
+        return Track.from_feature(feature, position, None if spec.window is None else positions)
+    return Track.from_feature(feature, position, [positions[idx] for idx in indices])
+
+
+def _take(values: Sequence[Any], positions: Sequence[int]) -> Sequence[Any]:
+    """``values`` at ``positions``; contiguous runs are sliced (zero-copy for columns)."""
+
+    if isinstance(positions, range) and positions.step == 1:
+        if positions.start == 0 and positions.stop == len(values):
+            return values
+        return values[positions.start : positions.stop]
+    return [values[idx] for idx in positions]
+
+
+def _build_deckgl(route: RouteData) -> list[dict[str, Any]]:
+    """One deck.gl path entry per feature (individual) with coordinates."""
+
+    tracks = [track for track in route.tracks if track.has_path]
+    points = sum(len(track.coordinates or ()) for track in tracks)
+    return _map_features(
+        lambda position: tracks[position].deckgl(), list(range(len(tracks))), points
+    )
+
+
+def _selected_features(features: list[Any], individuals: Sequence[str] | None) -> list[int]:
+    wanted = set(individuals) if individuals is not None else None
     return [
-        {
-            "path": [coord[:2] for coord in coords],
-            "timestamps": timestamps,
-            "altitudes": altitudes,
-            "label": properties.get("label") or properties.get("bird"),
-        }
+        position
+        for position, feature in enumerate(features)
+        if isinstance(feature, dict)
+        and (wanted is None or individual_id(feature, position) in wanted)
     ]
 
 
+def _point_count(feature: Any) -> int:
+    if not isinstance(feature, dict):
+        return 0
+    coords = (feature.get("geometry") or {}).get("coordinates")
+    return len(coords) if isinstance(coords, list) else 0
+
+
+def _map_features(func: Callable[[int], _T], positions: list[int], points: int) -> list[_T]:
+    """Apply ``func`` per feature, on the shared feature pool for large collections."""
+
+    if len(positions) < 2 or points < FEATURE_PARALLEL_POINTS:
+        return [func(position) for position in positions]
+    return list(_feature_pool().map(func, positions))
+
+
+def _feature_pool() -> ThreadPoolExecutor:
+    global _FEATURE_POOL
+    with _FEATURE_POOL_LOCK:
+        if _FEATURE_POOL is None:
+            _FEATURE_POOL = ThreadPoolExecutor(
+                max_workers=FEATURE_MAX_WORKERS, thread_name_prefix="migration-feature"
+            )
+        return _FEATURE_POOL
+
+
 def _generate_surrogate_path(request: RouteRequest) -> tuple[list[list[float]], list[float]]:
+    if vector.numpy_enabled():
+        return vector.surrogate_path(
+            request.num_waypoints,
+            request.timestep_s,
+            request.trim_yaw_rad,
+            request.cruise_velocity_m_s,
+            request.climb_rate_m_s,
+        )
     meters_to_deg = 1.0 / 111_320.0
     coords: list[list[float]] = []
     timestamps: list[float] = []
@@ -145,6 +313,8 @@ def _select_indices(length: int, target: int) -> list[int]:
         return list(range(length))
     if target == 1:
         return [0]
+    if vector.numpy_enabled():
+        return vector.select_indices(length, target)
 
     step = (length - 1) / (target - 1)
     indices = [round(i * step) for i in range(target)]
@@ -160,27 +330,179 @@ def _select_indices(length: int, target: int) -> list[int]:
     return deduped
 
 
-def generate_routes(request: RouteRequest) -> RouteResponse:
+def _resample_spec(request: RouteRequest) -> ResampleSpec:
+    return ResampleSpec(
+        target=request.num_waypoints,
+        mode=request.resample_mode,
+        tolerance_m=request.tolerance_m,
+        interval_s=request.interval_s,
+        individuals=tuple(request.individuals) if request.individuals else None,
+        window=_time_window(request),
+    )
+
+
+def _time_window(request: RouteRequest) -> TimeWindow | None:
+    if request.time_from is None and request.time_to is None and request.season is None:
+        return None
+    return TimeWindow(_time_bound(request.time_from), _time_bound(request.time_to), request.season)
+
+
+def _dataset_route(dataset: RouteDataset, spec: ResampleSpec) -> _DatasetRoute:
+    try:
+        stat = dataset.path.stat()
+    except OSError as exc:  # pragma: no cover
+        raise RuntimeError(f"Failed to read dataset {dataset.path}") from exc
+    key = (str(dataset.path), stat.st_mtime_ns, stat.st_size, spec)
+    cached = ROUTE_CACHE.get(key)
+    if cached is not None:
+        return cached, "hit"
+    route = _load_resampled(dataset, stat, spec)
+    with span("cache_store"):
+        ROUTE_CACHE.put(key, route, _route_nbytes(route))
+    return route, "miss"
+
+
+def _route_nbytes(route: RouteData) -> int:
+    """Cache size estimate from point and track counts; serializing to measure costs more."""
+
+    points = sum(len(track.coordinates or ()) for track in route.tracks)
+    return ROUTE_POINT_BYTES * points + ROUTE_TRACK_BYTES * (len(route.tracks) + 1)
+
+
+def route_cache_stats() -> dict[str, int]:
+    return ROUTE_CACHE.stats()
+
+
+def generate_routes(request: RouteRequest, *, fetch_missing: bool = True) -> RouteResponse:
+    """Build a route for ``request``.
+
+    With ``fetch_missing=False`` an uncached species falls back to a surrogate path
+    instead of downloading it inline (async callers use :func:`fetch_route_dataset`).
+    """
+
+    return _generate_route(request, _discover_datasets, _dataset_route, fetch_missing)
+
+
+def has_route_dataset(request: RouteRequest) -> bool:
+    """Whether ``request`` can be served without a remote fetch."""
+
+    if not request.species_code:
+        return True
+    root = _resolve_request_root(request.data_root)
+    return _first_dataset(request.species_code, root) is not None
+
+
+async def fetch_route_dataset(request: RouteRequest) -> Path | None:
+    """Download the requested species without holding a worker thread."""
+
+    if not request.species_code:
+        return None
+    root = _resolve_request_root(request.data_root)
+    with span("fetch"):
+        path = await ensure_birdflow_route_async(request.species_code.lower(), root)
+    if path is not None:
+        invalidate_paths([path])
+    return path
+
+
+def generate_routes_batch(batch: RouteBatchRequest) -> RouteBatchResponse:
+    """Generate many routes with one catalog lookup per data root.
+
+    Items run concurrently; identical (dataset, resampling) loads are performed once
+    and shared, and a failing item is reported in place without failing the batch.
+    """
+
+    roots = {_resolve_request_root(request.data_root) for request in batch.requests}
+    catalogs = {str(root): _discover_datasets(root) for root in roots}
+    loads: dict[tuple[Path, ResampleSpec], Future[_DatasetRoute]] = {}
+    lock = threading.Lock()
+
+    def discover(root: Path) -> dict[str, list[RouteDataset]]:
+        return catalogs.get(str(root)) or _discover_datasets(root)
+
+    def load(dataset: RouteDataset, spec: ResampleSpec) -> _DatasetRoute:
+        key = (dataset.path, spec)
+        with lock:
+            future = loads.get(key)
+            owner = future is None
+            if future is None:
+                future = loads[key] = Future()
+        if owner:
+            try:
+                future.set_result(_dataset_route(dataset, spec))
+            except Exception as exc:  # noqa: BLE001 - re-raised to every waiter below
+                future.set_exception(exc)
+        return future.result()
+
+    def run(index: int, request: RouteRequest) -> RouteBatchItem:
+        try:
+            return RouteBatchItem(index=index, response=_generate_route(request, discover, load))
+        except Exception as exc:  # noqa: BLE001 - one bad item must not fail the batch
+            return RouteBatchItem(index=index, error=f"{type(exc).__name__}: {exc}")
+
+    workers = min(batch.max_workers or BATCH_MAX_WORKERS, len(batch.requests))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="migration-batch") as pool:
+        results = list(pool.map(run, range(len(batch.requests)), batch.requests))
+    return RouteBatchResponse(results=results)
+
+
+def _generate_route(
+    request: RouteRequest,
+    discover: Callable[[Path], dict[str, list[RouteDataset]]],
+    load: Callable[[RouteDataset, ResampleSpec], _DatasetRoute],
+    fetch_missing: bool = True,
+) -> RouteResponse:
+    with collect(request.timings) as timings:
+        dataset, metadata = _resolve_route(request, discover, fetch_missing)
+        if dataset:
+            route, cache_status = load(dataset, _resample_spec(request))
+            metadata["cache"] = cache_status
+        else:
+            with span("surrogate"):
+                route = _surrogate_route(request)
+        with span("geojson"):
+            geojson = route.geojson()
+        with span("build_deckgl"):
+            deckgl = _build_deckgl(route)
+    outcome = metadata["status"]
+    if outcome == "surrogate" and metadata["requested_species"]:
+        outcome = "fallback"
+    count("migration_routes_total", status=outcome, cache=metadata.get("cache", "none"))
+    if timings is not None:
+        metadata["timings_ms"] = {
+            stage: round(seconds * 1000.0, 3) for stage, seconds in timings.items()
+        }
+    return RouteResponse(geojson=geojson, deckgl=deckgl, metadata=metadata)
+
+
+def _resolve_route(
+    request: RouteRequest,
+    discover: Callable[[Path], dict[str, list[RouteDataset]]],
+    fetch_missing: bool,
+) -> tuple[RouteDataset | None, dict[str, Any]]:
+    """Pick the dataset serving ``request`` and describe the outcome in route metadata."""
+
     data_root = _resolve_request_root(request.data_root)
     species_code = request.species_code.lower() if isinstance(request.species_code, str) else None
     metadata: dict[str, Any] = {
         "data_root": str(data_root),
         "requested_species": species_code,
         "waypoints": request.num_waypoints,
+        "resample_mode": request.resample_mode,
         "extra": request.metadata,
     }
 
     if species_code:
-        dataset = _first_dataset(species_code, data_root)
-        if not dataset:
-            path = ensure_birdflow_route(species_code, data_root)
+        with span("discover"):
+            entries = discover(data_root).get(species_code)
+        dataset = entries[0] if entries else None
+        if not dataset and fetch_missing:
+            with span("fetch"):
+                path = ensure_birdflow_route(species_code, data_root)
             if path:
-                clear_caches()
+                invalidate_paths([path])
                 dataset = _first_dataset(species_code, data_root)
         if dataset:
-            payload = _load_geojson(dataset)
-            payload = _resample_geojson(payload, request.num_waypoints)
-            deckgl = _build_deckgl(payload)
             metadata.update(
                 {
                     "status": "dataset",
@@ -188,9 +510,14 @@ def generate_routes(request: RouteRequest) -> RouteResponse:
                     "dataset_source": dataset.source,
                 }
             )
-            return RouteResponse(geojson=payload, deckgl=deckgl, metadata=metadata)
+            return dataset, metadata
         metadata["status"] = "fallback"
 
+    metadata.update({"status": "surrogate", "dataset_path": None, "dataset_source": None})
+    return None, metadata
+
+
+def _surrogate_route(request: RouteRequest) -> RouteData:
     coords, timestamps = _generate_surrogate_path(request)
     feature = {
         "type": "Feature",
@@ -201,22 +528,162 @@ def generate_routes(request: RouteRequest) -> RouteResponse:
             "timestamps": timestamps,
         },
     }
-    geojson = {"type": "FeatureCollection", "features": [feature]}
-    deckgl = _build_deckgl(copy.deepcopy(geojson))
-    metadata.update({"status": "surrogate", "dataset_path": None, "dataset_source": None})
-    return RouteResponse(geojson=geojson, deckgl=deckgl, metadata=metadata)
+    return RouteData(
+        freeze({"type": "FeatureCollection", "features": ()}), (Track.from_feature(feature, 0),)
+    )
 
 
-def list_datasets(data_root: Path | None = None) -> dict[str, Any]:
+def stream_route(request: RouteRequest, *, fetch_missing: bool = True) -> RouteStream:
+    """Open ``request``'s route for incremental encoding (see :mod:`.streaming`).
+
+    Dataset routes are served from the memory-mapped columnar sidecar (compiling it
+    on first use), so points are gathered batch by batch and never materialized as
+    a whole. Routes that cannot be compiled fall back to an in-memory payload.
+    The caller must close the returned stream.
+    """
+
+    dataset, metadata = _resolve_route(request, _discover_datasets, fetch_missing)
+    if dataset is None:
+        return RouteStream.from_payload(_surrogate_route(request).geojson(), metadata)
+    metadata["cache"] = "stream"
+    try:
+        stat = dataset.path.stat()
+    except OSError as exc:  # pragma: no cover
+        raise RuntimeError(f"Failed to read dataset {dataset.path}") from exc
+    spec = _resample_spec(request)
+    compiled = open_compiled(dataset.path, stat)
+    if compiled is None:
+        compile_in_background([dataset.path])
+        payload = _load_geojson(dataset)
+        return RouteStream.from_payload(_resample_geojson(payload, spec).geojson(), metadata)
+    return _columnar_stream(compiled, spec, metadata)
+
+
+def _columnar_stream(
+    route: ColumnarRoute, spec: ResampleSpec, metadata: dict[str, Any]
+) -> RouteStream:
+    payload = {**route.header["payload"], "features": []}
+    streams: list[FeatureStream] = []
+    for position in _selected_features(route.header["payload"]["features"], spec.individuals):
+        feature = route.features[position]
+        indices = _columnar_indices(feature, spec)
+        if indices is None:
+            continue
+        skeleton = route.header["payload"]["features"][position]
+        properties = {
+            key: value for key, value in skeleton["properties"].items() if key != "timestamps"
+        }
+        payload["features"].append({**skeleton, "properties": properties})
+        streams.append(_columnar_feature_stream(feature, indices))
+    return RouteStream(payload=payload, metadata=metadata, features=streams, close=route.close)
+
+
+def _columnar_feature_stream(feature: ColumnarFeature, positions: Sequence[int]) -> FeatureStream:
+    def timestamps(start: int, stop: int) -> list[Any]:
+        return feature.timestamps(positions[start:stop]) or []
+
+    return FeatureStream(
+        count=len(positions),
+        coordinates=lambda start, stop: feature.coordinates(positions[start:stop]),
+        timestamps=timestamps if feature.column("t") is not None else None,
+    )
+
+
+def list_datasets(
+    data_root: Path | None = None, query: DatasetQuery | None = None
+) -> dict[str, Any]:
+    """Return one page of catalogued route datasets matching ``query``.
+
+    Raises ``ValueError`` for a malformed pagination cursor.
+    """
+
     root = data_root or _data_root()
-    datasets = _list_datasets(root)
-    return {"data_root": str(root), "datasets": [dataset.__dict__ for dataset in datasets]}
+    query = query or DatasetQuery()
+    datasets, last = _dataset_index(root).query(
+        species=query.species,
+        source=query.source,
+        after=decode_dataset_cursor(query.cursor) if query.cursor else None,
+        limit=query.limit,
+    )
+    return {
+        "data_root": str(root),
+        "datasets": [project(dataset, query.fields) for dataset in datasets],
+        "next_cursor": encode_cursor(last) if last is not None else None,
+    }
 
 
-def list_tiles(data_root: Path | None = None) -> dict[str, Any]:
+def list_tiles(data_root: Path | None = None, query: TileQuery | None = None) -> dict[str, Any]:
+    """Return one page of indexed BirdCast tiles matching ``query``.
+
+    Raises ``ValueError`` for a malformed pagination cursor.
+    """
+
+    root = data_root or _data_root()
+    query = query or TileQuery()
+    tiles, last = _birdcast_index(root).query(
+        date_from=query.date_from,
+        date_to=query.date_to,
+        product=query.product,
+        level=query.level,
+        x_range=(query.x_min, query.x_max),
+        y_range=(query.y_min, query.y_max),
+        bbox=query.bbox,
+        after=decode_tile_cursor(query.cursor) if query.cursor else None,
+        limit=query.limit,
+    )
+    return {
+        "data_root": str(root),
+        "tiles": [tile.__dict__ for tile in tiles],
+        "next_cursor": encode_cursor(last) if last is not None else None,
+    }
+
+
+def tile_file(parts: tuple[str, ...], data_root: Path | None = None) -> TileFile | None:
+    """Locate the BirdCast tile at ``date/product/level/x/y`` for serving."""
+
+    root = data_root or _data_root()
+    return open_tile(birdcast_tiles_dir(root), parts, TILE_CACHE)
+
+
+def tile_cache_stats() -> dict[str, int]:
+    return TILE_CACHE.stats()
+
+
+def find_routes(query: RegionQuery, data_root: Path | None = None) -> dict[str, Any]:
+    """Return route datasets with at least one segment inside ``query``'s region.
+
+    Raises ``ValueError`` when a time bound cannot be parsed.
+    """
+
     root = data_root or _data_root()
-    tiles = _discover_birdcast(root)
-    return {"data_root": str(root), "tiles": [tile.__dict__ for tile in tiles]}
+    time_range = (_time_bound(query.time_from), _time_bound(query.time_to))
+    matches = _spatial_index(root).query(query.bbox, time_range=time_range, species=query.species)
+    routes: list[dict[str, Any]] = []
+    for match in matches[: query.limit]:
+        row: dict[str, Any] = {
+            "species_code": match.dataset.species_code,
+            "path": match.dataset.path,
+            "source": match.dataset.source,
+            "bbox": list(match.extent.bbox),
+            "time_range": list(match.extent.time_range) if match.extent.time_range else None,
+            "segments": len(match.segments),
+        }
+        if query.clip:
+            row["geometry"] = {
+                "type": "MultiLineString",
+                "coordinates": clip_match(match, query.bbox, time_range),
+            }
+        routes.append(row)
+    return {"data_root": str(root), "total": len(matches), "routes": routes}
+
+
+def _time_bound(value: str | float | None) -> float | None:
+    if value is None:
+        return None
+    seconds = timestamp_seconds([value])
+    if seconds is None:
+        raise ValueError(f"invalid time bound: {value!r}")
+    return seconds[0]
 
 
 def refresh_datasets(request: RouteRequest | None, admin_token: str | None) -> AdminRefreshResponse:
@@ -227,10 +694,38 @@ def refresh_datasets(request: RouteRequest | None, admin_token: str | None) -> A
     payload = request or RouteRequest()
     refreshed = False
     if payload.species_code:
-        refreshed = ensure_birdflow_route(payload.species_code) is not None
+        path = ensure_birdflow_route(payload.species_code)
+        refreshed = path is not None
         if refreshed:
-            clear_caches()
-    clear_caches()
+            invalidate_paths([path])
+    else:
+        discard_snapshot(_data_root())
+        clear_caches()
+        ROUTE_CACHE.clear()
+        publish_change()
     datasets = _discover_datasets()
+    if not payload.species_code:
+        compile_in_background(dataset.path for entries in datasets.values() for dataset in entries)
     stats = {species: len(entries) for species, entries in datasets.items()}
     return AdminRefreshResponse(refreshed=refreshed, datasets=stats)
+
+
+def sync_shared_catalog() -> bool:
+    """Drop this process's catalogs if another worker changed them; see :mod:`.shared`."""
+
+    if not consume_change():
+        return False
+    clear_caches()
+    ROUTE_CACHE.clear()
+    return True
+
+
+def prepare_shared_catalog(data_root: Path | None = None) -> int:
+    """Build the persisted catalog index, columnar sidecars and extents for ``data_root``.
+
+    Run once before starting workers so none of them has to parse GeoJSON on its
+    first requests. Returns the number of indexed routes.
+    """
+
+    _spatial_index(data_root)
+    return sum(len(entries) for entries in _discover_datasets(data_root).values())
@@ -0,0 +1,92 @@
+"""Sorted, paginated view over the cached route dataset catalog."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from . import pagination
+
+if TYPE_CHECKING:
+    from .datasets import RouteDataset
+
+DatasetKey = tuple[str, int, str, str]
+DATASET_FIELDS = ("species_code", "path", "source", "point_count", "metadata")
+
+
+def dataset_key(dataset: RouteDataset) -> DatasetKey:
+    """Listing order: species, BirdFlow before staged files, file name, full path."""
+
+    return (
+        dataset.species_code,
+        0 if dataset.source == "birdflow" else 1,
+        dataset.path.name.lower(),
+        str(dataset.path),
+    )
+
+
+class DatasetIndex:
+    """Immutable, key-ordered flattening of a ``species -> datasets`` mapping.
+
+    Species filters resolve to contiguous slices via ``_spans`` and cursors are
+    bisected, so a page costs O(log n + page) regardless of corpus size. Projected
+    rows only read the requested attributes, leaving ``metadata`` untouched unless
+    asked for.
+    """
+
+    def __init__(self, mapping: Mapping[str, list[RouteDataset]]) -> None:
+        self.mapping = mapping
+        self._datasets = sorted(
+            (dataset for datasets in mapping.values() for dataset in datasets), key=dataset_key
+        )
+        self._keys = [dataset_key(dataset) for dataset in self._datasets]
+        self._spans: dict[str, tuple[int, int]] = {}
+        for position, key in enumerate(self._keys):
+            start, _ = self._spans.get(key[0], (position, position))
+            self._spans[key[0]] = (start, position + 1)
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def query(
+        self,
+        *,
+        species: Iterable[str] | None = None,
+        source: str | None = None,
+        after: DatasetKey | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[RouteDataset], DatasetKey | None]:
+        """Return up to ``limit`` datasets after ``after`` and the next cursor key."""
+
+        if species is None:
+            spans = [(0, len(self._datasets))]
+        else:
+            wanted = sorted({code.lower() for code in species})
+            spans = [self._spans[code] for code in wanted if code in self._spans]
+
+        results: list[RouteDataset] = []
+        for start, stop in spans:
+            if after is not None:
+                start = max(start, bisect.bisect_right(self._keys, after, start, stop))
+            for dataset in self._datasets[start:stop]:
+                if source is not None and dataset.source != source:
+                    continue
+                if limit is not None and len(results) >= limit:
+                    return results, dataset_key(results[-1])
+                results.append(dataset)
+        return results, None
+
+
+def project(dataset: RouteDataset, fields: Iterable[str] | None) -> dict[str, Any]:
+    """Serialize ``dataset`` keeping only ``fields`` (all of them when ``None``)."""
+
+    return {name: getattr(dataset, name) for name in fields or DATASET_FIELDS}
+
+
+def decode_dataset_cursor(cursor: str) -> DatasetKey:
+    species, rank, name, path = pagination.decode_cursor(cursor, 4, "dataset")
+    try:
+        return (str(species), int(rank), str(name), str(path))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"invalid dataset cursor: {cursor!r}") from exc
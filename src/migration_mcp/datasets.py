@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import bisect
 import os
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from .catalog import CatalogEntry, scan_routes, update_routes
+from .columnar import compile_in_background
+from .dataset_index import DatasetIndex
+from .shared import publish_change
+from .snapshot import discard_snapshot, load_section, save_section, snapshot_enabled
+from .tile_index import TileIndex
+
 DEFAULT_DATA_ROOT = Path("~/bird-data").expanduser()
 ROUTES_SUBDIR = Path("migration") / "routes"
 BIRDFLOW_SUBDIR = ROUTES_SUBDIR / "birdflow"
@@ -16,6 +24,13 @@ BIRDCAST_TILES_SUBDIR = Path("migration") / "tiles" / "birdcast"
 BIRDCAST_EXTENSIONS = {".tif", ".tiff", ".png", ".geojson"}
 DATA_ROOT_ENV = "BIRD_MIGRATION_DATA_ROOT"
 
+_CACHE_LIMIT = 16
+_CACHE_LOCK = threading.RLock()
+_ROUTE_CACHE: dict[str, dict[str, list[RouteDataset]]] = {}
+_TILE_CACHE: dict[str, list[BirdCastTile]] = {}
+_DATASET_INDEX_CACHE: dict[str, DatasetIndex] = {}
+_TILE_INDEX_CACHE: dict[str, TileIndex] = {}
+
 
 @dataclass(frozen=True)
 class RouteDataset:
@@ -23,6 +38,7 @@ class RouteDataset:
     path: Path
     metadata: dict[str, Any]
     source: str
+    point_count: int | None = None
 
 
 @dataclass(frozen=True)
@@ -56,36 +72,14 @@ def birdcast_tiles_dir(root: Path) -> Path:
     return root / BIRDCAST_TILES_SUBDIR
 
 
-@lru_cache(maxsize=16)
 def discover_route_datasets(root: str) -> dict[str, list[RouteDataset]]:
-    base = Path(root)
-    mapping: dict[str, list[RouteDataset]] = {}
-    if not (base / ROUTES_SUBDIR).exists():
+    with _CACHE_LOCK:
+        mapping = _ROUTE_CACHE.get(root)
+        if mapping is None:
+            mapping = _scan_route_datasets(Path(root))
+            _remember(_ROUTE_CACHE, root, mapping)
         return mapping
 
-    for path in sorted((base / ROUTES_SUBDIR).rglob("*.geojson")):
-        try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            continue
-        metadata = payload.get("metadata") or {}
-        species_code = _extract_species_code(path, payload)
-        dataset = RouteDataset(
-            species_code=species_code,
-            path=path,
-            metadata=metadata if isinstance(metadata, dict) else {},
-            source="birdflow" if "birdflow" in path.parts else "geojson",
-        )
-        mapping.setdefault(species_code, []).append(dataset)
-
-    for species, datasets in mapping.items():
-        mapping[species] = sorted(
-            datasets,
-            key=lambda item: (0 if item.source == "birdflow" else 1, item.path.name.lower()),
-        )
-
-    return mapping
-
 
 def list_route_datasets(root: Path) -> list[RouteDataset]:
     datasets: list[RouteDataset] = []
@@ -94,61 +88,316 @@ def list_route_datasets(root: Path) -> list[RouteDataset]:
     return datasets
 
 
-@lru_cache(maxsize=16)
+def route_dataset_index(root: str) -> DatasetIndex:
+    """Return the paginated view of ``root``'s routes, rebuilt only after the catalog changes."""
+
+    with _CACHE_LOCK:
+        mapping = discover_route_datasets(root)
+        index = _DATASET_INDEX_CACHE.get(root)
+        if index is None or index.mapping is not mapping:
+            index = DatasetIndex(mapping)
+            _remember(_DATASET_INDEX_CACHE, root, index)
+        return index
+
+
 def discover_birdcast_tiles(root: str) -> list[BirdCastTile]:
-    tiles_root = Path(root) / BIRDCAST_TILES_SUBDIR
+    with _CACHE_LOCK:
+        tiles = _TILE_CACHE.get(root)
+        if tiles is None:
+            tiles = _scan_birdcast_tiles(Path(root))
+            _remember(_TILE_CACHE, root, tiles)
+        return tiles
+
+
+def birdcast_tile_index(root: str) -> TileIndex:
+    """Return the query index for ``root``'s tiles, rebuilt only after the catalog changes."""
+
+    with _CACHE_LOCK:
+        tiles = discover_birdcast_tiles(root)
+        index = _TILE_INDEX_CACHE.get(root)
+        if index is None or index.tiles is not tiles:
+            index = TileIndex(tiles)
+            _remember(_TILE_INDEX_CACHE, root, index)
+        return index
+
+
+def invalidate_paths(paths: Iterable[Path]) -> bool:
+    """Patch cached catalogs for files that were added, rewritten or removed.
+
+    Only the touched files are re-indexed, and only the species/tile entries that
+    referenced them are replaced; catalogs for other roots are left untouched.
+    Cached mappings are swapped copy-on-write so callers holding an older mapping
+    keep a consistent view. A changed root's catalog snapshot is discarded, so the
+    next cold start rescans instead of restoring the stale listing. Returns whether
+    any cached catalog changed.
+
+    Other worker processes are told to rebuild theirs when a catalog here changed,
+    or when no catalog here covers one of the paths (another worker may cache it).
+    """
+
+    changed = [Path(path) for path in paths]
+    if not changed:
+        return False
+    stale: set[str] = set()
+    covered: set[Path] = set()
+    with _CACHE_LOCK:
+        for root, mapping in list(_ROUTE_CACHE.items()):
+            routes_root = Path(root) / ROUTES_SUBDIR
+            touched = [path for path in changed if _is_route_file(routes_root, path)]
+            if touched:
+                covered.update(touched)
+                patched = _patch_routes(mapping, update_routes(routes_root, touched))
+                if patched != mapping:
+                    _ROUTE_CACHE[root] = patched
+                    stale.add(root)
+        for root, tiles in list(_TILE_CACHE.items()):
+            tiles_root = Path(root) / BIRDCAST_TILES_SUBDIR
+            touched = [path for path in changed if _is_under(tiles_root, path)]
+            if touched:
+                covered.update(touched)
+                patched_tiles = _patch_tiles(tiles, tiles_root, touched)
+                if patched_tiles != tiles:
+                    _TILE_CACHE[root] = patched_tiles
+                    stale.add(root)
+    for root in stale:
+        discard_snapshot(Path(root))
+    # New or rewritten routes get their sidecar (and level-of-detail pyramid) now,
+    # rather than on the first request for them.
+    compile_in_background(path for path in changed if _in_routes_tree(path) and path.is_file())
+    if stale or not covered.issuperset(changed):
+        publish_change()
+    return bool(stale)
+
+
+def cached_paths(prefix: Path) -> set[Path]:
+    """Return the cached route and tile files under ``prefix`` (e.g. a removed directory)."""
+
+    with _CACHE_LOCK:
+        paths = {
+            dataset.path
+            for mapping in _ROUTE_CACHE.values()
+            for datasets in mapping.values()
+            for dataset in datasets
+        }
+        paths.update(tile.path for tiles in _TILE_CACHE.values() for tile in tiles)
+    return {path for path in paths if _is_under(prefix, path)}
+
+
+def clear_caches(root: str | None = None) -> None:
+    with _CACHE_LOCK:
+        if root is None:
+            _ROUTE_CACHE.clear()
+            _TILE_CACHE.clear()
+            _DATASET_INDEX_CACHE.clear()
+            _TILE_INDEX_CACHE.clear()
+        else:
+            _ROUTE_CACHE.pop(root, None)
+            _TILE_CACHE.pop(root, None)
+            _DATASET_INDEX_CACHE.pop(root, None)
+            _TILE_INDEX_CACHE.pop(root, None)
+
+
+def preload_catalog(root: Path) -> None:
+    """Populate the route and tile catalogs for ``root`` (e.g. on a startup thread)."""
+
+    discover_route_datasets(str(root))
+    discover_birdcast_tiles(str(root))
+
+
+def _scan_route_datasets(base: Path) -> dict[str, list[RouteDataset]]:
+    mapping: dict[str, list[RouteDataset]] = {}
+    routes_root = base / ROUTES_SUBDIR
+    if not routes_root.exists():
+        return mapping
+    use_snapshot = snapshot_enabled()
+    if use_snapshot:
+        restored = _routes_from_rows(routes_root, load_section(base, "routes", routes_root))
+        if restored is not None:
+            return restored
+
+    for entry in scan_routes(routes_root):
+        mapping.setdefault(entry.species_code, []).append(_dataset_from_entry(entry))
+
+    for species, datasets in mapping.items():
+        mapping[species] = _sort_datasets(datasets)
+
+    if use_snapshot:
+        save_section(base, "routes", routes_root, _route_rows(routes_root, mapping))
+    return mapping
+
+
+def _scan_birdcast_tiles(base: Path) -> list[BirdCastTile]:
+    tiles_root = base / BIRDCAST_TILES_SUBDIR
     tiles: list[BirdCastTile] = []
     if not tiles_root.exists():
         return tiles
+    use_snapshot = snapshot_enabled()
+    if use_snapshot:
+        restored = _tiles_from_rows(tiles_root, load_section(base, "tiles", tiles_root))
+        if restored is not None:
+            return restored
 
     for path in sorted(tiles_root.rglob("*")):
-        if not path.is_file() or path.suffix.lower() not in BIRDCAST_EXTENSIONS:
+        if not path.is_file():
             continue
-        try:
-            relative = path.relative_to(tiles_root)
-        except ValueError:
-            continue
-        parts = relative.parts
-        if len(parts) < 2:
-            continue
-        date, product = parts[0], parts[1]
-        level = parts[2] if len(parts) >= 4 else None
-        x_val = _coerce_int(parts[3]) if len(parts) >= 5 else None
-        y_val = _coerce_int(Path(parts[4]).stem) if len(parts) >= 5 else None
-        tiles.append(
-            BirdCastTile(
-                date=date,
-                product=product,
-                level=level,
-                x=x_val,
-                y=y_val,
-                path=path,
-            )
-        )
+        tile = _tile_from_path(tiles_root, path)
+        if tile is not None:
+            tiles.append(tile)
 
+    if use_snapshot:
+        save_section(base, "tiles", tiles_root, _tile_rows(tiles_root, tiles))
     return tiles
 
 
-def clear_caches() -> None:
-    discover_route_datasets.cache_clear()
-    discover_birdcast_tiles.cache_clear()
+def _route_rows(routes_root: Path, mapping: dict[str, list[RouteDataset]]) -> list[list[Any]]:
+    return [
+        [
+            dataset.path.relative_to(routes_root).as_posix(),
+            species,
+            dataset.source,
+            dataset.point_count,
+            dataset.metadata,
+        ]
+        for species, datasets in mapping.items()
+        for dataset in datasets
+    ]
+
+
+def _routes_from_rows(
+    routes_root: Path, rows: list[Any] | None
+) -> dict[str, list[RouteDataset]] | None:
+    if rows is None:
+        return None
+    mapping: dict[str, list[RouteDataset]] = {}
+    try:
+        for relative, species, source, point_count, metadata in rows:
+            mapping.setdefault(species, []).append(
+                RouteDataset(species, routes_root / relative, metadata, source, point_count)
+            )
+    except (TypeError, ValueError):
+        return None
+    return mapping
+
+
+def _tile_rows(tiles_root: Path, tiles: list[BirdCastTile]) -> list[list[Any]]:
+    return [
+        [
+            tile.path.relative_to(tiles_root).as_posix(),
+            tile.date,
+            tile.product,
+            tile.level,
+            tile.x,
+            tile.y,
+        ]
+        for tile in tiles
+    ]
 
 
-def _extract_species_code(path: Path, payload: dict[str, Any]) -> str:
-    metadata = payload.get("metadata") or {}
-    species_code = metadata.get("species_code") if isinstance(metadata, dict) else None
-    if not species_code and isinstance(metadata.get("study_id"), str):
-        species_code = path.stem.lower()
-    if not species_code:
-        features = payload.get("features")
-        if isinstance(features, list) and features:
-            props = (
-                (features[0] or {}).get("properties", {}) if isinstance(features[0], dict) else {}
-            )
-            species_code = props.get("species_code") or props.get("taxon")
-    if not species_code:
-        species_code = path.stem
-    return str(species_code).lower()
+def _tiles_from_rows(tiles_root: Path, rows: list[Any] | None) -> list[BirdCastTile] | None:
+    if rows is None:
+        return None
+    try:
+        return [
+            BirdCastTile(date, product, level, x, y, tiles_root / relative)
+            for relative, date, product, level, x, y in rows
+        ]
+    except (TypeError, ValueError):
+        return None
+
+
+def _patch_routes(
+    mapping: dict[str, list[RouteDataset]], changes: dict[Path, CatalogEntry | None]
+) -> dict[str, list[RouteDataset]]:
+    patched = dict(mapping)
+    affected: set[str] = set()
+    for species, datasets in mapping.items():
+        if any(dataset.path in changes for dataset in datasets):
+            patched[species] = [dataset for dataset in datasets if dataset.path not in changes]
+            affected.add(species)
+    for entry in changes.values():
+        if entry is None:
+            continue
+        patched[entry.species_code] = [
+            *patched.get(entry.species_code, []),
+            _dataset_from_entry(entry),
+        ]
+        affected.add(entry.species_code)
+    for species in affected:
+        if patched[species]:
+            patched[species] = _sort_datasets(patched[species])
+        else:
+            del patched[species]
+    return patched
+
+
+def _patch_tiles(
+    tiles: list[BirdCastTile], tiles_root: Path, changed: list[Path]
+) -> list[BirdCastTile]:
+    removed = set(changed)
+    patched = [tile for tile in tiles if tile.path not in removed]
+    for path in changed:
+        tile = _tile_from_path(tiles_root, path) if path.is_file() else None
+        if tile is not None:
+            bisect.insort(patched, tile, key=lambda item: item.path)
+    return patched
+
+
+def _tile_from_path(tiles_root: Path, path: Path) -> BirdCastTile | None:
+    if path.suffix.lower() not in BIRDCAST_EXTENSIONS:
+        return None
+    try:
+        relative = path.relative_to(tiles_root)
+    except ValueError:
+        return None
+    parts = relative.parts
+    if len(parts) < 2:
+        return None
+    date, product = parts[0], parts[1]
+    level = parts[2] if len(parts) >= 4 else None
+    x_val = _coerce_int(parts[3]) if len(parts) >= 5 else None
+    y_val = _coerce_int(Path(parts[4]).stem) if len(parts) >= 5 else None
+    return BirdCastTile(date=date, product=product, level=level, x=x_val, y=y_val, path=path)
+
+
+def _dataset_from_entry(entry: CatalogEntry) -> RouteDataset:
+    return RouteDataset(
+        species_code=entry.species_code,
+        path=entry.path,
+        metadata=entry.metadata,
+        source=entry.source,
+        point_count=entry.point_count,
+    )
+
+
+def _sort_datasets(datasets: list[RouteDataset]) -> list[RouteDataset]:
+    return sorted(
+        datasets,
+        key=lambda item: (0 if item.source == "birdflow" else 1, item.path.name.lower()),
+    )
+
+
+def _remember(cache: dict[str, Any], root: str, value: Any) -> None:
+    cache[root] = value
+    while len(cache) > _CACHE_LIMIT:
+        cache.pop(next(iter(cache)))
+
+
+def _is_under(base: Path, path: Path) -> bool:
+    try:
+        path.relative_to(base)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_route_file(routes_root: Path, path: Path) -> bool:
+    return path.suffix == ".geojson" and _is_under(routes_root, path)
+
+
+def _in_routes_tree(path: Path) -> bool:
+    return path.suffix == ".geojson" and any(
+        parent.parts[-len(ROUTES_SUBDIR.parts) :] == ROUTES_SUBDIR.parts for parent in path.parents
+    )
 
 
 def _coerce_int(value: str) -> int | None:
@@ -0,0 +1,29 @@
+"""Readers for the ``MIGRATION_*`` environment toggles and limits."""
+
+from __future__ import annotations
+
+import os
+
+_TRUE = {"1", "true", "on", "yes"}
+_FALSE = {"0", "false", "off", "no"}
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean toggle.
+
+    Features that are on by default are only switched off by ``0/false/off/no``;
+    features that are off by default are only switched on by ``1/true/on/yes``.
+    """
+
+    value = os.getenv(name, "").strip().lower()
+    return value not in _FALSE if default else value in _TRUE
+
+
+def env_int(name: str, default: int, *, minimum: int | None = None) -> int:
+    """Read an integer setting, falling back to ``default`` when unset or malformed."""
+
+    try:
+        value = int(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
@@ -2,42 +2,291 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+from collections.abc import AsyncIterator, Generator
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Annotated, Literal
 
-from .core import generate_routes, list_datasets, list_tiles, refresh_datasets
-from .models import AdminRefreshResponse, RouteRequest, RouteResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from .concurrency import EndpointLimiter, build_limiters
+from .core import (
+    fetch_route_dataset,
+    find_routes,
+    generate_routes,
+    generate_routes_batch,
+    has_route_dataset,
+    list_datasets,
+    list_tiles,
+    refresh_datasets,
+    route_cache_stats,
+    stream_route,
+    sync_shared_catalog,
+    tile_cache_stats,
+    tile_file,
+)
+from .datasets import resolve_data_root
+from .metrics import PROMETHEUS_MEDIA_TYPE, Sample, render_metrics, span
+from .models import (
+    AdminRefreshResponse,
+    DatasetQuery,
+    RegionQuery,
+    RouteBatchRequest,
+    RouteBatchResponse,
+    RouteRequest,
+    RouteResponse,
+    TileQuery,
+)
+from .shared import shared_generation
+from .streaming import DEFAULT_BATCH_POINTS, MEDIA_TYPES, StreamFormat, encode
+from .tile_server import tile_max_age
+from .warmup import WarmupScheduler, warmup_enabled
+from .watch import CatalogWatcher, watch_enabled
+from .wire import (
+    DECKGL_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    Precision,
+    compress,
+    encode_deckgl_binary,
+    negotiate_encoding,
+    wants_deckgl_binary,
+)
+
+RouteRepresentation = Literal["both", "geojson", "deckgl"]
+
+
+def create_app(
+    watch: bool | None = None,
+    warmup: bool | None = None,
+    limits: dict[str, int] | None = None,
+) -> FastAPI:
+    watch = watch_enabled() if watch is None else watch
+    warmup = warmup_enabled() if warmup is None else warmup
+    limiters = build_limiters(limits)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        watcher = CatalogWatcher(resolve_data_root(None)) if watch else None
+        if watcher is not None:
+            watcher.start()
+        if warmup:
+            app.state.warmup = WarmupScheduler(resolve_data_root(None))
+            app.state.warmup.start()
+        try:
+            yield
+        finally:
+            if watcher is not None:
+                watcher.stop()
+            if app.state.warmup is not None:
+                app.state.warmup.stop()
 
-def create_app() -> FastAPI:
     app = FastAPI(
         title="Migration MCP Server",
         version="0.1.0",
         description="Generate surrogate or dataset-backed migration trajectories for agents.",
+        lifespan=lifespan,
     )
+    app.state.warmup = None
+    app.state.limiters = limiters
+    if shared_generation() is not None:
+        app.add_middleware(_CatalogSync)
 
-    @app.post("/routes", response_model=RouteResponse)
-    def post_routes(request: RouteRequest) -> RouteResponse:
+    @app.post(
+        "/routes",
+        response_model=RouteResponse,
+        responses={200: {"content": {DECKGL_MEDIA_TYPE: {}, MEDIA_TYPES["ndjson"]: {}}}},
+    )
+    async def post_routes(
+        request: RouteRequest,
+        http_request: Request,
+        stream: StreamFormat | None = None,
+        batch_points: Annotated[int, Query(ge=1, le=100_000)] = DEFAULT_BATCH_POINTS,
+        include: RouteRepresentation = "both",
+        precision: Precision = "float64",
+    ) -> Response:
+        if not await limiters["catalog"].run(has_route_dataset, request):
+            # Download on the event loop so a slow fetch does not pin a worker thread.
+            await fetch_route_dataset(request)
+        limiter = limiters["routes"]
         try:
-            return generate_routes(request)
+            if stream is not None:
+                route = await limiter.run(partial(stream_route, fetch_missing=False), request)
+                chunks = _drain(limiter, encode(route, stream, batch_points))
+                return StreamingResponse(chunks, media_type=MEDIA_TYPES[stream])
+
+            def render() -> Response:
+                response = generate_routes(request, fetch_missing=False)
+                return _render_route(response, http_request.headers, include, precision)
+
+            return await limiter.run(render)
         except RuntimeError as exc:  # pragma: no cover
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    @app.post("/routes/batch", response_model=RouteBatchResponse)
+    async def post_routes_batch(batch: RouteBatchRequest, http_request: Request) -> Response:
+        def render() -> Response:
+            response = generate_routes_batch(batch)
+            return _encoded_response(
+                response.model_dump_json().encode("utf-8"), JSON_MEDIA_TYPE, http_request.headers
+            )
+
+        return await limiters["batch"].run(render)
+
+    @app.get("/routes/region")
+    async def get_routes_in_region(query: Annotated[RegionQuery, Query()]) -> dict[str, object]:
+        try:
+            return await limiters["catalog"].run(find_routes, query)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
     @app.get("/datasets")
-    def get_datasets() -> dict[str, object]:
-        return list_datasets()
+    async def get_datasets(query: Annotated[DatasetQuery, Query()]) -> dict[str, object]:
+        try:
+            return await limiters["catalog"].run(partial(list_datasets, query=query))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     @app.get("/tiles")
-    def get_tiles() -> dict[str, object]:
-        return list_tiles()
+    async def get_tiles(query: Annotated[TileQuery, Query()]) -> dict[str, object]:
+        try:
+            return await limiters["catalog"].run(partial(list_tiles, query=query))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    @app.api_route("/tiles/{date}/{product}/{level}/{x}/{y}", methods=["GET", "HEAD"])
+    async def get_tile(
+        date: str, product: str, level: str, x: str, y: str, http_request: Request
+    ) -> Response:
+        tile = await limiters["tiles"].run(tile_file, (date, product, level, x, y))
+        if tile is None:
+            raise HTTPException(status_code=404, detail="tile not found")
+        headers = tile.headers(tile_max_age())
+        if tile.not_modified(http_request.headers):
+            return Response(status_code=304, headers=headers)
+        if tile.body is not None and "range" not in http_request.headers:
+            return Response(tile.body, media_type=tile.media_type, headers=headers)
+        # Ranged and large reads stream from disk (zero-copy where the server supports it).
+        return FileResponse(
+            tile.path, media_type=tile.media_type, headers=headers, stat_result=tile.stat
+        )
+
+    @app.get("/admin/warmup")
+    async def get_warmup() -> dict[str, object]:
+        scheduler: WarmupScheduler | None = app.state.warmup
+        if scheduler is None:
+            return {"state": "disabled"}
+        return scheduler.progress()
+
+    @app.get("/admin/limits")
+    async def get_limits() -> dict[str, object]:
+        return {name: limiter.snapshot() for name, limiter in limiters.items()}
+
+    @app.get("/metrics", response_class=Response)
+    async def get_metrics() -> Response:
+        body = render_metrics(_runtime_samples(limiters))
+        return Response(body, media_type=PROMETHEUS_MEDIA_TYPE)
 
     @app.post("/admin/refresh", response_model=AdminRefreshResponse)
-    def post_refresh(request: RouteRequest | None = None, x_mcp_admin_token: str | None = None) -> AdminRefreshResponse:
+    async def post_refresh(
+        request: RouteRequest | None = None, x_mcp_admin_token: str | None = None
+    ) -> AdminRefreshResponse:
         try:
-            return refresh_datasets(request, x_mcp_admin_token)
+            return await limiters["admin"].run(refresh_datasets, request, x_mcp_admin_token)
         except RuntimeError as exc:  # pragma: no cover
             raise HTTPException(status_code=403, detail=str(exc)) from exc
 
     return app
 
 
+class _CatalogSync:
+    """Pick up catalog changes made by sibling workers before handling a request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            sync_shared_catalog()
+        await self.app(scope, receive, send)
+
+
+def _render_route(
+    response: RouteResponse,
+    headers: Headers,
+    include: RouteRepresentation,
+    precision: Precision,
+) -> Response:
+    if wants_deckgl_binary(headers.get("accept")):
+        with span("serialize"):
+            body = encode_deckgl_binary(response.deckgl, response.metadata, precision)
+        return _encoded_response(body, DECKGL_MEDIA_TYPE, headers)
+    if include == "geojson":
+        response = response.model_copy(update={"deckgl": []})
+    elif include == "deckgl":
+        response = response.model_copy(update={"geojson": {}})
+    with span("serialize"):
+        body = response.model_dump_json().encode("utf-8")
+    return _encoded_response(body, JSON_MEDIA_TYPE, headers)
+
+
+def _encoded_response(body: bytes, media_type: str, headers: Headers) -> Response:
+    with span("compress"):
+        body, encoding = compress(body, negotiate_encoding(headers.get("accept-encoding")))
+    extra = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None:
+        extra["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=extra)
+
+
+def _runtime_samples(limiters: dict[str, EndpointLimiter]) -> list[Sample]:
+    """Route cache and limiter state, read at scrape time."""
+
+    samples: list[Sample] = []
+    for prefix, cache in (
+        ("migration_route_cache", route_cache_stats()),
+        ("migration_tile_cache", tile_cache_stats()),
+    ):
+        samples.extend(
+            [
+                (f"{prefix}_hits_total", "counter", {}, cache["hits"]),
+                (f"{prefix}_misses_total", "counter", {}, cache["misses"]),
+                (f"{prefix}_evictions_total", "counter", {}, cache["evictions"]),
+                (f"{prefix}_entries", "gauge", {}, cache["entries"]),
+                (f"{prefix}_bytes", "gauge", {}, cache["bytes"]),
+            ]
+        )
+    for name, limiter in limiters.items():
+        snapshot = limiter.snapshot()
+        labels = {"endpoint": name}
+        samples.extend(
+            [
+                ("migration_limiter_active", "gauge", labels, snapshot["active"]),
+                ("migration_limiter_queued", "gauge", labels, snapshot["queued"]),
+                ("migration_limiter_completed_total", "counter", labels, snapshot["completed"]),
+                (
+                    "migration_limiter_wait_seconds_total",
+                    "counter",
+                    labels,
+                    snapshot["wait_total_s"],
+                ),
+            ]
+        )
+    return samples
+
+
+async def _drain(
+    limiter: EndpointLimiter, chunks: Generator[bytes, None, None]
+) -> AsyncIterator[bytes]:
+    """Pull encoded chunks on the limiter's threads so file reads never block the loop."""
+
+    try:
+        while (chunk := await limiter.run(next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        chunks.close()
+
+
 __all__ = ["create_app"]
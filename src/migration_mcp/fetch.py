@@ -0,0 +1,143 @@
+"""Async, pooled and deduplicated downloads for remote migration sources."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .env import env_int
+from .metrics import count, observe
+
+FETCH_MAX_CONNECTIONS_ENV = "MIGRATION_FETCH_MAX_CONNECTIONS"
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT_S = 30.0
+CHUNK_SIZE = 64 * 1024
+# Chunks are gathered up to this size and written from a worker thread, so disk
+# writes never block the shared fetch loop.
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class Fetcher:
+    """Stream remote files to disk from a dedicated event loop.
+
+    All downloads share one ``httpx.AsyncClient`` with a bounded connection pool, run
+    on a background loop thread, and are deduplicated per target path: concurrent
+    callers asking for the same file await a single download. Bodies are streamed to
+    a temporary sibling and atomically renamed into place, so readers never observe
+    a partially written file.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        timeout: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
+        self.max_connections = max_connections or _max_connections()
+        self.timeout = timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[Path, asyncio.Future[bool]] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, target: Path) -> bool:
+        """Blocking download of ``url`` into ``target``; returns ``False`` on failure."""
+
+        return self._submit(self._fetch(url, target)).result()
+
+    async def fetch_async(self, url: str, target: Path) -> bool:
+        """Awaitable download usable from any event loop."""
+
+        return await asyncio.wrap_future(self._submit(self._fetch(url, target)))
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _submit(self, coro: Coroutine[Any, Any, bool]) -> Future[bool]:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="migration-fetch", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _fetch(self, url: str, target: Path) -> bool:
+        task = self._inflight.get(target)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url, target))
+            self._inflight[target] = task
+            task.add_done_callback(lambda _: self._inflight.pop(target, None))
+        return await asyncio.shield(task)
+
+    async def _download(self, url: str, target: Path) -> bool:
+        import httpx  # deferred: it is only needed once something is actually fetched
+
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            self._client = httpx.AsyncClient(
+                limits=limits, timeout=self.timeout, follow_redirects=True
+            )
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.part")
+        started = time.perf_counter()
+        received = 0
+        try:
+            await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+            async with self._client.stream("GET", url) as response:
+                response.raise_for_status()
+                handle = await asyncio.to_thread(tmp.open, "wb")
+                try:
+                    pending = bytearray()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        pending += chunk
+                        received += len(chunk)
+                        if len(pending) >= WRITE_BUFFER_SIZE:
+                            data, pending = pending, bytearray()
+                            await asyncio.to_thread(handle.write, data)
+                    if pending:
+                        await asyncio.to_thread(handle.write, pending)
+                finally:
+                    await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, tmp, target)
+        except (httpx.HTTPError, httpx.InvalidURL, OSError):
+            # InvalidURL is not an HTTPError; a malformed configured URL is just a failed fetch.
+            with suppress(OSError):
+                tmp.unlink()
+            observe("migration_fetch_seconds", time.perf_counter() - started, outcome="error")
+            return False
+        finally:
+            count("migration_fetch_bytes_total", received)
+        observe("migration_fetch_seconds", time.perf_counter() - started, outcome="ok")
+        return True
+
+    async def _aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _max_connections() -> int:
+    return env_int(FETCH_MAX_CONNECTIONS_ENV, DEFAULT_MAX_CONNECTIONS, minimum=1)
@@ -0,0 +1,227 @@
+"""Per-stage timing spans and counters, exported in the Prometheus text format.
+
+Route generation is wrapped in named :func:`span` blocks (``discover``, ``fetch``,
+``load_geojson``, ``resample``, ``build_deckgl``, ``serialize`` …). Each span feeds
+the process-wide ``migration_stage_seconds`` histogram and, inside a
+:func:`collect` block, a per-request ``{stage: seconds}`` dict that can be returned
+in route metadata. With ``MIGRATION_METRICS=0`` and no active collection a span is
+a single environment lookup.
+
+Metrics are per process: under ``serve --workers N`` each worker reports its own.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .env import env_flag
+
+METRICS_ENV = "MIGRATION_METRICS"
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans range from microsecond cache hits to multi-second remote fetches.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+HELP: dict[str, str] = {
+    "migration_stage_seconds": "Time spent in each route-generation stage.",
+    "migration_routes_total": "Routes generated, by outcome and route cache status.",
+    "migration_route_loads_total": "Dataset loads that missed the route cache, by format.",
+    "migration_route_bytes_read_total": "Bytes of route files read and parsed.",
+    "migration_fetch_seconds": "Duration of remote dataset downloads.",
+    "migration_fetch_bytes_total": "Bytes downloaded from remote sources.",
+}
+
+# (name, labels) with labels as sorted (key, value) pairs.
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+# (name, type, labels, value) for values read at scrape time.
+Sample = tuple[str, str, dict[str, str], float]
+
+_TIMINGS: ContextVar[dict[str, float] | None] = ContextVar("migration_timings", default=None)
+
+
+def metrics_enabled() -> bool:
+    return env_flag(METRICS_ENV, True)
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Registry:
+    """Thread-safe counters and histograms keyed by metric name and labels."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[MetricKey, float] = {}
+        self._histograms: dict[MetricKey, _Histogram] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Current counter value (or histogram observation count)."""
+
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key in self._histograms:
+                return float(self._histograms[key].count)
+            return self._counters.get(key, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self, extra: Iterable[Sample] = ()) -> str:
+        """Prometheus text exposition of every metric plus ``extra`` scrape-time samples."""
+
+        families: dict[str, tuple[str, list[str]]] = {}
+
+        def family(name: str, kind: str) -> list[str]:
+            return families.setdefault(name, (kind, []))[1]
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                family(name, "counter").append(f"{name}{_labels(labels)} {_number(value)}")
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                lines = family(name, "histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    bucket = (*labels, ("le", _number(bound)))
+                    lines.append(f"{name}_bucket{_labels(bucket)} {cumulative}")
+                lines.append(f"{name}_bucket{_labels((*labels, ('le', '+Inf')))} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        for name, kind, labels, value in extra:
+            family(name, kind).append(
+                f"{name}{_labels(tuple(sorted(labels.items())))} {_number(value)}"
+            )
+
+        output: list[str] = []
+        for name, (kind, lines) in families.items():
+            if name in HELP:
+                output.append(f"# HELP {name} {HELP[name]}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+
+REGISTRY = Registry()
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as ``stage``."""
+
+    timings = _TIMINGS.get()
+    record = metrics_enabled()
+    if timings is None and not record:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+        if record:
+            REGISTRY.observe("migration_stage_seconds", elapsed, stage=stage)
+
+
+@contextmanager
+def collect(enabled: bool = True) -> Iterator[dict[str, float] | None]:
+    """Gather the spans run by this thread (or task) into a ``{stage: seconds}`` dict.
+
+    Yields ``None`` when ``enabled`` is false. Work handed to other threads is only
+    included when those threads copy the caller's context.
+    """
+
+    if not enabled:
+        yield None
+        return
+    timings: dict[str, float] = {}
+    token = _TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _TIMINGS.reset(token)
+
+
+def count(name: str, value: float = 1.0, **labels: str) -> None:
+    if metrics_enabled():
+        REGISTRY.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    if metrics_enabled():
+        REGISTRY.observe(name, value, **labels)
+
+
+def render_metrics(extra: Iterable[Sample] = ()) -> str:
+    return REGISTRY.render(extra)
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
@@ -2,22 +2,64 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+from .resampling import ResampleMode, timestamp_seconds
+from .time_window import Season
 
-from pydantic import BaseModel, Field
 
 class RouteRequest(BaseModel):
     species_code: str | None = Field(default=None, description="Optional species code")
     data_root: str | None = Field(default=None, description="Override for dataset root")
     num_waypoints: int = Field(20, ge=3, le=500)
+    resample_mode: ResampleMode = Field(
+        "index",
+        description=(
+            "Waypoint selection: evenly spaced indices, equal great-circle arc length, "
+            "Douglas-Peucker simplification, or fixed time intervals"
+        ),
+    )
+    tolerance_m: float | None = Field(
+        default=None, gt=0, description="Douglas-Peucker tolerance in metres"
+    )
+    interval_s: float | None = Field(
+        default=None, gt=0, description="Sampling interval in seconds for time_interval mode"
+    )
     cruise_velocity_m_s: float = Field(10.0, ge=0.0)
     trim_yaw_rad: float = Field(0.0)
     climb_rate_m_s: float = Field(0.0)
     timestep_s: float = Field(1.0, gt=0)
     label: str = Field("prototype", description="Label for generated trajectory")
     objective: str | None = Field(default=None, description="Optional mission objective")
+    individuals: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="Individual ids to include from multi-individual datasets (default: all)",
+    )
+    time_from: str | float | None = Field(
+        default=None, description="Keep points at or after this time (ISO-8601 or epoch seconds)"
+    )
+    time_to: str | float | None = Field(
+        default=None, description="Keep points at or before this time (ISO-8601 or epoch seconds)"
+    )
+    season: Season | None = Field(
+        default=None,
+        description="Keep points in this meteorological season of any year (e.g. spring: Mar-May)",
+    )
+    timings: bool = Field(
+        False, description="Report per-stage timings in metadata.timings_ms (for diagnostics)"
+    )
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("time_from", "time_to")
+    @classmethod
+    def _check_time(cls, value: str | float | None) -> str | float | None:
+        if value is not None and timestamp_seconds([value]) is None:
+            raise ValueError(f"invalid time bound: {value!r}")
+        return value
+
 
 class RouteResponse(BaseModel):
     geojson: dict[str, Any]
@@ -25,6 +67,119 @@ class RouteResponse(BaseModel):
     metadata: dict[str, Any]
 
 
+class RouteBatchRequest(BaseModel):
+    requests: list[RouteRequest] = Field(..., min_length=1, max_length=200)
+    max_workers: int | None = Field(
+        default=None, ge=1, le=32, description="Upper bound on concurrently processed items"
+    )
+
+
+class RouteBatchItem(BaseModel):
+    index: int
+    response: RouteResponse | None = None
+    error: str | None = None
+
+
+class RouteBatchResponse(BaseModel):
+    results: list[RouteBatchItem]
+
+
 class AdminRefreshResponse(BaseModel):
     refreshed: bool
     datasets: dict[str, int]
+
+
+DatasetField = Literal["species_code", "path", "source", "point_count", "metadata"]
+
+
+class DatasetQuery(BaseModel):
+    species: list[str] | None = Field(default=None, description="Species codes to include")
+    source: str | None = Field(default=None, description="Dataset source, e.g. birdflow")
+    fields: list[DatasetField] | None = Field(
+        default=None, description="Fields to return per dataset (default: all)"
+    )
+    limit: int = Field(500, ge=1, le=5000, description="Maximum datasets per page")
+    cursor: str | None = Field(default=None, description="next_cursor from a previous page")
+
+    @field_validator("species", "fields", mode="before")
+    @classmethod
+    def _split_lists(cls, value: Any) -> Any:
+        return _split_csv(value)
+
+
+class TileQuery(BaseModel):
+    date_from: str | None = Field(default=None, description="First date (inclusive, YYYY-MM-DD)")
+    date_to: str | None = Field(default=None, description="Last date (inclusive, YYYY-MM-DD)")
+    product: str | None = Field(default=None, description="BirdCast product, e.g. summary")
+    level: str | None = Field(default=None, description="Tile level / zoom directory")
+    x_min: int | None = Field(default=None, ge=0)
+    x_max: int | None = Field(default=None, ge=0)
+    y_min: int | None = Field(default=None, ge=0)
+    y_max: int | None = Field(default=None, ge=0)
+    bbox: list[float] | None = Field(
+        default=None,
+        min_length=4,
+        max_length=4,
+        description="Viewport as west,south,east,north in degrees (numeric levels only)",
+    )
+    limit: int = Field(1000, ge=1, le=10000, description="Maximum tiles per page")
+    cursor: str | None = Field(default=None, description="next_cursor from a previous page")
+
+    @field_validator("bbox", mode="before")
+    @classmethod
+    def _split_bbox(cls, value: Any) -> Any:
+        return _split_csv(value)
+
+    @field_validator("bbox")
+    @classmethod
+    def _check_bbox(cls, value: list[float] | None) -> list[float] | None:
+        return _check_bbox(value)
+
+
+class RegionQuery(BaseModel):
+    bbox: list[float] = Field(
+        ...,
+        min_length=4,
+        max_length=4,
+        description="Region as west,south,east,north in degrees (west > east crosses 180°)",
+    )
+    time_from: str | float | None = Field(
+        default=None, description="Start of the time window (ISO-8601 or epoch seconds)"
+    )
+    time_to: str | float | None = Field(
+        default=None, description="End of the time window (ISO-8601 or epoch seconds)"
+    )
+    species: list[str] | None = Field(default=None, description="Species codes to include")
+    clip: bool = Field(False, description="Return the route points inside the region")
+    limit: int = Field(100, ge=1, le=1000, description="Maximum routes to return")
+
+    @field_validator("bbox", "species", mode="before")
+    @classmethod
+    def _split_lists(cls, value: Any) -> Any:
+        return _split_csv(value)
+
+    @field_validator("bbox")
+    @classmethod
+    def _check_bbox(cls, value: list[float]) -> list[float]:
+        return _check_bbox(value)
+
+
+def _split_csv(value: Any) -> Any:
+    """Accept ``a,b`` strings (and repeated query parameters) for list fields."""
+
+    if isinstance(value, str):
+        value = [value]
+    if isinstance(value, list) and all(isinstance(entry, str) for entry in value):
+        return [item.strip() for entry in value for item in entry.split(",") if item.strip()]
+    return value
+
+
+def _check_bbox(value: list[float] | None) -> list[float] | None:
+    if value is None:
+        return value
+    west, south, east, north = value
+    if not (-180.0 <= west <= 180.0 and -180.0 <= east <= 180.0):
+        raise ValueError("bbox longitudes must lie in [-180, 180]")
+    if not -90.0 <= south <= north <= 90.0:
+        raise ValueError("bbox latitudes must satisfy -90 <= south <= north <= 90")
+    return value
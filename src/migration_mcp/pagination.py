@@ -0,0 +1,28 @@
+"""Opaque cursor encoding shared by the paginated catalog listings."""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Encode a listing sort key as a URL-safe token."""
+
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int, kind: str) -> list[Any]:
+    """Decode a token from ``encode_cursor``; raises ``ValueError`` if it is malformed."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as exc:
+        raise ValueError(f"invalid {kind} cursor: {cursor!r}") from exc
+    if not isinstance(values, list) or len(values) != arity:
+        raise ValueError(f"invalid {kind} cursor: {cursor!r}")
+    return values
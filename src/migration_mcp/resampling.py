@@ -0,0 +1,341 @@
+"""Distance- and time-aware waypoint selection for route resampling."""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import pairwise
+from typing import Any, Literal
+
+from . import vector
+from .time_window import TimeWindow
+
+ResampleMode = Literal["index", "arc_length", "douglas_peucker", "time_interval"]
+
+EARTH_RADIUS_M = 6_371_008.8
+# Shorter segments are scanned in Python; NumPy's per-call overhead outweighs the loop.
+_VECTOR_SEGMENT = 256
+
+
+@dataclass(frozen=True)
+class ResampleSpec:
+    """Hashable description of a resampling request (also used as a cache key)."""
+
+    target: int
+    mode: ResampleMode = "index"
+    tolerance_m: float | None = None
+    interval_s: float | None = None
+    individuals: tuple[str, ...] | None = None
+    window: TimeWindow | None = None
+
+    @property
+    def always_applies(self) -> bool:
+        """Whether the mode can drop points even when the track is shorter than ``target``."""
+
+        return (self.mode == "douglas_peucker" and self.tolerance_m is not None) or (
+            self.mode == "time_interval" and self.interval_s is not None
+        )
+
+
+def select_indices(
+    spec: ResampleSpec,
+    length: int,
+    axes: Callable[[], tuple[Sequence[float], Sequence[float]]],
+    timestamps: Sequence[Any] | None,
+    evenly: Callable[[int, int], list[int]],
+    pyramid: Pyramid | None = None,
+) -> list[int] | None:
+    """Return the waypoint indices to keep, or ``None`` to keep the track unchanged.
+
+    ``axes`` lazily returns the longitude and latitude sequences (only the distance
+    modes need them). ``evenly`` is the index-mode selector; the other modes fall back
+    to it when the track has no usable distances or timestamps. A precomputed
+    ``pyramid`` for the same points answers the distance modes without reading them.
+    """
+
+    if spec.target <= 0 or length <= 0:
+        return None
+    if length <= spec.target and not spec.always_applies:
+        return None
+    if spec.mode == "arc_length":
+        indices = (
+            arc_length_from_distances(pyramid.distances, spec.target)
+            if pyramid is not None
+            else arc_length_indices(*axes(), spec.target)
+        )
+    elif spec.mode == "douglas_peucker":
+        indices = (
+            pyramid.douglas_peucker(length, spec.target, spec.tolerance_m)
+            if pyramid is not None
+            else None
+        )
+        if indices is None:
+            indices = douglas_peucker_indices(*axes(), spec.target, spec.tolerance_m)
+    elif spec.mode == "time_interval":
+        seconds = timestamp_seconds(timestamps) if timestamps is not None else None
+        indices = (
+            time_interval_indices(seconds, spec.target, spec.interval_s, evenly)
+            if seconds is not None and len(seconds) == length
+            else None
+        )
+    else:
+        indices = None
+    if indices is None:
+        return evenly(length, spec.target) if length > spec.target else None
+    return indices
+
+
+def arc_length_indices(
+    lon: Sequence[float], lat: Sequence[float], target: int
+) -> list[int] | None:
+    """Pick points closest to equal great-circle distances along the track (O(n))."""
+
+    if target < 2 or len(lon) < 2:
+        return None
+    return arc_length_from_distances(cumulative_distances(lon, lat), target)
+
+
+def arc_length_from_distances(cumulative: Sequence[float], target: int) -> list[int] | None:
+    """:func:`arc_length_indices` over precomputed cumulative distances (O(target log n)).
+
+    ``cumulative`` may start at any offset, so a slice of a longer track's distances
+    selects from that stretch alone.
+    """
+
+    length = len(cumulative)
+    if target < 2 or length < 2:
+        return None
+    first = cumulative[0]
+    total = cumulative[-1] - first
+    if total <= 0.0:
+        return None
+
+    indices: list[int] = []
+    for step in range(target):
+        goal = first + total * step / (target - 1)
+        cursor = max(bisect.bisect_right(cumulative, goal) - 1, 0)
+        best = cursor
+        if cursor + 1 < length and cumulative[cursor + 1] - goal < goal - cumulative[cursor]:
+            best = cursor + 1
+        if not indices or best > indices[-1]:
+            indices.append(best)
+    if indices[-1] != length - 1:
+        indices[-1] = length - 1
+    return indices
+
+
+def cumulative_distances(lon: Sequence[float], lat: Sequence[float]) -> list[float]:
+    """Great-circle distance in metres from the first point to each point."""
+
+    cumulative = [0.0] * len(lon)
+    for idx in range(1, len(lon)):
+        cumulative[idx] = cumulative[idx - 1] + haversine_m(
+            lon[idx - 1], lat[idx - 1], lon[idx], lat[idx]
+        )
+    return cumulative
+
+
+def douglas_peucker_indices(
+    lon: Sequence[float],
+    lat: Sequence[float],
+    target: int,
+    tolerance_m: float | None,
+) -> list[int] | None:
+    """Douglas–Peucker simplification capped at ``target`` points.
+
+    Interior points are ranked by the deviation at which DP would keep them (capped
+    by their parent split, so thresholding reproduces classic DP). The top-ranked
+    points above ``tolerance_m`` are kept, at most ``target`` including both
+    endpoints. Only the splits that can be kept are computed.
+    """
+
+    length = len(lon)
+    if length <= 2:
+        return list(range(length))
+    if target < 2:
+        return [0]
+    order, ranks = douglas_peucker_ranking(lon, lat, target - 2)
+    return ranked_indices(order, ranks, length, target, tolerance_m)
+
+
+def douglas_peucker_ranking(
+    lon: Sequence[float], lat: Sequence[float], limit: int
+) -> tuple[list[int], list[float]]:
+    """The ``limit`` most important interior points, most important first, with their ranks.
+
+    Segments are split in rank order (ties by index), so the ranking for a smaller
+    ``limit`` is always a prefix of this one and each prefix is a simplification level.
+    Each split scans its segment once; O(n log limit) for typical tracks.
+    """
+
+    length = len(lon)
+    if length <= 2 or limit <= 0:
+        return [], []
+    xs, ys = _project(lon, lat)
+    arrays = (
+        (vector.as_floats(xs), vector.as_floats(ys))
+        if vector.numpy_enabled() and length > _VECTOR_SEGMENT
+        else None
+    )
+    heap: list[tuple[float, int, int, int]] = []
+
+    def push(start: int, end: int, ceiling: float) -> None:
+        if end - start >= 2:
+            if arrays is not None and end - start > _VECTOR_SEGMENT:
+                split, deviation = vector.farthest(*arrays, start, end)
+            else:
+                split, deviation = _farthest(xs, ys, start, end)
+            heapq.heappush(heap, (-min(deviation, ceiling), split, start, end))
+
+    push(0, length - 1, math.inf)
+    order: list[int] = []
+    ranks: list[float] = []
+    while heap and len(order) < limit:
+        negative, split, start, end = heapq.heappop(heap)
+        order.append(split)
+        ranks.append(-negative)
+        push(start, split, -negative)
+        push(split, end, -negative)
+    return order, ranks
+
+
+def ranked_indices(
+    order: Sequence[float],
+    ranks: Sequence[float],
+    length: int,
+    target: int,
+    tolerance_m: float | None,
+) -> list[int]:
+    """Endpoints plus the leading entries of a :func:`douglas_peucker_ranking` above tolerance."""
+
+    if length <= 2:
+        return list(range(length))
+    if target < 2:
+        return [0]
+    threshold = tolerance_m if tolerance_m is not None else -1.0
+    kept: list[int] = []
+    for idx, rank in zip(order[: target - 2], ranks[: target - 2]):
+        if rank <= threshold:
+            break
+        kept.append(int(idx))
+    return [0, *sorted(kept), length - 1]
+
+
+@dataclass(frozen=True)
+class Pyramid:
+    """Level-of-detail data precomputed for a track when its sidecar is compiled.
+
+    ``distances`` are cumulative great-circle metres for the selected points.
+    ``order``/``ranks`` are the track's :func:`douglas_peucker_ranking`, truncated to
+    the first ``len(order)`` points; each prefix is one simplification level. They
+    only describe the whole track, so pass ``None`` for windowed stretches.
+    """
+
+    distances: Sequence[float]
+    order: Sequence[float] | None = None
+    ranks: Sequence[float] | None = None
+
+    def douglas_peucker(
+        self, length: int, target: int, tolerance_m: float | None
+    ) -> list[int] | None:
+        """The :func:`douglas_peucker_indices` result, or ``None`` past the stored levels."""
+
+        if self.order is None or self.ranks is None:
+            return None
+        if len(self.order) < min(target, length) - 2:
+            return None
+        return ranked_indices(self.order, self.ranks, length, target, tolerance_m)
+
+
+def time_interval_indices(
+    seconds: Sequence[float],
+    target: int,
+    interval_s: float | None,
+    evenly: Callable[[int, int], list[int]],
+) -> list[int] | None:
+    """Keep the first point at or after each ``interval_s`` tick (O(n log n) worst case)."""
+
+    length = len(seconds)
+    if length < 2 or any(b < a for a, b in pairwise(seconds)):
+        return None
+    start, end = seconds[0], seconds[-1]
+    if end <= start:
+        return None
+    interval = interval_s if interval_s is not None else (end - start) / max(target - 1, 1)
+
+    indices = [0]
+    tick = start + interval
+    while tick <= end:
+        idx = bisect.bisect_left(seconds, tick, indices[-1] + 1)
+        if idx >= length:
+            break
+        indices.append(idx)
+        # Skip ticks that fall inside a gap so sparse tracks stay O(points kept).
+        tick = start + interval * (math.floor((seconds[idx] - start) / interval) + 1)
+    if indices[-1] != length - 1:
+        indices.append(length - 1)
+    if len(indices) > target:
+        indices = [indices[pos] for pos in evenly(len(indices), target)]
+    return indices
+
+
+def timestamp_seconds(values: Sequence[Any]) -> list[float] | None:
+    """Convert numeric or ISO-8601 timestamps to seconds; ``None`` if any is unusable."""
+
+    seconds: list[float] = []
+    for value in values:
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            seconds.append(float(value))
+            continue
+        if not isinstance(value, str):
+            return None
+        text = value[:-1] + "+00:00" if value.endswith("Z") else value
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        seconds.append(parsed.timestamp())
+    return seconds
+
+
+def haversine_m(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _project(lon: Sequence[float], lat: Sequence[float]) -> tuple[list[float], list[float]]:
+    """Equirectangular projection to metres around the track's mean latitude."""
+
+    scale = math.radians(1.0) * EARTH_RADIUS_M
+    mean_lat = math.radians(sum(lat) / len(lat))
+    x_scale = scale * math.cos(mean_lat)
+    return [value * x_scale for value in lon], [value * scale for value in lat]
+
+
+def _farthest(xs: list[float], ys: list[float], start: int, end: int) -> tuple[int, float]:
+    ax, ay, bx, by = xs[start], ys[start], xs[end], ys[end]
+    dx, dy = bx - ax, by - ay
+    norm = dx * dx + dy * dy
+    best, best_distance = start + 1, -1.0
+    for idx in range(start + 1, end):
+        px, py = xs[idx] - ax, ys[idx] - ay
+        if norm == 0.0:
+            distance = px * px + py * py
+        else:
+            t = max(0.0, min(1.0, (px * dx + py * dy) / norm))
+            ex, ey = px - t * dx, py - t * dy
+            distance = ex * ex + ey * ey
+        if distance > best_distance:
+            best, best_distance = idx, distance
+    return best, math.sqrt(best_distance)
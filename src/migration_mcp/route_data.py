@@ -0,0 +1,153 @@
+"""Immutable route representation shared by the GeoJSON and deck.gl views.
+
+A resampled route is held as :class:`RouteData`: one :class:`Track` per feature with
+its coordinate rows and timestamps as tuples, plus a frozen skeleton of everything
+else in the document. :meth:`RouteData.geojson` and :meth:`Track.deckgl` build fresh
+containers around those shared tuples, so one cached instance can serve any number
+of concurrent requests without copying, and no response can alter another's data.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any
+
+INDIVIDUAL_PROPERTIES = ("individual_id", "individual-local-identifier", "tag_id", "bird", "label")
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Fresh JSON-ready copy of the mappings in ``value``; flat tuples are shared."""
+
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple) and any(isinstance(item, (Mapping, tuple)) for item in value):
+        return tuple(thaw(item) for item in value)
+    return value
+
+
+def individual_id(feature: Mapping[str, Any], position: int) -> str:
+    """Identify the individual a feature tracks: its ``id``, a known property, or its index."""
+
+    ident = feature.get("id")
+    properties = feature.get("properties") or {}
+    for name in INDIVIDUAL_PROPERTIES:
+        if ident is not None:
+            break
+        ident = properties.get(name)
+    return str(position) if ident is None else str(ident)
+
+
+@dataclass(frozen=True)
+class Track:
+    """One feature of a route.
+
+    ``skeleton`` is the frozen feature with empty ``coordinates`` (and ``timestamps``
+    when present) placeholders; ``coordinates`` is ``None`` when the feature had no
+    coordinate list, in which case the skeleton is served unchanged.
+    """
+
+    skeleton: Mapping[str, Any]
+    coordinates: tuple[Any, ...] | None
+    timestamps: tuple[Any, ...] | None
+    individual: str
+
+    @classmethod
+    def from_feature(
+        cls, feature: Mapping[str, Any], position: int, indices: Sequence[int] | None = None
+    ) -> Track:
+        """Freeze ``feature``, keeping only the points at ``indices`` (all when ``None``)."""
+
+        individual = individual_id(feature, position)
+        geometry = feature.get("geometry")
+        coords = geometry.get("coordinates") if isinstance(geometry, Mapping) else None
+        if not isinstance(coords, (list, tuple)):
+            return cls(freeze(feature), None, None, individual)
+        skeleton = dict(feature)
+        skeleton["geometry"] = {**geometry, "coordinates": ()}
+        rows = coords if indices is None else [coords[idx] for idx in indices]
+        properties = feature.get("properties")
+        stamps = properties.get("timestamps") if isinstance(properties, Mapping) else None
+        timestamps = None
+        if isinstance(stamps, (list, tuple)) and stamps:
+            timestamps = tuple(stamps) if indices is None else tuple(stamps[idx] for idx in indices)
+            skeleton["properties"] = {**properties, "timestamps": ()}
+        coordinates = tuple(tuple(row) if isinstance(row, list) else row for row in rows)
+        return cls(freeze(skeleton), coordinates, timestamps, individual)
+
+    @property
+    def has_path(self) -> bool:
+        return bool(self.coordinates) and isinstance(self.coordinates[0], tuple)
+
+    @cached_property
+    def path(self) -> tuple[tuple[float, ...], ...]:
+        coords = self.coordinates or ()
+        if all(len(row) == 2 for row in coords):
+            return coords
+        return tuple(row[:2] for row in coords)
+
+    @cached_property
+    def altitudes(self) -> tuple[float, ...]:
+        return tuple(row[2] if len(row) >= 3 else 0.0 for row in self.coordinates or ())
+
+    def feature(self) -> dict[str, Any]:
+        """GeoJSON view of the feature."""
+
+        feature = thaw(self.skeleton)
+        if self.coordinates is not None:
+            feature["geometry"]["coordinates"] = self.coordinates
+        if self.timestamps is not None:
+            feature["properties"]["timestamps"] = self.timestamps
+        return feature
+
+    def deckgl(self) -> dict[str, Any]:
+        """deck.gl path entry; vertex order stands in for missing timestamps."""
+
+        properties = self.skeleton.get("properties") or {}
+        timestamps = self.timestamps
+        if timestamps is None:
+            timestamps = tuple(range(len(self.coordinates or ())))
+        return {
+            "path": self.path,
+            "timestamps": timestamps,
+            "altitudes": self.altitudes,
+            "label": properties.get("label") or properties.get("bird"),
+            "individual": self.individual,
+        }
+
+
+@dataclass(frozen=True)
+class RouteData:
+    """A FeatureCollection as frozen top-level members plus one :class:`Track` per feature."""
+
+    skeleton: Mapping[str, Any]
+    tracks: tuple[Track, ...]
+
+    @classmethod
+    def from_geojson(cls, payload: Mapping[str, Any], tracks: Iterable[Track]) -> RouteData:
+        """Combine ``payload``'s members (other than its features) with ``tracks``."""
+
+        skeleton = dict(payload)
+        if isinstance(skeleton.get("features"), list):
+            skeleton["features"] = ()
+        return cls(freeze(skeleton), tuple(tracks))
+
+    def geojson(self) -> dict[str, Any]:
+        """GeoJSON view; containers are new, coordinate and timestamp tuples are shared."""
+
+        payload = thaw(self.skeleton)
+        if isinstance(payload.get("features"), tuple):
+            payload["features"] = [track.feature() for track in self.tracks]
+        return payload
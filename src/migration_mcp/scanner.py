@@ -0,0 +1,218 @@
+"""Incremental GeoJSON header scanning for route discovery."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+# Everything up to the next bracket or brace, with strings skipped whole.
+_FILLER = re.compile(rb'(?:[^"\[\]{}]+|"(?:[^"\\]|\\.)*")*', re.DOTALL)
+# Start of a LineString-style array of numeric positions, and the "]]" that ends it.
+_POSITIONS_OPEN = re.compile(rb"\[\s*\[\s*[-0-9]")
+_POSITIONS_CLOSE = re.compile(rb"\]\s*\]")
+
+
+class HeaderError(ValueError):
+    """Raised when a file does not look like a GeoJSON object."""
+
+
+@dataclass(frozen=True)
+class RouteHeader:
+    metadata: Any
+    properties: dict[str, Any]
+    point_count: int | None
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return a skeleton payload carrying only the header fields."""
+
+        payload: dict[str, Any] = {"features": [{"properties": self.properties}]}
+        if self.metadata is not None:
+            payload["metadata"] = self.metadata
+        return payload
+
+
+def read_route_header(path: Path) -> RouteHeader:
+    """Read ``metadata`` and the first feature's ``properties`` without parsing coordinates.
+
+    The file is memory-mapped and walked token by token; coordinate arrays are skipped
+    (and counted) in bulk without building Python objects, and the walk stops as soon
+    as both the top-level ``metadata`` and the first feature have been seen.
+    """
+
+    with path.open("rb") as handle:
+        try:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:  # empty file
+            raise HeaderError(f"{path} is empty") from exc
+        with buffer:
+            return _read_header(_Scanner(buffer))
+
+
+def _read_header(scanner: _Scanner) -> RouteHeader:
+    if scanner.peek() != b"{":
+        raise HeaderError("route file must contain a JSON object")
+    metadata: Any = None
+    has_metadata = False
+    properties: dict[str, Any] = {}
+    point_count: int | None = None
+    has_feature = False
+
+    for key in scanner.members():
+        if key == "metadata":
+            metadata = scanner.value()
+            has_metadata = True
+        elif key == "features" and not has_feature and scanner.peek() == b"[":
+            for index in scanner.elements():
+                if index > 0 and has_metadata:
+                    return RouteHeader(metadata, properties, point_count)
+                if index == 0 and scanner.peek() == b"{":
+                    properties, point_count = _read_feature(scanner)
+                else:
+                    scanner.skip()
+            has_feature = True
+        else:
+            scanner.skip()
+        if has_metadata and has_feature:
+            break
+    return RouteHeader(metadata, properties, point_count)
+
+
+def _read_feature(scanner: _Scanner) -> tuple[dict[str, Any], int | None]:
+    properties: dict[str, Any] = {}
+    point_count: int | None = None
+    for key in scanner.members():
+        if key == "properties":
+            value = scanner.value()
+            properties = value if isinstance(value, dict) else {}
+        elif key == "geometry" and scanner.peek() == b"{":
+            for geometry_key in scanner.members():
+                if geometry_key == "coordinates" and scanner.peek() == b"[":
+                    point_count = scanner.skip_positions()
+                    if point_count is None:
+                        point_count = 0
+                        for _ in scanner.elements():
+                            scanner.skip()
+                            point_count += 1
+                else:
+                    scanner.skip()
+        else:
+            scanner.skip()
+    return properties, point_count
+
+
+class _Scanner:
+    """Minimal pull tokenizer over a bytes-like JSON buffer."""
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        self.buffer = buffer
+        self.pos = 0
+
+    def peek(self) -> bytes:
+        self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+        return self.buffer[self.pos : self.pos + 1]
+
+    def expect(self, token: bytes) -> None:
+        if self.peek() != token:
+            raise HeaderError(f"expected {token!r} at byte {self.pos}")
+        self.pos += 1
+
+    def string(self) -> str:
+        self.peek()
+        match = _STRING.match(self.buffer, self.pos)
+        if match is None:
+            raise HeaderError(f"expected string at byte {self.pos}")
+        self.pos = match.end()
+        return json.loads(match.group())
+
+    def value(self) -> Any:
+        start = self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+        self.skip()
+        try:
+            return json.loads(self.buffer[start : self.pos])
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise HeaderError(f"invalid JSON value at byte {start}") from exc
+
+    def skip(self) -> None:
+        token = self.peek()
+        if token == b'"':
+            self.string()
+            return
+        if token not in (b"{", b"["):
+            match = _SCALAR.match(self.buffer, self.pos)
+            if match is None:
+                raise HeaderError(f"unexpected token at byte {self.pos}")
+            self.pos = match.end()
+            return
+        depth = 0
+        pos = self.pos
+        while True:
+            pos = _FILLER.match(self.buffer, pos).end()
+            token = self.buffer[pos : pos + 1]
+            if token not in (b"{", b"[", b"}", b"]"):
+                raise HeaderError("unterminated container" if not token else "unterminated string")
+            depth += 1 if token in (b"{", b"[") else -1
+            pos += 1
+            if depth == 0:
+                break
+        self.pos = pos
+
+    def skip_positions(self) -> int | None:
+        """Skip a ``[[x, y, ...], ...]`` array in bulk and return its length.
+
+        Returns ``None`` without moving when the array at the cursor has another shape.
+        """
+
+        if _POSITIONS_OPEN.match(self.buffer, self.pos) is None:
+            return None
+        close = _POSITIONS_CLOSE.search(self.buffer, self.pos)
+        if close is None:
+            return None
+        span = self.buffer[self.pos : close.end()]
+        opened = span.count(b"[")
+        # Deeper nesting or non-numeric members would unbalance or break the span.
+        if opened != span.count(b"]") or any(token in span for token in (b'"', b"{", b"}")):
+            return None
+        self.pos = close.end()
+        return opened - 1
+
+    def members(self) -> Iterator[str]:
+        """Yield object keys; the caller must consume each value before resuming."""
+
+        self.expect(b"{")
+        if self.peek() == b"}":
+            self.pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(b":")
+            yield key
+            if self.peek() == b",":
+                self.pos += 1
+                continue
+            self.expect(b"}")
+            return
+
+    def elements(self) -> Iterator[int]:
+        """Yield array positions; the caller must consume each element before resuming."""
+
+        self.expect(b"[")
+        if self.peek() == b"]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == b",":
+                self.pos += 1
+                continue
+            self.expect(b"]")
+            return
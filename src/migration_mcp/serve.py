@@ -0,0 +1,71 @@
+"""HTTP serving with several worker processes sharing one catalog."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .shared import SHARED_STATE_ENV, CatalogGeneration
+from .warmup import WARMUP_ENV, WarmupScheduler
+from .watch import WATCH_ENV, CatalogWatcher
+
+APP_FACTORY = "migration_mcp.fastapi_app:create_app"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+
+def serve(
+    data_root: Path,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 1,
+    precompile: bool = True,
+    watch: bool = False,
+    warmup: WarmupScheduler | None = None,
+) -> None:
+    """Run the FastAPI app under uvicorn with ``workers`` processes.
+
+    This process is the single catalog builder: it writes the catalog index,
+    columnar sidecars and spatial extents before the workers start, and owns the
+    watcher and warmup so they run once rather than once per worker. Workers share
+    a generation counter (see :mod:`.shared`) so a refresh in any process reaches
+    all of them.
+    """
+
+    try:
+        import uvicorn
+    except ImportError as exc:  # pragma: no cover - uvicorn ships with mcp
+        raise RuntimeError("serve needs uvicorn; install the 'serve' extra") from exc
+
+    if precompile:
+        from .core import prepare_shared_catalog
+
+        prepare_shared_catalog(data_root)
+    state_dir = Path(tempfile.mkdtemp(prefix="migration-mcp-"))
+    generation = CatalogGeneration(state_dir / "catalog.generation")
+    previous = {name: os.environ.get(name) for name in (SHARED_STATE_ENV, WATCH_ENV, WARMUP_ENV)}
+    # Workers inherit the environment: point them at the shared counter and leave
+    # watching and warmup to this process.
+    os.environ.update({SHARED_STATE_ENV: str(generation.path), WATCH_ENV: "0", WARMUP_ENV: "0"})
+    watcher = CatalogWatcher(data_root) if watch else None
+    try:
+        if watcher is not None:
+            watcher.start()
+        if warmup is not None:
+            warmup.start()
+        uvicorn.run(APP_FACTORY, factory=True, host=host, port=port, workers=workers)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        if warmup is not None:
+            warmup.stop()
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        generation.close()
+        shutil.rmtree(state_dir, ignore_errors=True)
@@ -0,0 +1,122 @@
+"""Cross-process catalog coordination for multi-worker serving.
+
+``migration-mcp serve --workers N`` points every worker at one small memory-mapped
+file holding a catalog *generation* counter. Any process that changes the catalog
+(an admin refresh, a fetched route, the watcher) bumps it, and every other worker
+drops its in-memory catalogs the next time it handles a request. Rebuilding is
+cheap: the persisted catalog index and the memory-mapped columnar sidecars are
+already shared through the filesystem and the OS page cache.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+SHARED_STATE_ENV = "MIGRATION_SHARED_STATE"
+
+_COUNTER = struct.Struct("<Q")
+_LOCK = threading.Lock()
+_GENERATIONS: dict[str, CatalogGeneration] = {}
+
+
+class CatalogGeneration:
+    """A 64-bit counter in a memory-mapped file shared by every worker process.
+
+    Increments hold an exclusive ``flock`` on the file, so concurrent bumps from
+    different processes are never collapsed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(self._fd).st_size < _COUNTER.size:
+                os.ftruncate(self._fd, _COUNTER.size)
+            self._map = mmap.mmap(self._fd, _COUNTER.size)
+        except (OSError, ValueError):
+            os.close(self._fd)
+            raise
+        self._lock = threading.Lock()
+        self._seen = self.value
+
+    @property
+    def value(self) -> int:
+        return _COUNTER.unpack_from(self._map)[0]
+
+    def bump(self) -> int:
+        """Announce a catalog change; this process's own change is not reported back."""
+
+        with self._lock, self._exclusive():
+            current = self.value
+            value = current + 1
+            _COUNTER.pack_into(self._map, 0, value)
+            # Only skip our own bump; one by another process since the last
+            # ``changed()`` must still be reported.
+            if current == self._seen:
+                self._seen = value
+        return value
+
+    def changed(self) -> bool:
+        """Whether another process bumped the counter since the last call."""
+
+        value = self.value
+        if value == self._seen:
+            return False
+        with self._lock:
+            if value == self._seen:
+                return False
+            self._seen = value
+        return True
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - Windows
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def shared_generation() -> CatalogGeneration | None:
+    """The generation named by ``MIGRATION_SHARED_STATE``, or ``None`` when unset."""
+
+    location = os.getenv(SHARED_STATE_ENV)
+    if not location:
+        return None
+    with _LOCK:
+        generation = _GENERATIONS.get(location)
+        if generation is None:
+            try:
+                generation = _GENERATIONS[location] = CatalogGeneration(Path(location))
+            except (OSError, ValueError):
+                return None
+        return generation
+
+
+def publish_change() -> None:
+    generation = shared_generation()
+    if generation is not None:
+        generation.bump()
+
+
+def consume_change() -> bool:
+    generation = shared_generation()
+    return generation is not None and generation.changed()
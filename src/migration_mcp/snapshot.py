@@ -0,0 +1,103 @@
+"""Serialized catalog snapshot for fast cold starts.
+
+MCP hosts spawn a stdio server per session, so every session's first catalog call
+would otherwise walk the whole data root: listing each route and tile directory and
+checking every route file against the catalog index. With
+``MIGRATION_CATALOG_SNAPSHOT=1`` (or ``migration-mcp --snapshot``) discovered route
+and tile catalogs are written to ``<data root>/migration/.catalog-snapshot.json``
+along with the mtime of every directory they were found in. A later process reuses
+a section after one ``stat`` per directory.
+
+Adding, removing or renaming a file changes its directory's mtime and invalidates
+the section; this includes the atomic replace used by downloads. Rewriting a file
+in place does not, so such edits are only seen after ``/admin/refresh`` or an
+invalidation that changes a catalog (the watcher, a fetch); both discard the
+snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from .env import env_flag
+
+SNAPSHOT_ENV = "MIGRATION_CATALOG_SNAPSHOT"
+SNAPSHOT_NAME = ".catalog-snapshot.json"
+SNAPSHOT_VERSION = 1
+
+_LOCK = threading.Lock()
+
+
+def snapshot_enabled() -> bool:
+    return env_flag(SNAPSHOT_ENV, False)
+
+
+def snapshot_path(data_root: Path) -> Path:
+    # Kept above the scanned directories so writing it never invalidates itself.
+    return data_root / "migration" / SNAPSHOT_NAME
+
+
+def load_section(data_root: Path, section: str, scan_root: Path) -> list[Any] | None:
+    """Rows stored for ``section``, or ``None`` when missing or any directory changed."""
+
+    entry = _read(snapshot_path(data_root)).get(section)
+    if not isinstance(entry, dict):
+        return None
+    directories, rows = entry.get("dirs"), entry.get("rows")
+    if not isinstance(directories, dict) or not isinstance(rows, list):
+        return None
+    for relative, mtime_ns in directories.items():
+        try:
+            if os.stat(scan_root / relative).st_mtime_ns != mtime_ns:
+                return None
+        except OSError:
+            return None
+    return rows
+
+
+def save_section(data_root: Path, section: str, scan_root: Path, rows: list[Any]) -> None:
+    """Store ``rows`` for ``section`` with the current mtimes of ``scan_root``'s directories."""
+
+    directories = directory_mtimes(scan_root)
+    with _LOCK:
+        target = snapshot_path(data_root)
+        snapshot = _read(target)
+        snapshot[section] = {"dirs": directories, "rows": rows}
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(snapshot, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, target)
+        except OSError:
+            # Read-only data roots simply keep scanning on every cold start.
+            with suppress(OSError):
+                tmp.unlink()
+
+
+def discard_snapshot(data_root: Path) -> None:
+    with _LOCK, suppress(OSError):
+        snapshot_path(data_root).unlink()
+
+
+def directory_mtimes(root: Path) -> dict[str, int]:
+    """``mtime_ns`` of ``root`` and every directory below it, keyed by relative path."""
+
+    mtimes: dict[str, int] = {}
+    for current, _, _ in os.walk(root):
+        with suppress(OSError):
+            mtimes[Path(os.path.relpath(current, root)).as_posix()] = os.stat(current).st_mtime_ns
+    return mtimes
+
+
+def _read(path: Path) -> dict[str, Any]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {"version": SNAPSHOT_VERSION}
+    if not isinstance(raw, dict) or raw.get("version") != SNAPSHOT_VERSION:
+        return {"version": SNAPSHOT_VERSION}
+    return raw
@@ -0,0 +1,370 @@
+"""Bounding-box and time-range index over route datasets.
+
+Each route is split into fixed-size runs of points ("segments") whose bounding boxes
+and time ranges are stored in a uniform lon/lat grid, so region queries only touch
+the segments in the cells they overlap. Extents are computed from the columnar
+sidecar (compiling it if needed) and persisted in the catalog index, so they are
+only recomputed for files that changed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import vector
+from .catalog import store_extents, stored_extents
+from .columnar import compile_route, open_compiled
+from .dataset_index import dataset_key
+from .datasets import ROUTES_SUBDIR, RouteDataset, discover_route_datasets
+from .resampling import timestamp_seconds
+
+SEGMENT_POINTS = 64
+GRID_DEGREES = 2.0
+
+BBox = tuple[float, float, float, float]
+Segment = tuple[int, int, float, float, float, float, float | None, float | None]
+"""``(start, stop, west, south, east, north, t_min, t_max)``; ``stop`` is exclusive."""
+
+_INDEX_LIMIT = 16
+_INDEX_LOCK = threading.Lock()
+_INDEXES: dict[str, SpatialIndex] = {}
+
+
+@dataclass(frozen=True)
+class RouteExtent:
+    bbox: BBox
+    time_range: tuple[float, float] | None
+    segments: tuple[Segment, ...]
+
+    def as_record(self) -> dict[str, Any]:
+        return {
+            "bbox": list(self.bbox),
+            "time_range": list(self.time_range) if self.time_range else None,
+            "segments": [list(segment) for segment in self.segments],
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> RouteExtent:
+        time_range = record.get("time_range")
+        return cls(
+            bbox=tuple(record["bbox"]),
+            time_range=tuple(time_range) if time_range else None,
+            segments=tuple(tuple(segment) for segment in record["segments"]),
+        )
+
+
+@dataclass(frozen=True)
+class RegionMatch:
+    dataset: RouteDataset
+    extent: RouteExtent
+    segments: tuple[int, ...]
+
+
+class SpatialIndex:
+    """Uniform-grid index of route segments for one catalog mapping."""
+
+    def __init__(
+        self,
+        mapping: dict[str, list[RouteDataset]],
+        extents: dict[Path, tuple[int, int, RouteExtent | None]],
+        cell_degrees: float = GRID_DEGREES,
+    ) -> None:
+        self.mapping = mapping
+        self.cell_degrees = cell_degrees
+        self._extents = extents
+        self._entries: list[tuple[RouteDataset, RouteExtent]] = []
+        self._grid: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        for datasets in mapping.values():
+            for dataset in datasets:
+                cached = extents.get(dataset.path)
+                if cached is None or cached[2] is None:
+                    continue
+                entry = len(self._entries)
+                self._entries.append((dataset, cached[2]))
+                for position, segment in enumerate(cached[2].segments):
+                    for cell in self._cells(segment[2:6]):
+                        self._grid.setdefault(cell, []).append((entry, position))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def query(
+        self,
+        bbox: Sequence[float],
+        *,
+        time_range: tuple[float | None, float | None] = (None, None),
+        species: Iterable[str] | None = None,
+    ) -> list[RegionMatch]:
+        """Routes with at least one segment overlapping ``bbox`` and ``time_range``.
+
+        ``bbox`` is ``(west, south, east, north)``; ``west > east`` crosses the
+        antimeridian. With a time bound, routes without timestamps never match.
+        """
+
+        wanted = {code.lower() for code in species} if species is not None else None
+        hits: dict[int, set[int]] = {}
+        for box in _split_antimeridian(bbox):
+            for cell in self._cells(box):
+                for entry, position in self._grid.get(cell, ()):
+                    dataset, extent = self._entries[entry]
+                    if wanted is not None and dataset.species_code not in wanted:
+                        continue
+                    segment = extent.segments[position]
+                    if _overlaps(segment[2:6], box) and _in_time(segment[6:8], time_range):
+                        hits.setdefault(entry, set()).add(position)
+        matches = [
+            RegionMatch(self._entries[entry][0], self._entries[entry][1], tuple(sorted(found)))
+            for entry, found in hits.items()
+        ]
+        return sorted(matches, key=lambda match: dataset_key(match.dataset))
+
+    def _cells(self, box: Sequence[float]) -> Iterable[tuple[int, int]]:
+        west, south, east, north = box
+        size = self.cell_degrees
+        for x in range(math.floor(west / size), math.floor(east / size) + 1):
+            for y in range(math.floor(south / size), math.floor(north / size) + 1):
+                yield x, y
+
+
+def spatial_index(root: str) -> SpatialIndex:
+    """Return the region index for ``root``, rebuilt only after the catalog changes."""
+
+    mapping = discover_route_datasets(root)
+    with _INDEX_LOCK:
+        index = _INDEXES.get(root)
+        if index is None or index.mapping is not mapping:
+            index = _build_index(Path(root) / ROUTES_SUBDIR, mapping, index)
+            _INDEXES[root] = index
+            while len(_INDEXES) > _INDEX_LIMIT:
+                _INDEXES.pop(next(iter(_INDEXES)))
+        return index
+
+
+def clip_match(
+    match: RegionMatch,
+    bbox: Sequence[float],
+    time_range: tuple[float | None, float | None] = (None, None),
+) -> list[list[list[float]]]:
+    """Return the runs of the route's points that fall inside ``bbox`` and ``time_range``."""
+
+    boxes = _split_antimeridian(bbox)
+    runs: list[list[list[float]]] = []
+    with _route_axes(match.dataset.path) as axes:
+        if axes.lon is None:
+            return runs
+        # Runs never continue across individuals.
+        firsts = {start for start, _ in axes.features}
+        previous = -2
+        for position in match.segments:
+            start, stop = match.extent.segments[position][:2]
+            for idx in range(start, stop):
+                lon, lat = axes.lon[idx], axes.lat[idx]
+                inside = any(_contains(box, lon, lat) for box in boxes)
+                if inside and time_range != (None, None):
+                    stamp = axes.t[idx] if axes.t is not None else None
+                    inside = stamp is not None and _in_time((stamp, stamp), time_range)
+                if not inside:
+                    continue
+                point = [lon, lat] if axes.alt is None else [lon, lat, axes.alt[idx]]
+                if runs and idx == previous + 1 and idx not in firsts:
+                    runs[-1].append(point)
+                else:
+                    runs.append([point])
+                previous = idx
+    return runs
+
+
+def compute_extent(
+    lon: Sequence[float],
+    lat: Sequence[float],
+    t: Sequence[float] | None = None,
+    segment_points: int = SEGMENT_POINTS,
+    features: Sequence[tuple[int, int]] | None = None,
+) -> RouteExtent | None:
+    """Per-segment and whole-route bounds; neighbouring segments share an endpoint.
+
+    ``features`` lists the ``(start, count)`` of each individual in the columns;
+    segments never span two individuals.
+    """
+
+    segments: list[Segment] = []
+    for first, count in features if features is not None else [(0, len(lon))]:
+        end = first + count
+        if count <= 0:
+            continue
+        lon_lo, lon_hi = _chunk_bounds(lon[first:end], segment_points)
+        lat_lo, lat_hi = _chunk_bounds(lat[first:end], segment_points)
+        t_lo, t_hi = _chunk_bounds(t[first:end], segment_points) if t is not None else (None, None)
+        for position, start in enumerate(range(first, end, segment_points)):
+            times = (t_lo[position], t_hi[position]) if t_lo is not None else (None, None)
+            segments.append(
+                (
+                    start,
+                    min(start + segment_points, end),
+                    lon_lo[position],
+                    lat_lo[position],
+                    lon_hi[position],
+                    lat_hi[position],
+                    *times,
+                )
+            )
+    if not segments:
+        return None
+    bbox = (
+        min(segment[2] for segment in segments),
+        min(segment[3] for segment in segments),
+        max(segment[4] for segment in segments),
+        max(segment[5] for segment in segments),
+    )
+    time_range = (
+        (min(segment[6] for segment in segments), max(segment[7] for segment in segments))
+        if t is not None
+        else None
+    )
+    return RouteExtent(bbox, time_range, tuple(segments))
+
+
+def route_extent(path: Path) -> RouteExtent | None:
+    with _route_axes(path) as axes:
+        if axes.lon is None:
+            return None
+        return compute_extent(axes.lon, axes.lat, axes.t, features=axes.features)
+
+
+def _build_index(
+    routes_root: Path,
+    mapping: dict[str, list[RouteDataset]],
+    previous: SpatialIndex | None,
+) -> SpatialIndex:
+    memo = previous._extents if previous is not None else {}
+    stored = stored_extents(routes_root)
+    extents: dict[Path, tuple[int, int, RouteExtent | None]] = {}
+    computed: dict[Path, tuple[os.stat_result, dict[str, Any] | None]] = {}
+    for datasets in mapping.values():
+        for dataset in datasets:
+            try:
+                stat = dataset.path.stat()
+                key = dataset.path.relative_to(routes_root).as_posix()
+            except (OSError, ValueError):
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = memo.get(dataset.path)
+            record = stored.get(key)
+            if cached is not None and cached[:2] == signature:
+                extent = cached[2]
+            elif record is not None and record[:2] == signature:
+                extent = RouteExtent.from_record(record[2]) if record[2] else None
+            else:
+                extent = route_extent(dataset.path)
+                computed[dataset.path] = (stat, extent.as_record() if extent else None)
+            extents[dataset.path] = (*signature, extent)
+    store_extents(routes_root, computed)
+    return SpatialIndex(mapping, extents)
+
+
+@dataclass
+class _Axes:
+    lon: Sequence[float] | None = None
+    lat: Sequence[float] | None = None
+    alt: Sequence[float] | None = None
+    t: Sequence[float] | None = None
+    features: list[tuple[int, int]] = field(default_factory=list)
+
+
+@contextmanager
+def _route_axes(path: Path) -> Iterator[_Axes]:
+    """lon/lat/alt/t of every feature back to back, memory-mapped from the sidecar if possible."""
+
+    route = open_compiled(path)
+    if route is None and compile_route(path) is not None:
+        route = open_compiled(path)
+    if route is not None:
+        axes = _Axes(
+            route.column("lon"),
+            route.column("lat"),
+            route.column("alt"),
+            route.column("t"),
+            [(feature.start, feature.count) for feature in route.features],
+        )
+        try:
+            yield axes
+        finally:
+            # Drop the column views first so the mapping can actually be closed.
+            axes.lon = axes.lat = axes.alt = axes.t = None
+            route.close()
+        return
+    yield _geojson_axes(path)
+
+
+def _geojson_axes(path: Path) -> _Axes:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        tracks = [
+            (
+                feature["geometry"]["coordinates"],
+                (feature.get("properties") or {}).get("timestamps"),
+            )
+            for feature in payload["features"]
+        ]
+        coords = [coord for track, _ in tracks for coord in track]
+        axes = _Axes([float(coord[0]) for coord in coords], [float(coord[1]) for coord in coords])
+        if coords and all(len(coord) >= 3 for coord in coords):
+            axes.alt = [float(coord[2]) for coord in coords]
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        return _Axes()
+    start = 0
+    for track, _ in tracks:
+        axes.features.append((start, len(track)))
+        start += len(track)
+    # Times are only usable when every individual has a full timestamp column.
+    if all(isinstance(stamps, list) and len(stamps) == len(track) for track, stamps in tracks):
+        axes.t = timestamp_seconds([stamp for _, stamps in tracks for stamp in stamps])
+    return axes
+
+
+def _chunk_bounds(values: Sequence[float], size: int) -> tuple[list[float], list[float]]:
+    if vector.numpy_enabled():
+        lows, highs = vector.segment_bounds(values, size)
+    else:
+        lows, highs = [], []
+        for start in range(0, len(values), size):
+            chunk = values[start : start + size]
+            lows.append(min(chunk))
+            highs.append(max(chunk))
+    # Extend each chunk to the next chunk's first point so the connecting edge is covered.
+    for position, start in enumerate(range(size, len(values), size)):
+        lows[position] = min(lows[position], values[start])
+        highs[position] = max(highs[position], values[start])
+    return lows, highs
+
+
+def _split_antimeridian(bbox: Sequence[float]) -> list[BBox]:
+    west, south, east, north = bbox
+    if west <= east:
+        return [(west, south, east, north)]
+    return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+
+def _overlaps(a: Sequence[float], b: Sequence[float]) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(box: BBox, lon: float, lat: float) -> bool:
+    return box[0] <= lon <= box[2] and box[1] <= lat <= box[3]
+
+
+def _in_time(span: Sequence[float | None], window: tuple[float | None, float | None]) -> bool:
+    start, end = window
+    if start is None and end is None:
+        return True
+    if span[0] is None or span[1] is None:
+        return False
+    return (end is None or span[0] <= end) and (start is None or span[1] >= start)
@@ -0,0 +1,142 @@
+"""Incremental GeoJSON and NDJSON encoders for route responses."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Callable, Generator, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+StreamFormat = Literal["ndjson", "geojson"]
+
+DEFAULT_BATCH_POINTS = 1000
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "geojson": "application/geo+json",
+}
+
+
+@dataclass
+class FeatureStream:
+    """Point readers for one feature of a :class:`RouteStream`."""
+
+    count: int
+    coordinates: Callable[[int, int], list[Any]]
+    timestamps: Callable[[int, int], list[Any]] | None = None
+
+
+@dataclass
+class RouteStream:
+    """A route whose points are read in ``[start, stop)`` batches on demand.
+
+    ``payload`` is the FeatureCollection skeleton: each feature's coordinates are
+    empty and its ``timestamps`` property is removed; both are filled in by the
+    encoders batch by batch from the matching entry of ``features``.
+    """
+
+    payload: dict[str, Any]
+    metadata: dict[str, Any]
+    features: list[FeatureStream]
+    close: Callable[[], None] = field(default=lambda: None)
+
+    @property
+    def count(self) -> int:
+        return sum(feature.count for feature in self.features)
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], metadata: dict[str, Any]) -> RouteStream:
+        """Wrap an in-memory GeoJSON payload."""
+
+        skeletons: list[dict[str, Any]] = []
+        streams: list[FeatureStream] = []
+        for feature in payload["features"]:
+            coords: Sequence[Any] = feature["geometry"]["coordinates"]
+            properties = dict(feature.get("properties") or {})
+            timestamps = properties.pop("timestamps", None)
+            skeletons.append(
+                {
+                    **feature,
+                    "geometry": {**feature["geometry"], "coordinates": []},
+                    "properties": properties,
+                }
+            )
+            streams.append(_sequence_stream(coords, timestamps))
+        return cls(payload={**payload, "features": skeletons}, metadata=metadata, features=streams)
+
+
+def _sequence_stream(coords: Sequence[Any], timestamps: Any) -> FeatureStream:
+    has_timestamps = isinstance(timestamps, (list, tuple)) and len(timestamps) == len(coords)
+    return FeatureStream(
+        count=len(coords),
+        coordinates=lambda start, stop: list(coords[start:stop]),
+        timestamps=(lambda start, stop: timestamps[start:stop]) if has_timestamps else None,
+    )
+
+
+def encode(
+    stream: RouteStream, fmt: StreamFormat, batch_points: int = DEFAULT_BATCH_POINTS
+) -> Generator[bytes, None, None]:
+    """Yield the encoded route; the stream is closed when the iterator finishes or is closed."""
+
+    encoder = _ndjson if fmt == "ndjson" else _geojson
+    try:
+        yield from encoder(stream, max(1, batch_points))
+    finally:
+        stream.close()
+
+
+def _ndjson(stream: RouteStream, batch_points: int) -> Iterator[bytes]:
+    yield _line({"type": "header", "metadata": stream.metadata, "geojson": stream.payload})
+    for index, feature in enumerate(stream.features):
+        for start in range(0, feature.count, batch_points):
+            stop = min(start + batch_points, feature.count)
+            record: dict[str, Any] = {
+                "type": "batch",
+                "feature": index,
+                "offset": start,
+                "coordinates": feature.coordinates(start, stop),
+            }
+            if feature.timestamps is not None:
+                record["timestamps"] = feature.timestamps(start, stop)
+            yield _line(record)
+    yield _line({"type": "end", "count": stream.count})
+
+
+def _geojson(stream: RouteStream, batch_points: int) -> Iterator[bytes]:
+    # Render the skeleton once with unique placeholders, then splice the arrays in.
+    token = uuid.uuid4().hex
+    payload = json.loads(json.dumps(stream.payload, default=str))
+    payload["metadata"] = {**(payload.get("metadata") or {}), "route": stream.metadata}
+    readers: dict[str, tuple[Callable[[int, int], list[Any]], int]] = {}
+    for index, (feature, source) in enumerate(zip(payload["features"], stream.features)):
+        marker = f"coordinates-{index}-{token}"
+        feature["geometry"]["coordinates"] = marker
+        readers[json.dumps(marker)] = (source.coordinates, source.count)
+        if source.timestamps is not None:
+            marker = f"timestamps-{index}-{token}"
+            feature["properties"]["timestamps"] = marker
+            readers[json.dumps(marker)] = (source.timestamps, source.count)
+    template = json.dumps(payload, separators=(",", ":"), default=str)
+
+    cursor = 0
+    for marker in sorted(readers, key=template.index):
+        position = template.index(marker)
+        reader, count = readers[marker]
+        yield template[cursor:position].encode("utf-8") + b"["
+        yield from _array_body(reader, count, batch_points)
+        yield b"]"
+        cursor = position + len(marker)
+    yield template[cursor:].encode("utf-8")
+
+
+def _array_body(
+    reader: Callable[[int, int], list[Any]], count: int, batch_points: int
+) -> Iterator[bytes]:
+    for start in range(0, count, batch_points):
+        body = json.dumps(reader(start, min(start + batch_points, count)), separators=(",", ":"))
+        yield (b"," if start else b"") + body[1:-1].encode("utf-8")
+
+
+def _line(record: dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
@@ -0,0 +1,218 @@
+"""Indexed BirdCast tile catalog with date, product, level and x/y range queries."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from . import pagination
+
+if TYPE_CHECKING:
+    from .datasets import BirdCastTile
+
+TileKey = tuple[str, str, str, int, int, str]
+
+
+@dataclass(frozen=True)
+class _LevelBucket:
+    """Tiles of one date/product/level, sorted by (x, y) with a parallel x column."""
+
+    tiles: list[BirdCastTile]
+    keys: list[TileKey]
+    xs: list[int]
+
+
+def tile_key(tile: BirdCastTile) -> TileKey:
+    """Total order used for pagination: date, product, level, x, y, full path.
+
+    The path keeps keys unique for whole-extent files and for tiles at the same
+    x/y with different extensions, so a cursor never skips a tile.
+    """
+
+    return (
+        tile.date,
+        tile.product,
+        tile.level or "",
+        -1 if tile.x is None else tile.x,
+        -1 if tile.y is None else tile.y,
+        str(tile.path),
+    )
+
+
+class TileIndex:
+    """Immutable date → product → level → (x, y) index over a tile list.
+
+    Dates are kept sorted so date ranges resolve with a bisect, and each level bucket
+    keeps its x column so x ranges (including those derived from a lon/lat bounding
+    box) are also bisected instead of scanned. Results are yielded in ``tile_key``
+    order, which makes the last returned key a stable pagination cursor.
+    """
+
+    def __init__(self, tiles: Sequence[BirdCastTile]) -> None:
+        self.tiles = tiles
+        grouped: dict[str, dict[str, dict[str, list[BirdCastTile]]]] = {}
+        for tile in tiles:
+            levels = grouped.setdefault(tile.date, {}).setdefault(tile.product, {})
+            levels.setdefault(tile.level or "", []).append(tile)
+        self._dates = sorted(grouped)
+        self._by_date: dict[str, dict[str, dict[str, _LevelBucket]]] = {}
+        for date, products in grouped.items():
+            self._by_date[date] = {}
+            for product, levels in products.items():
+                buckets: dict[str, _LevelBucket] = {}
+                for level, members in levels.items():
+                    members.sort(key=tile_key)
+                    keys = [tile_key(tile) for tile in members]
+                    buckets[level] = _LevelBucket(members, keys, [key[3] for key in keys])
+                self._by_date[date][product] = buckets
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    @property
+    def dates(self) -> list[str]:
+        return list(self._dates)
+
+    def query(
+        self,
+        *,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        product: str | None = None,
+        level: str | None = None,
+        x_range: tuple[int | None, int | None] = (None, None),
+        y_range: tuple[int | None, int | None] = (None, None),
+        bbox: Sequence[float] | None = None,
+        after: TileKey | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[BirdCastTile], TileKey | None]:
+        """Return up to ``limit`` matching tiles after ``after`` and the next cursor key.
+
+        ``bbox`` is ``(west, south, east, north)`` in degrees and is converted to a
+        slippy-map x/y range per numeric level. Tiles without x/y (whole-extent
+        products) always match a bbox; tiles on non-numeric levels never do.
+        """
+
+        results: list[BirdCastTile] = []
+        matches = self._iter_matches(
+            date_from, date_to, product, level, x_range, y_range, bbox, after
+        )
+        for tile in matches:
+            if limit is not None and len(results) >= limit:
+                return results, tile_key(results[-1])
+            results.append(tile)
+        return results, None
+
+    def _iter_matches(
+        self,
+        date_from: str | None,
+        date_to: str | None,
+        product: str | None,
+        level: str | None,
+        x_range: tuple[int | None, int | None],
+        y_range: tuple[int | None, int | None],
+        bbox: Sequence[float] | None,
+        after: TileKey | None,
+    ) -> Iterator[BirdCastTile]:
+        lower = date_from
+        if after is not None and (lower is None or after[0] > lower):
+            lower = after[0]
+        start = bisect.bisect_left(self._dates, lower) if lower is not None else 0
+        stop = (
+            bisect.bisect_right(self._dates, date_to) if date_to is not None else len(self._dates)
+        )
+        for date in self._dates[start:stop]:
+            products = self._by_date[date]
+            for name in sorted(products) if product is None else [product]:
+                levels = products.get(name, {})
+                for bucket_level in sorted(levels) if level is None else [level]:
+                    bucket = levels.get(bucket_level)
+                    if bucket is None:
+                        continue
+                    yield from _scan_bucket(bucket, bucket_level, x_range, y_range, bbox, after)
+
+
+def _scan_bucket(
+    bucket: _LevelBucket,
+    level: str,
+    x_range: tuple[int | None, int | None],
+    y_range: tuple[int | None, int | None],
+    bbox: Sequence[float] | None,
+    after: TileKey | None,
+) -> Iterator[BirdCastTile]:
+    x_lo, x_hi = x_range
+    y_lo, y_hi = y_range
+    if bbox is not None:
+        bounds = _bbox_tile_range(bbox, level)
+        if bounds is None:
+            # Only whole-extent tiles (no x/y) can be placed on a non-numeric level.
+            yield from (tile for tile in bucket.tiles if tile.x is None and _after(tile, after))
+            return
+        x_lo, x_hi = _intersect(x_lo, x_hi, bounds[0], bounds[1])
+        y_lo, y_hi = _intersect(y_lo, y_hi, bounds[2], bounds[3])
+        # Whole-extent tiles sort first (x == -1) and cover every bbox.
+        for tile in bucket.tiles:
+            if tile.x is not None:
+                break
+            if _after(tile, after):
+                yield tile
+
+    start = 0
+    if x_lo is not None:
+        start = bisect.bisect_left(bucket.xs, x_lo)
+    if after is not None:
+        start = max(start, bisect.bisect_right(bucket.keys, after))
+    stop = bisect.bisect_right(bucket.xs, x_hi) if x_hi is not None else len(bucket.tiles)
+    for tile in bucket.tiles[start:stop]:
+        if tile.x is None and (x_lo is not None or y_lo is not None or y_hi is not None):
+            continue
+        if y_lo is not None and (tile.y is None or tile.y < y_lo):
+            continue
+        if y_hi is not None and (tile.y is None or tile.y > y_hi):
+            continue
+        yield tile
+
+
+def _after(tile: BirdCastTile, after: TileKey | None) -> bool:
+    return after is None or tile_key(tile) > after
+
+
+def _intersect(lo: int | None, hi: int | None, bound_lo: int, bound_hi: int) -> tuple[int, int]:
+    return (
+        bound_lo if lo is None else max(lo, bound_lo),
+        bound_hi if hi is None else min(hi, bound_hi),
+    )
+
+
+def _bbox_tile_range(bbox: Sequence[float], level: str) -> tuple[int, int, int, int] | None:
+    """Slippy-map (x_min, x_max, y_min, y_max) covering ``bbox`` at zoom ``level``."""
+
+    try:
+        zoom = int(level)
+    except ValueError:
+        return None
+    if not 0 <= zoom <= 30:
+        return None
+    west, south, east, north = bbox
+    x_min, y_min = lonlat_to_tile(west, north, zoom)
+    x_max, y_max = lonlat_to_tile(east, south, zoom)
+    return x_min, x_max, y_min, y_max
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> tuple[int, int]:
+    scale = 1 << zoom
+    lat = max(-85.0511, min(85.0511, lat))
+    x = int((lon + 180.0) / 360.0 * scale)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * scale)
+    return min(max(x, 0), scale - 1), min(max(y, 0), scale - 1)
+
+
+def decode_tile_cursor(cursor: str) -> TileKey:
+    date, product, level, x, y, path = pagination.decode_cursor(cursor, 6, "tile")
+    try:
+        return (str(date), str(product), str(level), int(x), int(y), str(path))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"invalid tile cursor: {cursor!r}") from exc
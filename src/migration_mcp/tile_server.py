@@ -0,0 +1,127 @@
+"""Serving BirdCast tile files with HTTP caching validators.
+
+Tiles are addressed as ``date/product/level/x/y`` under ``birdcast_tiles_dir``; ``y``
+may carry the file extension (``3.png``) or omit it, in which case the known tile
+extensions are tried in order. Responses carry a strong ``ETag`` derived from the
+file's mtime and size (identical in every worker), ``Last-Modified`` and
+``Cache-Control``, so a CDN or browser can revalidate with a bodiless 304.
+
+Small files (PNG and GeoJSON tiles up to :data:`TILE_CACHE_MAX_ITEM` bytes) are kept
+in a byte-bounded LRU and sent from memory; anything else, including every ranged
+request, is streamed from disk by the ASGI server's file response.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+from collections.abc import Mapping
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+from .cache import PayloadCache
+from .env import env_int
+
+TILE_CACHE_BYTES_ENV = "MIGRATION_TILE_CACHE_BYTES"
+DEFAULT_TILE_CACHE_BYTES = 32 * 1024 * 1024
+TILE_CACHE_MAX_ITEM = 512 * 1024
+TILE_MAX_AGE_ENV = "MIGRATION_TILE_MAX_AGE"
+DEFAULT_TILE_MAX_AGE = 3600
+
+TILE_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".geojson": "application/geo+json",
+    ".tif": "image/tiff",
+    ".tiff": "image/tiff",
+}
+# GeoTIFFs are typically large and read in ranges; never worth holding in memory.
+CACHEABLE_SUFFIXES = {".png", ".geojson"}
+
+
+@dataclass(frozen=True)
+class TileFile:
+    """A located tile with its stat and, for small cacheable tiles, its bytes."""
+
+    path: Path
+    stat: os.stat_result
+    media_type: str
+    body: bytes | None = None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.stat.st_mtime_ns:x}-{self.stat.st_size:x}"'
+
+    def headers(self, max_age: int) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.stat.st_mtime, usegmt=True),
+            "Cache-Control": f"public, max-age={max_age}",
+            "Accept-Ranges": "bytes",
+        }
+
+    def not_modified(self, headers: Mapping[str, str]) -> bool:
+        """Whether a conditional GET with ``headers`` can be answered with 304."""
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(self.stat.st_mtime) <= since
+
+
+def tile_cache_bytes() -> int:
+    return env_int(TILE_CACHE_BYTES_ENV, DEFAULT_TILE_CACHE_BYTES)
+
+
+def tile_max_age() -> int:
+    return env_int(TILE_MAX_AGE_ENV, DEFAULT_TILE_MAX_AGE, minimum=0)
+
+
+def open_tile(tiles_root: Path, parts: tuple[str, ...], cache: PayloadCache) -> TileFile | None:
+    """Locate the tile at ``parts`` (``date, product, level, x, y``) under ``tiles_root``.
+
+    Returns ``None`` for unsafe path components or a missing tile. Small cacheable
+    tiles are read (or fetched from ``cache``) into :attr:`TileFile.body`.
+    """
+
+    if not all(_is_safe_component(part) for part in parts):
+        return None
+    *directories, name = parts
+    folder = tiles_root.joinpath(*directories)
+    suffix = Path(name).suffix.lower()
+    candidates = [name] if suffix in TILE_MEDIA_TYPES else [name + ext for ext in TILE_MEDIA_TYPES]
+    for candidate in candidates:
+        path = folder / candidate
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(info.st_mode):
+            continue
+        tile = TileFile(path, info, TILE_MEDIA_TYPES[path.suffix.lower()])
+        if path.suffix.lower() not in CACHEABLE_SUFFIXES or info.st_size > TILE_CACHE_MAX_ITEM:
+            return tile
+        key = (str(path), info.st_mtime_ns, info.st_size)
+        body = cache.get(key)
+        if body is None:
+            try:
+                body = path.read_bytes()
+            except OSError:
+                return None
+            if len(body) != info.st_size:  # replaced since the stat; let the file response deal
+                return tile
+            cache.put(key, body, len(body))
+        return TileFile(path, info, tile.media_type, body)
+    return None
+
+
+def _is_safe_component(part: str) -> bool:
+    return bool(part) and not part.startswith(".") and not any(c in part for c in "/\\\0")
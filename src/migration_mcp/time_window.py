@@ -0,0 +1,119 @@
+"""Date-range and season windows over route timestamps.
+
+Windows resolve to half-open ``[start, stop)`` runs of point indices. Time-ordered
+tracks (flagged when the columnar sidecar is compiled) are cut with binary searches
+over the timestamp column, so only the pages around the window are touched; other
+tracks fall back to a linear scan.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Literal
+
+Season = Literal["spring", "summer", "autumn", "fall", "winter"]
+
+# Meteorological (northern hemisphere) seasons as (first month, months long).
+SEASON_MONTHS: dict[str, tuple[int, int]] = {
+    "spring": (3, 3),
+    "summer": (6, 3),
+    "autumn": (9, 3),
+    "fall": (9, 3),
+    "winter": (12, 3),
+}
+
+Run = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Points with ``start <= t <= end`` that also fall in ``season`` (any year)."""
+
+    start: float | None = None
+    end: float | None = None
+    season: Season | None = None
+
+    def intervals(self, first: float, last: float) -> list[tuple[float, float]]:
+        """Half-open second intervals covering the window between ``first`` and ``last``."""
+
+        lower = first if self.start is None else max(first, self.start)
+        upper = math.nextafter(last if self.end is None else min(last, self.end), math.inf)
+        if lower >= upper:
+            return []
+        if self.season is None:
+            return [(lower, upper)]
+        intervals: list[tuple[float, float]] = []
+        for lo, hi in _season_intervals(self.season, lower, upper):
+            lo, hi = max(lo, lower), min(hi, upper)
+            if lo < hi:
+                intervals.append((lo, hi))
+        return intervals
+
+    def runs(self, seconds: Sequence[float], ordered: bool) -> list[Run]:
+        """Index runs of ``seconds`` inside the window.
+
+        With ``ordered`` (non-decreasing timestamps) each interval costs two bisects;
+        otherwise every timestamp is tested.
+        """
+
+        if not len(seconds):
+            return []
+        if ordered:
+            runs: list[Run] = []
+            for lo, hi in self.intervals(seconds[0], seconds[-1]):
+                start = bisect.bisect_left(seconds, lo)
+                stop = bisect.bisect_left(seconds, hi, start)
+                if start < stop:
+                    runs.append((start, stop))
+            return runs
+        intervals = self.intervals(min(seconds), max(seconds))
+        runs = []
+        for idx, value in enumerate(seconds):
+            if not any(lo <= value < hi for lo, hi in intervals):
+                continue
+            if runs and runs[-1][1] == idx:
+                runs[-1] = (runs[-1][0], idx + 1)
+            else:
+                runs.append((idx, idx + 1))
+        return runs
+
+
+def is_ordered(seconds: Sequence[float]) -> bool:
+    return all(seconds[idx - 1] <= seconds[idx] for idx in range(1, len(seconds)))
+
+
+def run_positions(runs: Sequence[Run]) -> Sequence[int]:
+    """Flatten ``runs`` into point indices (a ``range`` for a single run)."""
+
+    if len(runs) == 1:
+        return range(*runs[0])
+    return [idx for start, stop in runs for idx in range(start, stop)]
+
+
+def _season_intervals(season: str, lower: float, upper: float) -> list[tuple[float, float]]:
+    month, length = SEASON_MONTHS[season]
+    first_year = max(_year(lower) - 1, 1)
+    last_year = min(_year(upper), 9998)
+    intervals: list[tuple[float, float]] = []
+    for year in range(first_year, last_year + 1):
+        end_month = month + length
+        intervals.append(
+            (
+                datetime(year, month, 1, tzinfo=timezone.utc).timestamp(),
+                datetime(
+                    year + (end_month - 1) // 12, (end_month - 1) % 12 + 1, 1, tzinfo=timezone.utc
+                ).timestamp(),
+            )
+        )
+    return intervals
+
+
+def _year(seconds: float) -> int:
+    # Clamp to the range datetime can represent.
+    return datetime.fromtimestamp(
+        min(max(seconds, -62135596800.0), 253402300799.0), timezone.utc
+    ).year
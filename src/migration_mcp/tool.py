@@ -4,8 +4,22 @@ from __future__ import annotations
 
 from mcp.server.fastmcp import FastMCP
 
-from .core import generate_routes, list_datasets, list_tiles
-from .models import RouteRequest, RouteResponse
+from .core import (
+    find_routes,
+    generate_routes,
+    generate_routes_batch,
+    list_datasets,
+    list_tiles,
+)
+from .models import (
+    DatasetQuery,
+    RegionQuery,
+    RouteBatchRequest,
+    RouteBatchResponse,
+    RouteRequest,
+    RouteResponse,
+    TileQuery,
+)
 
 
 def build_tool(app: FastMCP) -> None:
@@ -22,21 +36,51 @@ def build_tool(app: FastMCP) -> None:
     def generate(request: RouteRequest) -> RouteResponse:
         return generate_routes(request)
 
+    @app.tool(
+        name="migration.generate_routes_batch",
+        description=(
+            "Generate several migration routes in one call. Input a list of route requests; "
+            "returns per-item routes or errors in request order."
+        ),
+        meta={"version": "0.1.0", "categories": ["migration", "planning"]},
+    )
+    def generate_batch(batch: RouteBatchRequest) -> RouteBatchResponse:
+        return generate_routes_batch(batch)
+
+    @app.tool(
+        name="migration.find_routes_in_region",
+        description=(
+            "Find staged routes that pass through a lon/lat bounding box, optionally within "
+            "a time window. Set clip=true to also return the route points inside the box."
+        ),
+        meta={"version": "0.1.0", "categories": ["migration", "catalog"]},
+    )
+    def routes_in_region(query: RegionQuery) -> dict[str, object]:
+        return find_routes(query)
+
     @app.tool(
         name="migration.list_datasets",
-        description="List staged telemetry datasets detected under the configured data root.",
+        description=(
+            "List staged telemetry datasets detected under the configured data root. Filter "
+            "by species or source, pick fields (e.g. species_code, path, source) to keep "
+            "responses small, and page with limit and next_cursor."
+        ),
         meta={"version": "0.1.0", "categories": ["migration", "catalog"]},
     )
-    def datasets() -> dict[str, object]:
-        return list_datasets()
+    def datasets(query: DatasetQuery | None = None) -> dict[str, object]:
+        return list_datasets(query=query)
 
     @app.tool(
         name="migration.list_tiles",
-        description="List cached BirdCast tiles and metadata that can support visualization layers.",
+        description=(
+            "List cached BirdCast tiles that can support visualization layers. Filter by "
+            "date range, product, level, x/y range or lon/lat bbox; page with limit and "
+            "next_cursor."
+        ),
         meta={"version": "0.1.0", "categories": ["migration", "catalog"]},
     )
-    def tiles() -> dict[str, object]:
-        return list_tiles()
+    def tiles(query: TileQuery | None = None) -> dict[str, object]:
+        return list_tiles(query=query)
 
 
 __all__ = ["build_tool"]
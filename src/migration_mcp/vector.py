@@ -0,0 +1,103 @@
+"""Optional NumPy backend for resampling and layer construction.
+
+Install the ``fast`` extra to enable it. Every helper here has a pure-Python
+counterpart at its call site, which stays the fallback when NumPy is missing or
+``MIGRATION_NUMPY=0`` is set.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from .env import env_flag
+
+try:  # pragma: no cover - depends on the optional extra
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the optional extra
+    np = None
+
+NUMPY_ENV = "MIGRATION_NUMPY"
+
+
+def numpy_enabled() -> bool:
+    if np is None:
+        return False
+    return env_flag(NUMPY_ENV, True)
+
+
+def select_indices(length: int, target: int) -> list[int]:
+    """Evenly spaced, strictly increasing indices; mirrors ``core._select_indices``."""
+
+    step = (length - 1) / (target - 1)
+    positions = np.arange(target)
+    indices = np.rint(positions * step).astype(np.int64)
+    # Bump collisions forward exactly like the scalar loop: idx[i] >= idx[i - 1] + 1.
+    indices = np.maximum.accumulate(indices - positions) + positions
+    return np.minimum(indices, length - 1).tolist()
+
+
+def gather(column: memoryview, indices: Sequence[int], integral: bool) -> list[Any]:
+    values = np.frombuffer(column, dtype=np.float64).take(np.asarray(indices, dtype=np.intp))
+    return values.astype(np.int64).tolist() if integral else values.tolist()
+
+
+def farthest(xs: Any, ys: Any, start: int, end: int) -> tuple[int, float]:
+    """Farthest point from the ``start``–``end`` chord; mirrors ``resampling._farthest``.
+
+    ``xs``/``ys`` are float64 arrays (see :func:`as_floats`).
+    """
+
+    ax, ay, bx, by = xs[start], ys[start], xs[end], ys[end]
+    dx, dy = bx - ax, by - ay
+    norm = dx * dx + dy * dy
+    px, py = xs[start + 1 : end] - ax, ys[start + 1 : end] - ay
+    if norm == 0.0:
+        distance = px * px + py * py
+    else:
+        t = np.clip((px * dx + py * dy) / norm, 0.0, 1.0)
+        ex, ey = px - t * dx, py - t * dy
+        distance = ex * ex + ey * ey
+    # argmax keeps the first maximum, like the scalar loop's strict comparison.
+    position = int(np.argmax(distance))
+    return start + 1 + position, math.sqrt(float(distance[position]))
+
+
+def as_floats(values: Sequence[float]) -> Any:
+    return np.asarray(values, dtype=np.float64)
+
+
+def surrogate_path(
+    count: int,
+    timestep_s: float,
+    trim_yaw_rad: float,
+    cruise_velocity_m_s: float,
+    climb_rate_m_s: float,
+) -> tuple[list[list[float]], list[float]]:
+    meters_to_deg = 1.0 / 111_320.0
+    t = np.arange(count) * timestep_s
+    angle = trim_yaw_rad + 0.1 * np.sin(0.5 * t)
+    step = max(cruise_velocity_m_s, 0.0) * timestep_s
+    # cumsum adds sequentially, matching the running total of the scalar loop.
+    distance = np.cumsum(np.full(count, step))
+    lon = distance * np.cos(angle) * meters_to_deg
+    lat = distance * np.sin(angle) * meters_to_deg
+    alt = climb_rate_m_s * t
+    return np.column_stack((lon, lat, alt)).tolist(), t.tolist()
+
+
+def segment_bounds(column: Sequence[float], size: int) -> tuple[list[float], list[float]]:
+    """Per-chunk minima and maxima of ``column`` split into runs of ``size`` values."""
+
+    values = np.asarray(column, dtype=np.float64)
+    starts = np.arange(0, len(values), size)
+    lows = np.minimum.reduceat(values, starts)
+    highs = np.maximum.reduceat(values, starts)
+    return lows.tolist(), highs.tolist()
+
+
+def pack_floats(values: Sequence[Any], precision: str) -> bytes:
+    """Row-major ``float32``/``float64`` bytes of a flat or ``[[x, y], ...]`` sequence."""
+
+    return np.asarray(values, dtype=np.dtype(precision)).tobytes()
@@ -0,0 +1,163 @@
+"""Background prefetch of BirdFlow routes and BirdCast tiles at server start."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+from .connectors import (
+    BIRDFLOW_FALLBACKS,
+    birdcast_tile_path,
+    birdflow_route_path,
+    ensure_birdcast_tile,
+    ensure_birdflow_route,
+)
+from .datasets import discover_birdcast_tiles, discover_route_datasets, invalidate_paths
+from .env import env_flag, env_int
+
+WARMUP_ENV = "MIGRATION_WARMUP"
+WARMUP_SPECIES_ENV = "MIGRATION_WARMUP_SPECIES"
+WARMUP_DAYS_ENV = "MIGRATION_WARMUP_DAYS"
+DEFAULT_WARMUP_DAYS = 3
+DEFAULT_WARMUP_PRODUCT = "summary"
+DEFAULT_WARMUP_WORKERS = 4
+
+
+def warmup_enabled() -> bool:
+    return env_flag(WARMUP_ENV, False)
+
+
+def warmup_species() -> list[str]:
+    value = os.getenv(WARMUP_SPECIES_ENV)
+    if not value:
+        return list(BIRDFLOW_FALLBACKS)
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def warmup_days() -> int:
+    return env_int(WARMUP_DAYS_ENV, DEFAULT_WARMUP_DAYS, minimum=0)
+
+
+class WarmupScheduler:
+    """Prefetch species routes and a rolling window of BirdCast dates on a worker pool.
+
+    The discovery catalog is populated first so that cheap catalog calls are warm
+    immediately; each fetched file is then patched into the catalog individually.
+    :meth:`stop` skips the tasks that have not started and waits for the rest.
+    """
+
+    def __init__(
+        self,
+        data_root: Path,
+        *,
+        species: Iterable[str] | None = None,
+        days: int | None = None,
+        product: str = DEFAULT_WARMUP_PRODUCT,
+        max_workers: int = DEFAULT_WARMUP_WORKERS,
+        today: date | None = None,
+    ) -> None:
+        self.data_root = data_root.expanduser()
+        self.species = list(warmup_species() if species is None else species)
+        window = warmup_days() if days is None else days
+        end = today or date.today()
+        self.dates = [(end - timedelta(days=offset)).isoformat() for offset in range(window)]
+        self.product = product
+        self.max_workers = max(1, max_workers)
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._state = "pending"
+        self._completed = 0
+        self._failed: list[str] = []
+        self._errors: dict[str, str] = {}
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    @property
+    def total(self) -> int:
+        return len(self.species) + len(self.dates)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="migration-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Cancel pending tasks and join the warmup thread.
+
+        Downloads already in flight are not interrupted; ``timeout`` bounds the wait.
+        """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def progress(self) -> dict[str, Any]:
+        with self._lock:
+            elapsed = None
+            if self._started_at is not None:
+                elapsed = (self._finished_at or time.monotonic()) - self._started_at
+            return {
+                "state": self._state,
+                "total": self.total,
+                "completed": self._completed,
+                "failed": list(self._failed),
+                "errors": dict(self._errors),
+                "species": list(self.species),
+                "dates": list(self.dates),
+                "elapsed_s": elapsed,
+            }
+
+    def _run(self) -> None:
+        with self._lock:
+            self._state = "running"
+            self._started_at = time.monotonic()
+        try:
+            discover_route_datasets(str(self.data_root))
+            discover_birdcast_tiles(str(self.data_root))
+            tasks = [("birdflow", species) for species in self.species]
+            tasks += [("birdcast", value) for value in self.dates]
+            with ThreadPoolExecutor(self.max_workers, thread_name_prefix="migration-warmup") as pool:
+                list(pool.map(self._prefetch, tasks))
+        finally:
+            with self._lock:
+                self._state = "cancelled" if self._stop.is_set() else "done"
+                self._finished_at = time.monotonic()
+            self._done.set()
+
+    def _prefetch(self, task: tuple[str, str]) -> None:
+        if self._stop.is_set():
+            return
+        kind, value = task
+        error = None
+        try:
+            if kind == "birdflow":
+                cached = birdflow_route_path(value, self.data_root).exists()
+                path = ensure_birdflow_route(value, self.data_root)
+            else:
+                cached = birdcast_tile_path(value, self.product, self.data_root).exists()
+                path = ensure_birdcast_tile(value, self.product, self.data_root)
+            # Files that were already on disk are in the catalog; re-announcing them
+            # would flush every worker's caches for nothing.
+            if path is not None and not cached:
+                invalidate_paths([path])
+        except Exception as exc:  # noqa: BLE001 - one bad task must not abort the warmup
+            path = None
+            error = f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            self._completed += 1
+            if path is None:
+                self._failed.append(f"{kind}:{value}")
+            if error is not None:
+                self._errors[f"{kind}:{value}"] = error
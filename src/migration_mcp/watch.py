@@ -0,0 +1,260 @@
+"""Filesystem watching that keeps cached dataset catalogs in sync with the data root."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from .datasets import (
+    BIRDCAST_EXTENSIONS,
+    BIRDCAST_TILES_SUBDIR,
+    ROUTES_SUBDIR,
+    cached_paths,
+    clear_caches,
+    invalidate_paths,
+)
+from .env import env_flag
+from .shared import publish_change
+from .snapshot import discard_snapshot
+
+WATCH_ENV = "MIGRATION_WATCH"
+DEFAULT_POLL_INTERVAL = 2.0
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+_DEBOUNCE_S = 0.05
+
+
+def watch_enabled() -> bool:
+    return env_flag(WATCH_ENV, False)
+
+
+class CatalogWatcher:
+    """Invalidate catalog entries for files that change under ``root``.
+
+    Uses inotify on Linux and falls back to periodic mtime/size polling elsewhere,
+    when the watch limit is exhausted, or when the watched directories do not exist
+    yet. Every batch of changes is handed to :func:`datasets.invalidate_paths`, so a
+    single new route costs a single file parse.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        backend: str | None = None,
+    ) -> None:
+        self.root = root.expanduser()
+        self.interval = interval
+        self.backend = backend or ("inotify" if _inotify_available() else "poll")
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._snapshot: dict[Path, tuple[int, int]] | None = None
+
+    @property
+    def watched_dirs(self) -> list[Path]:
+        return [self.root / ROUTES_SUBDIR, self.root / BIRDCAST_TILES_SUBDIR]
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._ready.clear()
+        if self.backend == "poll":
+            self._snapshot = self._take_snapshot()
+        self._thread = threading.Thread(target=self._run, name="migration-watch", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the watcher observes changes (watches are installed)."""
+
+        return self._ready.wait(timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll_once(self) -> set[Path]:
+        """Diff the data root against the previous snapshot and invalidate changes."""
+
+        current = self._take_snapshot()
+        previous = self._snapshot if self._snapshot is not None else current
+        self._snapshot = current
+        changed = {
+            path
+            for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+        invalidate_paths(sorted(changed))
+        return changed
+
+    def _run(self) -> None:
+        if self.backend == "inotify":
+            try:
+                self._run_inotify()
+                return
+            except OSError:
+                # Fall through to polling (e.g. ENOSPC when the watch limit is hit).
+                self.backend = "poll"
+                self._snapshot = self._take_snapshot()
+        self._ready.set()
+        while not self._stop.wait(self.interval):
+            self.poll_once()
+
+    def _run_inotify(self) -> None:
+        inotify = _Inotify()
+        try:
+            for directory in self.watched_dirs:
+                if not directory.is_dir():
+                    raise OSError(errno.ENOENT, "watched directory missing", str(directory))
+                inotify.add_tree(directory)
+            self._ready.set()
+            while not self._stop.is_set():
+                events = inotify.read(self.interval)
+                if not events:
+                    continue
+                while True:
+                    more = inotify.read(_DEBOUNCE_S)
+                    if not more:
+                        break
+                    events.extend(more)
+                self._dispatch(inotify, events)
+        finally:
+            inotify.close()
+
+    def _dispatch(self, inotify: _Inotify, events: list[tuple[Path | None, int]]) -> None:
+        changed: set[Path] = set()
+        removed_dir = False
+        for path, mask in events:
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost: rebuild everything here and in the other workers.
+                discard_snapshot(self.root)
+                clear_caches(str(self.root))
+                publish_change()
+                return
+            if path is None or mask & _IN_IGNORED:
+                continue
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    inotify.add_tree(path)
+                    changed.update(item for item in path.rglob("*") if self._is_tracked(item))
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    # The files are gone, so drop whatever the catalogs hold under the directory.
+                    changed.update(cached_paths(path))
+                    removed_dir = True
+                continue
+            if mask & _IN_CREATE and not mask & _IN_MOVED_TO:
+                # Wait for IN_CLOSE_WRITE so half-written files are not parsed.
+                continue
+            if self._is_tracked(path):
+                changed.add(path)
+        if changed:
+            invalidate_paths(sorted(changed))
+        elif removed_dir:
+            # Nothing cached in this process, but other workers may still list the files.
+            publish_change()
+
+    def _is_tracked(self, path: Path) -> bool:
+        routes, tiles = self.watched_dirs
+        if path.parent == routes or routes in path.parents:
+            return path.suffix == ".geojson"
+        if tiles in path.parents:
+            return path.suffix.lower() in BIRDCAST_EXTENSIONS
+        return False
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for directory in self.watched_dirs:
+            if not directory.exists():
+                continue
+            for path in directory.rglob("*"):
+                if not self._is_tracked(path):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if path.is_file():
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+def _inotify_available() -> bool:
+    return sys.platform.startswith("linux") and _libc() is not None
+
+
+def _libc() -> ctypes.CDLL | None:
+    name = ctypes.util.find_library("c")
+    try:
+        libc = ctypes.CDLL(name or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+class _Inotify:
+    """Thin ctypes wrapper over the Linux inotify API."""
+
+    def __init__(self) -> None:
+        libc = _libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+
+    def add_tree(self, directory: Path) -> None:
+        for path in [directory, *(item for item in directory.rglob("*") if item.is_dir())]:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code == errno.ENOENT:
+                    continue
+                raise OSError(code, "inotify_add_watch failed", str(path))
+            self._dirs[wd] = path
+
+    def read(self, timeout: float) -> list[tuple[Path | None, int]]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events: list[tuple[Path | None, int]] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._dirs.get(wd)
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+            path = directory / os.fsdecode(name) if directory is not None and name else None
+            events.append((path, mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self._fd)
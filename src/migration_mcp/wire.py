@@ -0,0 +1,195 @@
+"""Compact wire encodings for route responses.
+
+Two independent knobs are negotiated per request:
+
+* the **representation** – the default JSON ``RouteResponse``, or a binary deck.gl
+  container (``application/vnd.migration.deckgl``) whose attribute buffers can be
+  handed to ``PathLayer``/``TripsLayer`` as typed arrays without parsing, and
+* the **content encoding** – ``zstd`` (when ``zstandard`` or Python 3.14's
+  ``compression.zstd`` is available) or ``gzip``, chosen from ``Accept-Encoding``.
+
+Binary layout::
+
+    b"MIGDGL1\\n" | uint32 header length | JSON header (space padded to 8) | buffers
+
+The header lists each attribute's ``offset`` (from the start of the buffer area),
+``type`` (``float32``/``float64``), ``size`` (components per vertex) and ``length``
+(vertex count). With ``float32``, timestamps are stored relative to
+``header["time_origin"]`` so second-level precision survives for epoch values.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Literal
+
+from . import vector
+from .resampling import timestamp_seconds
+
+try:  # pragma: no cover - depends on the interpreter / optional extra
+    from compression import zstd as _zstd
+
+    def _zstd_compress(body: bytes) -> bytes:
+        return _zstd.compress(body)
+
+except ImportError:  # pragma: no cover - depends on the interpreter / optional extra
+    try:
+        import zstandard as _zstandard
+    except ImportError:
+        _zstd_compress = None
+    else:
+
+        def _zstd_compress(body: bytes) -> bytes:
+            return _zstandard.ZstdCompressor().compress(body)
+
+
+Precision = Literal["float32", "float64"]
+
+DECKGL_MEDIA_TYPE = "application/vnd.migration.deckgl"
+JSON_MEDIA_TYPE = "application/json"
+MIN_COMPRESS_BYTES = 1024
+
+_MAGIC = b"MIGDGL1\n"
+_LENGTH = struct.Struct("<I")
+_PREFIX = len(_MAGIC) + _LENGTH.size
+_TYPECODES = {"float32": "f", "float64": "d"}
+
+
+def zstd_available() -> bool:
+    return _zstd_compress is not None
+
+
+def wants_deckgl_binary(accept: str | None) -> bool:
+    return DECKGL_MEDIA_TYPE in _media_ranges(accept)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick ``zstd`` or ``gzip`` from an ``Accept-Encoding`` header (``None`` = identity)."""
+
+    offered = _media_ranges(accept_encoding)
+    if "zstd" in offered and zstd_available():
+        return "zstd"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str | None) -> tuple[bytes, str | None]:
+    """Compress ``body``; tiny bodies are left alone since headers would dominate."""
+
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == "zstd" and _zstd_compress is not None:
+        return _zstd_compress(body), "zstd"
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def encode_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_deckgl_binary(
+    deckgl: Sequence[dict[str, Any]],
+    metadata: dict[str, Any],
+    precision: Precision = "float64",
+) -> bytes:
+    """Pack every deck.gl path entry into shared typed attribute buffers.
+
+    Paths are concatenated; ``header["startIndices"]`` gives each one's first vertex,
+    as expected by deck.gl's binary ``PathLayer`` input.
+    """
+
+    path: list[Any] = []
+    altitudes: list[Any] = []
+    timestamps: list[float] = []
+    starts: list[int] = []
+    for layer in deckgl:
+        starts.append(len(path))
+        # ISO timestamps become epoch seconds; unparseable ones fall back to vertex order.
+        timestamps.extend(timestamp_seconds(layer["timestamps"]) or range(len(layer["path"])))
+        path.extend(layer["path"])
+        altitudes.extend(layer["altitudes"])
+    time_origin = 0.0
+    if precision == "float32" and timestamps:
+        time_origin = float(timestamps[0])
+        timestamps = [float(value) - time_origin for value in timestamps]
+
+    buffers: list[bytes] = []
+    attributes: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, values, size in (
+        ("getPath", path, 2),
+        ("getTimestamps", timestamps, 1),
+        ("getAltitude", altitudes, 1),
+    ):
+        raw = _pack(values, size, precision)
+        attributes[name] = {
+            "offset": offset,
+            "type": precision,
+            "size": size,
+            "length": len(values),
+        }
+        raw += b"\0" * (-len(raw) % 8)
+        buffers.append(raw)
+        offset += len(raw)
+
+    header = {
+        "version": 1,
+        "byteorder": sys.byteorder,
+        "startIndices": starts,
+        "time_origin": time_origin,
+        "labels": [layer.get("label") for layer in deckgl],
+        "individuals": [layer.get("individual") for layer in deckgl],
+        "attributes": attributes,
+        "metadata": metadata,
+    }
+    raw_header = encode_json(header)
+    raw_header += b" " * (-(_PREFIX + len(raw_header)) % 8)
+    return b"".join([_MAGIC, _LENGTH.pack(len(raw_header)), raw_header, *buffers])
+
+
+def decode_deckgl_binary(body: bytes) -> dict[str, Any]:
+    """Inverse of :func:`encode_deckgl_binary` (for Python clients and tests)."""
+
+    if body[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a deck.gl binary route")
+    (length,) = _LENGTH.unpack_from(body, len(_MAGIC))
+    header = json.loads(body[_PREFIX : _PREFIX + length])
+    base = _PREFIX + length
+    for attribute in header["attributes"].values():
+        values = array(_TYPECODES[attribute["type"]])
+        start = base + attribute["offset"]
+        values.frombytes(
+            body[start : start + values.itemsize * attribute["size"] * attribute["length"]]
+        )
+        if header["byteorder"] != sys.byteorder:
+            values.byteswap()
+        attribute["value"] = values.tolist()
+    return header
+
+
+def _pack(values: Sequence[Any], size: int, precision: Precision) -> bytes:
+    if vector.numpy_enabled():
+        return vector.pack_floats(values, precision)
+    flat = [value for row in values for value in row[:size]] if size > 1 else values
+    return array(_TYPECODES[precision], flat).tobytes()
+
+
+def _media_ranges(header: str | None) -> set[str]:
+    """Tokens of a comma-separated header, ignoring parameters and ``q=0`` entries."""
+
+    tokens: set[str] = set()
+    for item in (header or "").split(","):
+        name, _, params = item.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        if name.strip():
+            tokens.add(name.strip().lower())
+    return tokens
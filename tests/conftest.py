@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+
+def route_payload(
+    points: int = 4,
+    *,
+    species: str = "grus_grus",
+    coordinates: Sequence[Sequence[float]] | None = None,
+    timestamps: Sequence[Any] | None = None,
+    timed: bool = True,
+    properties: dict[str, Any] | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build a single-track route FeatureCollection.
+
+    Without ``coordinates`` the track is a straight ``points``-long line; timestamps
+    default to the point indices and are left out entirely when ``timed`` is false.
+    """
+
+    if coordinates is None:
+        coordinates = [[idx * 0.1, idx * 0.2, float(idx)] for idx in range(points)]
+    props = dict(properties or {})
+    if timed:
+        props["timestamps"] = list(range(len(coordinates)) if timestamps is None else timestamps)
+    return {
+        "type": "FeatureCollection",
+        "metadata": {"species_code": species, **(metadata or {})},
+        "features": [
+            {
+                "type": "Feature",
+                "properties": props,
+                "geometry": {"type": "LineString", "coordinates": [list(c) for c in coordinates]},
+            }
+        ],
+    }
+
+
+def write_route(path: Path, payload: dict[str, Any] | None = None, **kwargs: Any) -> Path:
+    """Write ``payload`` (or ``route_payload(**kwargs)``) to ``path`` and return it."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = route_payload(**kwargs) if payload is None else payload
+    path.write_text(json.dumps(body), encoding="utf-8")
+    return path
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import copy
+
+from benchmarks import compare, run
+from benchmarks.synthetic import SyntheticSpec, build_data_root, species_code
+
+
+def test_synthetic_data_root_layout(tmp_path) -> None:
+    counts = build_data_root(tmp_path, SyntheticSpec(species=2, points=50, tile_zoom=1))
+    assert counts == {"route_files": 2, "route_points": 100, "tiles": 3 * (1 + 4)}
+    assert (tmp_path / "migration/routes/birdflow" / f"{species_code(1)}.geojson").exists()
+    assert (tmp_path / "migration/tiles/birdcast/2024-04-01/density/1/1/1.png").exists()
+
+
+def test_suite_runs_and_compares(tmp_path) -> None:
+    spec = SyntheticSpec(species=2, points=200, individuals=2, tile_dates=1, tile_zoom=1)
+    build_data_root(tmp_path, spec)
+    report = run.run_suite(tmp_path, spec, waypoints=(10,), repeat=1)
+
+    results = report["results"]
+    assert report["meta"]["spec"]["points"] == 200
+    assert results["discovery.routes.warm"]["items"] == 2
+    assert results["discovery.tiles.cold"]["items"] == 5
+    assert {"routes.cold[10]", "routes.warm[10]", "serialize.deckgl_float32[10]"} <= set(results)
+    assert results["serialize.json_gzip[10]"]["bytes"] < results["serialize.json[10]"]["bytes"]
+
+    slower = copy.deepcopy(report)
+    slower["results"]["routes.cold[10]"]["median_s"] += 1.0
+    rows = {row["name"]: row for row in compare.compare(report, slower)}
+    assert rows["routes.cold[10]"]["regressed"]
+    assert not rows["routes.warm[10]"]["regressed"]
@@ -4,6 +4,10 @@ import json
 import subprocess
 import sys
 
+import pytest
+
+from migration_mcp import __main__ as cli
+
 
 def test_describe_cli_outputs_metadata() -> None:
     result = subprocess.run(
@@ -15,3 +19,58 @@ def test_describe_cli_outputs_metadata() -> None:
     payload = json.loads(result.stdout)
     assert payload["name"] == "migration-mcp"
     assert payload["default_transport"] == "stdio"
+
+
+def test_describe_skips_server_imports() -> None:
+    script = (
+        "import sys\n"
+        "from migration_mcp.__main__ import main\n"
+        "main(['--describe'])\n"
+        "heavy = ['mcp.server.fastmcp', 'fastapi', 'migration_mcp.core', 'httpx']\n"
+        "print(json.dumps([name for name in heavy if name in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", "import json\n" + script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(result.stdout.splitlines()[-1]) == []
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--watch", "--warmup", "--warmup-days", "2", "serve", "--workers", "2"],
+        ["serve", "--watch", "--warmup", "--warmup-days", "2", "--workers", "2"],
+    ],
+)
+def test_service_options_work_before_and_after_serve(argv: list[str], monkeypatch) -> None:
+    calls: list[dict] = []
+    monkeypatch.delenv("MIGRATION_WATCH", raising=False)
+    monkeypatch.delenv("MIGRATION_WARMUP", raising=False)
+    monkeypatch.setattr(cli, "serve", lambda root, **kwargs: calls.append(kwargs))
+    assert cli.main(argv) == 0
+    [kwargs] = calls
+    assert kwargs["watch"] is True
+    assert kwargs["workers"] == 2
+    assert kwargs["warmup"] is not None
+    assert len(kwargs["warmup"].dates) == 2
+
+
+def test_stdio_server_stops_warmup_on_exit(tmp_path, monkeypatch) -> None:
+    fastmcp = pytest.importorskip("mcp.server.fastmcp")
+    stopped: list[float | None] = []
+
+    class Scheduler:
+        def start(self) -> None:
+            return None
+
+        def stop(self, timeout: float | None = None) -> None:
+            stopped.append(timeout)
+
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(cli, "_warmup_scheduler", lambda args: Scheduler())
+    monkeypatch.setattr(fastmcp.FastMCP, "run", lambda self: None)
+    assert cli.main([]) == 0
+    assert stopped == [cli.SHUTDOWN_TIMEOUT]
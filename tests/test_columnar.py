@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import columnar, core
+from migration_mcp.columnar import compile_route, open_compiled, sidecar_path, wait_for_compiles
+from migration_mcp.core import generate_routes
+from migration_mcp.datasets import clear_caches, invalidate_paths, routes_dir
+from migration_mcp.models import RouteRequest
+from migration_mcp.resampling import ResampleSpec
+from migration_mcp.streaming import encode
+from migration_mcp.time_window import TimeWindow
+from tests.conftest import route_payload
+
+
+def _payload(points: int, timestamps: list | None) -> dict:
+    return route_payload(
+        points,
+        timestamps=timestamps,
+        timed=timestamps is not None,
+        properties={"label": "crane", "species_code": "grus_grus"},
+    )
+
+
+@pytest.mark.parametrize(
+    "timestamps",
+    [
+        None,
+        list(range(40)),
+        [idx * 1.5 for idx in range(40)],
+        [f"2010-09-{1 + idx // 24:02d}T{idx % 24:02d}:00:00Z" for idx in range(40)],
+    ],
+)
+@pytest.mark.parametrize("target", [3, 7, 40, 100])
+def test_columnar_resampling_matches_geojson(tmp_path: Path, timestamps, target: int) -> None:
+    path = tmp_path / "grus_grus.geojson"
+    payload = _payload(40, timestamps)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    assert compile_route(path) == sidecar_path(path)
+    route = open_compiled(path)
+    assert route is not None and route.count == 40
+    try:
+        compiled = core._resample_columnar(route, ResampleSpec(target))
+    finally:
+        route.close()
+    assert compiled == core._resample_geojson(copy.deepcopy(payload), ResampleSpec(target))
+    assert json.dumps(compiled.geojson()) == json.dumps(
+        core._resample_geojson(payload, ResampleSpec(target)).geojson()
+    )
+
+
+def test_stale_or_unsupported_sidecars_are_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "track.geojson"
+    path.write_text(json.dumps(_payload(5, None)), encoding="utf-8")
+    assert compile_route(path) is not None
+    path.write_text(json.dumps(_payload(6, None)), encoding="utf-8")
+    assert open_compiled(path) is None
+
+    mixed = _payload(3, ["2010-01-01T00:00:00Z", 1, 2])
+    path.write_text(json.dumps(mixed), encoding="utf-8")
+    assert compile_route(path) is None
+
+
+def test_generate_routes_compiles_sidecar_off_the_request_path(tmp_path: Path, monkeypatch) -> None:
+    path = routes_dir(tmp_path) / "grus_grus.geojson"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(_payload(30, list(range(30)))), encoding="utf-8")
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(species_code="grus_grus", data_root=str(tmp_path), num_waypoints=5)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(columnar, "compile_in_background", lambda paths: None)
+        patch.setattr(core, "compile_in_background", lambda paths: None)
+        first = generate_routes(request)
+        assert not sidecar_path(path).exists()
+    core.ROUTE_CACHE.clear()
+    generate_routes(request)
+    wait_for_compiles()
+    assert sidecar_path(path).exists()
+
+    core.ROUTE_CACHE.clear()
+    monkeypatch.setattr(core, "_load_geojson", lambda dataset: pytest.fail("GeoJSON was parsed"))
+    second = generate_routes(request)
+    assert second.geojson == first.geojson
+    assert second.deckgl == first.deckgl
+
+    monkeypatch.setenv(columnar.COLUMNAR_ENV, "0")
+    assert open_compiled(path) is None
+    clear_caches()
+
+
+def test_ingested_routes_are_compiled_in_the_background(tmp_path: Path) -> None:
+    path = routes_dir(tmp_path) / "birdflow" / "grus_grus.geojson"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(_payload(30, list(range(30)))), encoding="utf-8")
+    invalidate_paths([path])
+    wait_for_compiles()
+    route = open_compiled(path)
+    assert route is not None
+    route.close()
+
+
+def test_failed_compiles_are_remembered(tmp_path: Path, monkeypatch) -> None:
+    path = routes_dir(tmp_path) / "grus_grus.geojson"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(_payload(30, list(range(30)))), encoding="utf-8")
+    sidecar_path(path).mkdir()  # an unwritable sidecar location
+    encodes: list[int] = []
+    encode = columnar._encode
+    monkeypatch.setattr(columnar, "_encode", lambda payload: encodes.append(1) or encode(payload))
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(species_code="grus_grus", data_root=str(tmp_path), num_waypoints=5)
+
+    first = generate_routes(request)
+    wait_for_compiles()
+    core.ROUTE_CACHE.clear()
+    assert generate_routes(request).geojson == first.geojson
+    wait_for_compiles()
+    assert len(encodes) == 1
+
+    # A rewritten source gets a fresh attempt.
+    sidecar_path(path).rmdir()
+    path.write_text(json.dumps(_payload(31, list(range(31)))), encoding="utf-8")
+    assert compile_route(path) == sidecar_path(path)
+    assert len(encodes) == 2
+    clear_caches()
+
+
+def _flock(individuals: list[str], points: int = 30) -> dict:
+    payload = _payload(points, list(range(points)))
+    template = payload["features"][0]
+    payload["features"] = [
+        {
+            **copy.deepcopy(template),
+            "id": name,
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[offset + idx * 0.1, idx * 0.2, 0.0] for idx in range(points)],
+            },
+        }
+        for offset, name in enumerate(individuals)
+    ]
+    return payload
+
+
+@pytest.mark.parametrize("individuals", [None, ("b",), ("c", "a")])
+def test_multi_individual_routes(tmp_path: Path, monkeypatch, individuals) -> None:
+    path = routes_dir(tmp_path) / "grus_grus.geojson"
+    path.parent.mkdir(parents=True)
+    payload = _flock(["a", "b", "c"])
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    spec = ResampleSpec(6, individuals=individuals)
+    expected = core._resample_geojson(copy.deepcopy(payload), spec)
+    assert [track.individual for track in expected.tracks] == sorted(individuals or "abc")
+
+    assert compile_route(path) is not None
+    route = open_compiled(path)
+    assert route is not None and [feature.count for feature in route.features] == [30] * 3
+    try:
+        assert core._resample_columnar(route, spec) == expected
+    finally:
+        route.close()
+
+    # Parallel and serial per-feature processing must agree.
+    monkeypatch.setattr(core, "FEATURE_PARALLEL_POINTS", 0)
+    assert core._resample_geojson(copy.deepcopy(payload), spec) == expected
+    deckgl = core._build_deckgl(expected)
+    assert [entry["individual"] for entry in deckgl] == sorted(individuals or "abc")
+    assert all(len(entry["path"]) == 6 for entry in deckgl)
+
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(
+        species_code="grus_grus",
+        data_root=str(tmp_path),
+        num_waypoints=6,
+        individuals=list(individuals) if individuals else None,
+    )
+    assert generate_routes(request).deckgl == deckgl
+    stream = core.stream_route(request)
+    streamed = json.loads(b"".join(encode(stream, "geojson", batch_points=4)))
+    assert streamed["features"] == json.loads(json.dumps(expected.geojson()))["features"]
+    clear_caches()
+
+
+def test_features_without_matching_timestamps_are_not_compiled(tmp_path: Path) -> None:
+    path = tmp_path / "flock.geojson"
+    payload = _flock(["a", "b"], points=5)
+    del payload["features"][1]["properties"]["timestamps"]
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    assert compile_route(path) is None
+
+
+def _zigzag(points: int) -> dict:
+    payload = _payload(points, list(range(points)))
+    payload["features"][0]["geometry"]["coordinates"] = [
+        [idx * 0.01 * (1 + idx % 7), (idx % 13) * 0.02 - (idx % 5) * 0.011] for idx in range(points)
+    ]
+    return payload
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        ResampleSpec(12, "arc_length"),
+        ResampleSpec(150, "arc_length"),
+        ResampleSpec(12, "douglas_peucker"),
+        ResampleSpec(150, "douglas_peucker", tolerance_m=500.0),
+        ResampleSpec(400, "douglas_peucker", tolerance_m=50.0),
+        ResampleSpec(12, "arc_length", window=TimeWindow(start=40, end=260)),
+        ResampleSpec(12, "douglas_peucker", window=TimeWindow(start=40, end=260)),
+    ],
+)
+def test_lod_pyramid_matches_direct_resampling(
+    tmp_path: Path, monkeypatch, spec: ResampleSpec
+) -> None:
+    path = tmp_path / "grus_grus.geojson"
+    path.write_text(json.dumps(_zigzag(300)), encoding="utf-8")
+    # Short rankings force requests past the stored levels back onto the points.
+    monkeypatch.setattr(columnar, "LOD_POINTS", 100)
+    assert compile_route(path) is not None
+    route = open_compiled(path)
+    assert route is not None
+    try:
+        feature = route.features[0]
+        served = core._columnar_indices(feature, spec)
+        monkeypatch.setattr(feature, "pyramid", lambda positions: None)
+        direct = core._columnar_indices(feature, spec)
+    finally:
+        route.close()
+    assert served == direct
+
+
+def test_lod_pyramid_skips_reading_points(tmp_path: Path) -> None:
+    path = tmp_path / "grus_grus.geojson"
+    path.write_text(json.dumps(_zigzag(300)), encoding="utf-8")
+    assert compile_route(path) is not None
+    route = open_compiled(path)
+    assert route is not None
+    try:
+        feature = route.features[0]
+        pyramid = feature.pyramid(range(feature.count))
+        assert pyramid is not None and len(pyramid.distances) == 300
+        assert len(pyramid.order) == 298 and pyramid.distances[0] == 0.0
+        assert feature.pyramid(range(10, 20)).order is None
+        assert feature.pyramid([1, 5, 9]) is None
+
+        def unread() -> tuple:
+            raise AssertionError("pyramid requests must not read coordinates")
+
+        for mode in ("arc_length", "douglas_peucker"):
+            indices = core.resampling.select_indices(
+                ResampleSpec(20, mode), 300, unread, None, core._select_indices, pyramid
+            )
+            assert indices is not None and len(indices) == 20
+    finally:
+        route.close()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import anyio
+import pytest
+
+from migration_mcp.concurrency import EndpointLimiter
+
+
+@pytest.mark.anyio
+async def test_limiter_bounds_concurrent_calls() -> None:
+    limiter = EndpointLimiter("routes", 2)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async with anyio.create_task_group() as group:
+        for _ in range(6):
+            group.start_soon(limiter.run, work)
+
+    snapshot = limiter.snapshot()
+    assert peak == 2
+    assert snapshot["completed"] == 6
+    assert snapshot["max_queued"] >= 3
+    assert snapshot["queued"] == snapshot["active"] == 0
+    assert snapshot["wait_max_s"] > 0
+
+
+@pytest.fixture()
+def anyio_backend() -> str:
+    return "asyncio"
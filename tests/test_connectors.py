@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from migration_mcp import connectors, fetch
+from migration_mcp.datasets import birdflow_dir, routes_dir
+from migration_mcp.fetch import Fetcher
+
+ROUTE = {
+    "type": "FeatureCollection",
+    "metadata": {"species_code": "anser_anser"},
+    "features": [{"type": "Feature", "properties": {}, "geometry": {"coordinates": [[0, 0]]}}],
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits: ClassVar[list[str]] = []
+
+    def do_GET(self) -> None:
+        type(self).hits.append(self.path)
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+        time.sleep(0.2)  # keep the download in flight while other callers arrive
+        body = json.dumps(ROUTE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+@pytest.fixture()
+def server() -> Iterator[str]:
+    _Handler.hits = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture()
+def fetcher(monkeypatch) -> Iterator[Fetcher]:
+    instance = Fetcher(max_connections=2, timeout=5.0)
+    monkeypatch.setattr(connectors, "FETCHER", instance)
+    yield instance
+    instance.close()
+
+
+def test_concurrent_fetches_share_one_download(
+    tmp_path: Path, server: str, fetcher: Fetcher, monkeypatch
+) -> None:
+    monkeypatch.setenv("BIRDFLOW_GEOJSON_URL", f"{server}/anser.geojson")
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(
+            pool.map(lambda _: connectors.ensure_birdflow_route("anser_anser", tmp_path), range(6))
+        )
+
+    target = birdflow_dir(tmp_path) / "anser_anser.geojson"
+    assert results == [target] * 6
+    assert _Handler.hits == ["/anser.geojson"]
+    assert json.loads(target.read_text(encoding="utf-8")) == ROUTE
+    assert [path.name for path in target.parent.iterdir()] == [target.name]
+
+
+def test_failed_fetch_leaves_no_partial_file(
+    tmp_path: Path, server: str, fetcher: Fetcher, monkeypatch
+) -> None:
+    monkeypatch.setenv("BIRDFLOW_GEOJSON_URL", f"{server}/missing.geojson")
+    assert connectors.ensure_birdflow_route("anser_anser", tmp_path) is None
+    assert list(birdflow_dir(tmp_path).iterdir()) == []
+
+
+@pytest.mark.parametrize("url", ["http://[::1", "ftp://example.invalid/anser.geojson"])
+def test_malformed_route_url_is_a_failed_fetch(
+    tmp_path: Path, url: str, fetcher: Fetcher, monkeypatch
+) -> None:
+    monkeypatch.setenv("BIRDFLOW_GEOJSON_URL", url)
+    assert connectors.ensure_birdflow_route("anser_anser", tmp_path) is None
+
+
+@pytest.mark.anyio
+async def test_async_fetch(tmp_path: Path, server: str, fetcher: Fetcher, monkeypatch) -> None:
+    monkeypatch.setenv("BIRDFLOW_GEOJSON_URL", f"{server}/anser.geojson")
+    path = await connectors.ensure_birdflow_route_async("anser_anser", tmp_path)
+    assert path == birdflow_dir(tmp_path) / "anser_anser.geojson"
+    assert path.exists()
+
+
+@pytest.mark.anyio
+async def test_async_fetch_writes_buffered_chunks(
+    tmp_path: Path, server: str, fetcher: Fetcher, monkeypatch
+) -> None:
+    monkeypatch.setattr(fetch, "CHUNK_SIZE", 16)
+    monkeypatch.setattr(fetch, "WRITE_BUFFER_SIZE", 40)
+    monkeypatch.setenv("BIRDFLOW_GEOJSON_URL", f"{server}/anser.geojson")
+    path = await connectors.ensure_birdflow_route_async("anser_anser", tmp_path)
+    assert path is not None
+    assert json.loads(path.read_text(encoding="utf-8")) == ROUTE
+
+
+@pytest.mark.anyio
+async def test_async_legacy_copy_runs_off_the_event_loop(tmp_path: Path, monkeypatch) -> None:
+    legacy = routes_dir(tmp_path) / "anser_anser.geojson"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps(ROUTE), encoding="utf-8")
+    threads: list[threading.Thread] = []
+    copy = connectors._atomic_copy
+
+    def tracked(source: Path, target: Path) -> None:
+        threads.append(threading.current_thread())
+        copy(source, target)
+
+    monkeypatch.setattr(connectors, "_atomic_copy", tracked)
+    path = await connectors.ensure_birdflow_route_async("anser_anser", tmp_path)
+    assert path == birdflow_dir(tmp_path) / "anser_anser.geojson"
+    assert threads and threads[0] is not threading.current_thread()
+
+
+@pytest.fixture()
+def anyio_backend() -> str:
+    return "asyncio"
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
-from migration_mcp.core import generate_routes
-from migration_mcp.models import RouteRequest
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import core, vector
+from migration_mcp.cache import PayloadCache
+from migration_mcp.core import generate_routes, generate_routes_batch
+from migration_mcp.datasets import clear_caches, routes_dir
+from migration_mcp.models import RouteBatchRequest, RouteRequest
+from migration_mcp.route_data import RouteData, Track
+from tests.conftest import write_route
+
+
+def _write_track(root: Path, species: str = "grus_grus", points: int = 50) -> Path:
+    path = routes_dir(root) / "birdflow" / f"{species}.geojson"
+    return write_route(path, species=species, points=points, properties={"label": species})
 
 
 def test_generate_routes_surrogate() -> None:
@@ -9,3 +23,109 @@ def test_generate_routes_surrogate() -> None:
     assert response.metadata["status"] == "surrogate"
     assert len(response.geojson["features"][0]["geometry"]["coordinates"]) == 5
     assert response.deckgl
+
+
+def test_generate_routes_caches_resampled_payloads(tmp_path: Path) -> None:
+    _write_track(tmp_path)
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(species_code="grus_grus", data_root=str(tmp_path), num_waypoints=10)
+
+    first = generate_routes(request)
+    second = generate_routes(request)
+    assert first.metadata["status"] == "dataset"
+    assert (first.metadata["cache"], second.metadata["cache"]) == ("miss", "hit")
+    assert second.geojson == first.geojson
+    assert len(second.deckgl[0]["path"]) == 10
+
+    # Entries are sized from point and track counts, not by serializing the route.
+    assert core.route_cache_stats()["bytes"] == (
+        core.ROUTE_POINT_BYTES * 10 + core.ROUTE_TRACK_BYTES * 2
+    )
+
+    other = generate_routes(request.model_copy(update={"num_waypoints": 5}))
+    assert other.metadata["cache"] == "miss"
+
+    _write_track(tmp_path, points=60)
+    assert generate_routes(request).metadata["cache"] == "miss"
+    stats = core.route_cache_stats()
+    assert stats["hits"] >= 1 and stats["entries"] >= 2
+    clear_caches()
+
+
+def test_payload_cache_evicts_by_bytes() -> None:
+    cache = PayloadCache(max_bytes=10)
+    cache.put("a", 1, 4)
+    cache.put("b", 2, 4)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    cache.put("huge", 4, 11)
+    assert cache.get("huge") is None
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize("length,target", [(10, 3), (101, 20), (1000, 500), (7, 7), (501, 500)])
+def test_numpy_backend_matches_pure_python(monkeypatch, length: int, target: int) -> None:
+    pytest.importorskip("numpy")
+    request = RouteRequest(num_waypoints=target, cruise_velocity_m_s=12.0, climb_rate_m_s=0.5)
+    coords = [[idx * 0.5, idx * 0.25, float(idx % 3)] for idx in range(length)]
+    route = RouteData.from_geojson(
+        {}, [Track.from_feature({"geometry": {"coordinates": coords}, "properties": {}}, 0)]
+    )
+
+    monkeypatch.setenv(vector.NUMPY_ENV, "0")
+    indices = core._select_indices(length, target)
+    surrogate = core._generate_surrogate_path(request)
+    deckgl = core._build_deckgl(route)
+
+    monkeypatch.setenv(vector.NUMPY_ENV, "1")
+    assert vector.numpy_enabled()
+    assert core._select_indices(length, target) == indices
+    fast_coords, fast_times = core._generate_surrogate_path(request)
+    assert fast_times == surrogate[1]
+    for fast, slow in zip(fast_coords, surrogate[0]):
+        assert fast == pytest.approx(slow, rel=1e-12, abs=1e-15)
+    assert core._build_deckgl(route) == deckgl
+
+
+def test_generate_routes_batch_dedupes_loads_and_isolates_errors(
+    tmp_path: Path, monkeypatch
+) -> None:
+    _write_track(tmp_path)
+    broken = routes_dir(tmp_path) / "broken.geojson"
+    broken.write_text(
+        '{"metadata": {"species_code": "broken"}, "features": '
+        '[{"properties": {}, "geometry": {"coordinates": [[0, 0]]}}, {',
+        encoding="utf-8",
+    )
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+
+    calls: list[Path] = []
+    original = core._dataset_route
+
+    def counting(dataset, spec):
+        calls.append(dataset.path)
+        return original(dataset, spec)
+
+    monkeypatch.setattr(core, "_dataset_route", counting)
+    root = str(tmp_path)
+    batch = RouteBatchRequest(
+        requests=[
+            RouteRequest(species_code="grus_grus", data_root=root, num_waypoints=8),
+            RouteRequest(species_code="GRUS_GRUS", data_root=root, num_waypoints=8, label="b"),
+            RouteRequest(species_code="broken", data_root=root),
+            RouteRequest(num_waypoints=4),
+        ],
+        max_workers=4,
+    )
+    results = generate_routes_batch(batch).results
+
+    assert [item.index for item in results] == [0, 1, 2, 3]
+    assert calls.count(routes_dir(tmp_path) / "birdflow" / "grus_grus.geojson") == 1
+    assert results[0].response.geojson == results[1].response.geojson
+    assert results[2].response is None and "RuntimeError" in results[2].error
+    assert results[3].response.metadata["status"] == "surrogate"
+    clear_caches()
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import catalog, datasets, snapshot, watch
+from migration_mcp.core import list_datasets, refresh_datasets
+from migration_mcp.datasets import (
+    BIRDCAST_TILES_SUBDIR,
+    clear_caches,
+    discover_birdcast_tiles,
+    discover_route_datasets,
+    invalidate_paths,
+    route_dataset_index,
+    routes_dir,
+)
+from migration_mcp.models import DatasetQuery
+from migration_mcp.scanner import read_route_header
+from migration_mcp.watch import CatalogWatcher, _inotify_available
+from tests.conftest import write_route
+
+
+def _write_route(path: Path, species: str, points: int = 4) -> None:
+    write_route(path, species=species, points=points)
+
+
+def test_catalog_index_rescans_only_changed_files(tmp_path: Path, monkeypatch) -> None:
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "birdflow" / "grus_grus.geojson", "grus_grus", points=5)
+    _write_route(routes / "stork.geojson", "ciconia_ciconia", points=3)
+    clear_caches()
+
+    mapping = discover_route_datasets(str(tmp_path))
+    assert mapping["grus_grus"][0].point_count == 5
+    assert mapping["grus_grus"][0].source == "birdflow"
+    assert catalog.index_path(routes).exists()
+
+    parsed: list[Path] = []
+    original = catalog.index_file
+
+    def tracking(path: Path, stat: os.stat_result) -> dict:
+        parsed.append(path)
+        return original(path, stat)
+
+    monkeypatch.setattr(catalog, "index_file", tracking)
+    clear_caches()
+    assert set(discover_route_datasets(str(tmp_path))) == {"grus_grus", "ciconia_ciconia"}
+    assert parsed == []
+
+    _write_route(routes / "stork.geojson", "ciconia_ciconia", points=7)
+    clear_caches()
+    mapping = discover_route_datasets(str(tmp_path))
+    assert parsed == [routes / "stork.geojson"]
+    assert mapping["ciconia_ciconia"][0].point_count == 7
+    clear_caches()
+
+
+def test_concurrent_index_writers_use_their_own_temp_files(tmp_path: Path, monkeypatch) -> None:
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "crane.geojson", "grus_grus")
+    _write_route(routes / "stork.geojson", "ciconia_ciconia")
+    temps: list[Path] = []
+    original = Path.write_text
+
+    def tracking(self: Path, *args, **kwargs):
+        temps.append(self)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "write_text", tracking)
+    threads = [
+        threading.Thread(target=catalog.update_routes, args=(routes, [routes / "crane.geojson"])),
+        threading.Thread(target=catalog.scan_routes, args=(routes,)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stat = (routes / "crane.geojson").stat()
+    catalog.store_extents(routes, {routes / "crane.geojson": (stat, None)})
+
+    assert len({path.name for path in temps}) == len(temps) == 3
+    assert set(catalog.load_index(routes)) == {"crane.geojson", "stork.geojson"}
+    assert set(catalog.stored_extents(routes)) == {"crane.geojson"}
+    assert sorted(path.name for path in routes.iterdir() if path.name.startswith(".")) == [
+        ".route-catalog.json",
+        ".route-extents.json",
+    ]
+
+
+@pytest.mark.parametrize("body", ["{not json", "[]"])
+def test_catalog_index_skips_invalid_files(tmp_path: Path, body: str) -> None:
+    routes = routes_dir(tmp_path)
+    routes.mkdir(parents=True)
+    (routes / "broken.geojson").write_text(body, encoding="utf-8")
+    entries = catalog.scan_routes(routes)
+    assert entries == []
+    assert catalog.load_index(routes)["broken.geojson"]["invalid"] is True
+
+
+def test_route_header_stops_after_first_feature(tmp_path: Path) -> None:
+    path = tmp_path / "track.geojson"
+    # Everything after the first feature is deliberately malformed: the scanner must
+    # never reach it once metadata and the first feature have been seen.
+    path.write_text(
+        '{"type": "FeatureCollection", "metadata": {"species_code": "GRUS"},'
+        ' "features": [{"type": "Feature", "geometry": {"type": "LineString",'
+        ' "coordinates": [[1.0, 2.0, 3.0], [4.0, 5.0], [6, 7]]},'
+        ' "properties": {"label": "a \\"quoted\\" ]name", "taxon": "x"}},'
+        " {this is not json",
+        encoding="utf-8",
+    )
+    header = read_route_header(path)
+    assert header.metadata == {"species_code": "GRUS"}
+    assert header.properties == {"label": 'a "quoted" ]name', "taxon": "x"}
+    assert header.point_count == 3
+
+
+@pytest.mark.parametrize(
+    ("coordinates", "expected"),
+    [
+        ("[\n  [1.5, -2e-3],\n  [3, 4]\n]", 2),
+        ("[[1, 2, 3]]", 1),
+        ("[[[0, 0], [1, 1]], [[2, 2]]]", 2),
+        ("[[0, 0], [null, 1]]", 2),
+        ("[]", 0),
+    ],
+)
+def test_route_header_counts_points_in_bulk(tmp_path: Path, coordinates: str, expected) -> None:
+    path = tmp_path / "track.geojson"
+    path.write_text(
+        '{"features": [{"geometry": {"coordinates": ' + coordinates + '}, "properties": {"a": 1}}],'
+        ' "metadata": {"species_code": "grus_grus"}}',
+        encoding="utf-8",
+    )
+    header = read_route_header(path)
+    assert header.point_count == expected
+    assert header.properties == {"a": 1}
+    assert header.metadata == {"species_code": "grus_grus"}
+
+
+def test_route_header_reads_trailing_metadata(tmp_path: Path) -> None:
+    path = tmp_path / "track.geojson"
+    payload = {
+        "features": [
+            {"properties": {}, "geometry": {"coordinates": [[0, 0]]}},
+            {"properties": {}, "geometry": {"coordinates": [[1, 1], [2, 2]]}},
+        ],
+        "metadata": {"study_id": "123"},
+    }
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    header = read_route_header(path)
+    assert header.metadata == {"study_id": "123"}
+    assert header.point_count == 1
+    assert catalog.extract_species_code(path, header.as_payload()) == "track"
+
+
+def test_invalidate_paths_patches_single_species(tmp_path: Path, monkeypatch) -> None:
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "a.geojson", "alpha")
+    _write_route(routes / "b.geojson", "beta")
+    clear_caches()
+    before = discover_route_datasets(str(tmp_path))
+
+    parsed: list[Path] = []
+    original = catalog.index_file
+    monkeypatch.setattr(
+        catalog, "index_file", lambda path, stat: parsed.append(path) or original(path, stat)
+    )
+    _write_route(routes / "birdflow" / "c.geojson", "alpha", points=9)
+    (routes / "b.geojson").unlink()
+    invalidate_paths([routes / "birdflow" / "c.geojson", routes / "b.geojson"])
+
+    after = discover_route_datasets(str(tmp_path))
+    assert parsed == [routes / "birdflow" / "c.geojson"]
+    assert [item.path.name for item in after["alpha"]] == ["c.geojson", "a.geojson"]
+    assert "beta" not in after
+    assert "beta" in before  # earlier snapshots are never mutated
+    clear_caches()
+
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_catalog_watcher_picks_up_new_routes(tmp_path: Path, backend: str) -> None:
+    if backend == "inotify" and not _inotify_available():
+        pytest.skip("inotify is not available on this platform")
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "a.geojson", "alpha")
+    (tmp_path / BIRDCAST_TILES_SUBDIR).mkdir(parents=True)
+    clear_caches()
+    assert set(discover_route_datasets(str(tmp_path))) == {"alpha"}
+
+    watcher = CatalogWatcher(tmp_path, interval=0.05, backend=backend)
+    watcher.start()
+    try:
+        assert watcher.wait_ready(5)
+        _write_route(routes / "birdflow" / "grus.geojson", "grus_grus")
+        deadline = time.monotonic() + 5
+        while "grus_grus" not in discover_route_datasets(str(tmp_path)):
+            assert time.monotonic() < deadline, "watcher did not pick up the new route"
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+        clear_caches()
+
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_catalog_watcher_drops_routes_of_a_moved_away_directory(
+    tmp_path: Path, backend: str
+) -> None:
+    if backend == "inotify" and not _inotify_available():
+        pytest.skip("inotify is not available on this platform")
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "a.geojson", "alpha")
+    _write_route(routes / "birdflow" / "grus.geojson", "grus_grus")
+    (tmp_path / BIRDCAST_TILES_SUBDIR).mkdir(parents=True)
+    clear_caches()
+    assert set(discover_route_datasets(str(tmp_path))) == {"alpha", "grus_grus"}
+
+    watcher = CatalogWatcher(tmp_path, interval=0.05, backend=backend)
+    watcher.start()
+    try:
+        assert watcher.wait_ready(5)
+        (routes / "birdflow").rename(tmp_path / "archived")
+        deadline = time.monotonic() + 5
+        while "grus_grus" in discover_route_datasets(str(tmp_path)):
+            assert time.monotonic() < deadline, "watcher kept the removed directory's route"
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+        clear_caches()
+
+
+def test_catalog_watcher_overflow_notifies_other_workers(tmp_path: Path, monkeypatch) -> None:
+    published: list[bool] = []
+    monkeypatch.setattr(watch, "publish_change", lambda: published.append(True))
+    watcher = CatalogWatcher(tmp_path, backend="poll")
+    watcher._dispatch(None, [(None, watch._IN_Q_OVERFLOW)])
+    assert published == [True]
+
+
+@pytest.fixture()
+def staged_root(tmp_path: Path) -> Iterator[Path]:
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "birdflow" / "grus_grus.geojson", "grus_grus")
+    for name in ("a", "b", "c"):
+        _write_route(routes / f"crane_{name}.geojson", "grus_grus")
+    _write_route(routes / "stork.geojson", "ciconia_ciconia")
+    _write_route(routes / "goose.geojson", "anser_anser")
+    clear_caches()
+    yield tmp_path
+    clear_caches()
+
+
+def test_list_datasets_filters_by_species_and_source(staged_root: Path) -> None:
+    page = list_datasets(staged_root, DatasetQuery(species=["GRUS_GRUS"], source="birdflow"))
+    assert [Path(item["path"]).name for item in page["datasets"]] == ["grus_grus.geojson"]
+    assert page["next_cursor"] is None
+
+    page = list_datasets(staged_root, DatasetQuery(species="ciconia_ciconia,anser_anser"))
+    assert [item["species_code"] for item in page["datasets"]] == ["anser_anser", "ciconia_ciconia"]
+
+
+def test_list_datasets_pages_with_projection(staged_root: Path) -> None:
+    query = DatasetQuery(limit=2, fields=["species_code", "path"])
+    names: list[str] = []
+    while True:
+        page = list_datasets(staged_root, query)
+        assert all(set(item) == {"species_code", "path"} for item in page["datasets"])
+        names.extend(Path(item["path"]).name for item in page["datasets"])
+        if page["next_cursor"] is None:
+            break
+        query = query.model_copy(update={"cursor": page["next_cursor"]})
+    assert names == [
+        "goose.geojson",
+        "stork.geojson",
+        "grus_grus.geojson",
+        "crane_a.geojson",
+        "crane_b.geojson",
+        "crane_c.geojson",
+    ]
+
+
+def test_dataset_index_is_cached_until_catalog_changes(staged_root: Path) -> None:
+    index = route_dataset_index(str(staged_root))
+    assert route_dataset_index(str(staged_root)) is index
+    assert len(index) == 6
+    clear_caches(str(staged_root))
+    assert route_dataset_index(str(staged_root)) is not index
+
+
+def test_catalog_snapshot_skips_the_scan_until_a_directory_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setenv(snapshot.SNAPSHOT_ENV, "1")
+    routes = routes_dir(tmp_path)
+    _write_route(routes / "birdflow" / "grus_grus.geojson", "grus_grus", points=5)
+    tile = tmp_path / BIRDCAST_TILES_SUBDIR / "2024-04-01" / "density" / "2" / "1" / "3.png"
+    tile.parent.mkdir(parents=True)
+    tile.write_bytes(b"png")
+    clear_caches()
+    scanned = discover_route_datasets(str(tmp_path))
+    tiles = discover_birdcast_tiles(str(tmp_path))
+    assert snapshot.snapshot_path(tmp_path).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("catalog was rescanned")
+
+    clear_caches()
+    with monkeypatch.context() as patch:
+        patch.setattr(datasets, "scan_routes", fail)
+        assert discover_route_datasets(str(tmp_path)) == scanned
+    assert discover_birdcast_tiles(str(tmp_path)) == tiles
+    assert tiles[0].x == 1 and tiles[0].y == 3
+
+    _write_route(routes / "stork.geojson", "ciconia_ciconia", points=3)
+    clear_caches()
+    assert set(discover_route_datasets(str(tmp_path))) == {"grus_grus", "ciconia_ciconia"}
+
+    # In-place rewrites keep the directory mtime: served from the snapshot until a refresh.
+    _write_route(routes / "stork.geojson", "ciconia_ciconia", points=7)
+    clear_caches()
+    assert discover_route_datasets(str(tmp_path))["ciconia_ciconia"][0].point_count == 3
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    refresh_datasets(None, None)
+    assert discover_route_datasets(str(tmp_path))["ciconia_ciconia"][0].point_count == 7
+    clear_caches()
+
+
+def test_invalidated_paths_discard_the_catalog_snapshot(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(snapshot.SNAPSHOT_ENV, "1")
+    routes = routes_dir(tmp_path)
+    path = routes / "stork.geojson"
+    _write_route(path, "ciconia_ciconia", points=3)
+    clear_caches()
+    discover_route_datasets(str(tmp_path))
+    assert snapshot.snapshot_path(tmp_path).exists()
+
+    # An in-place rewrite keeps the directory mtime, so only invalidation catches it.
+    _write_route(path, "ciconia_ciconia", points=7)
+    assert invalidate_paths([path])
+    assert not snapshot.snapshot_path(tmp_path).exists()
+    clear_caches()
+    assert discover_route_datasets(str(tmp_path))["ciconia_ciconia"][0].point_count == 7
+    clear_caches()
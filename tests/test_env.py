@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from migration_mcp.env import env_flag, env_int
+
+
+@pytest.mark.parametrize(
+    ("value", "on_by_default", "off_by_default"),
+    [
+        (None, True, False),
+        ("", True, False),
+        (" OFF ", False, False),
+        ("0", False, False),
+        ("Yes", True, True),
+        ("1", True, True),
+        ("maybe", True, False),
+    ],
+)
+def test_env_flag(
+    value: str | None, on_by_default: bool, off_by_default: bool, monkeypatch
+) -> None:
+    if value is None:
+        monkeypatch.delenv("MIGRATION_TEST_FLAG", raising=False)
+    else:
+        monkeypatch.setenv("MIGRATION_TEST_FLAG", value)
+    assert env_flag("MIGRATION_TEST_FLAG", True) is on_by_default
+    assert env_flag("MIGRATION_TEST_FLAG", False) is off_by_default
+
+
+@pytest.mark.parametrize(("value", "expected"), [(None, 7), ("12", 12), ("-3", 0), ("many", 7)])
+def test_env_int(value: str | None, expected: int, monkeypatch) -> None:
+    if value is None:
+        monkeypatch.delenv("MIGRATION_TEST_INT", raising=False)
+    else:
+        monkeypatch.setenv("MIGRATION_TEST_INT", value)
+    assert env_int("MIGRATION_TEST_INT", 7, minimum=0) == expected
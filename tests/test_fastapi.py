@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import json
+
 from fastapi.testclient import TestClient
 
+from migration_mcp import warmup
 from migration_mcp.fastapi_app import create_app
+from tests.conftest import write_route
 
 
 def test_routes_endpoint() -> None:
@@ -12,3 +16,155 @@ def test_routes_endpoint() -> None:
     payload = response.json()
     assert payload["metadata"]["status"] == "surrogate"
     assert len(payload["geojson"]["features"]) == 1
+
+
+def test_routes_batch_endpoint() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/routes/batch",
+        json={"requests": [{"num_waypoints": 4}, {"num_waypoints": 5, "label": "second"}]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1]
+    assert all(item["error"] is None for item in results)
+    coords = results[1]["response"]["geojson"]["features"][0]["geometry"]["coordinates"]
+    assert len(coords) == 5
+
+
+def test_warmup_endpoint_reports_progress(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    monkeypatch.setenv(warmup.WARMUP_SPECIES_ENV, "grus_grus")
+    monkeypatch.setenv(warmup.WARMUP_DAYS_ENV, "0")
+    monkeypatch.setattr(warmup, "ensure_birdflow_route", lambda species, root: None)
+
+    assert TestClient(create_app()).get("/admin/warmup").json() == {"state": "disabled"}
+    app = create_app(warmup=True)
+    with TestClient(app) as client:
+        assert app.state.warmup.wait(5)
+        progress = client.get("/admin/warmup").json()
+    assert progress["state"] == "done"
+    assert progress["failed"] == ["birdflow:grus_grus"]
+
+
+def test_limits_endpoint_reports_per_endpoint_queues(monkeypatch) -> None:
+    monkeypatch.setenv("MIGRATION_LIMIT_ROUTES", "3")
+    app = create_app(limits={"catalog": 2})
+    client = TestClient(app)
+    assert client.post("/routes", json={"num_waypoints": 4}).status_code == 200
+    limits = client.get("/admin/limits").json()
+    assert limits["routes"]["limit"] == 3
+    assert limits["catalog"]["limit"] == 2
+    assert limits["routes"]["completed"] == 1
+    assert limits["routes"]["active"] == limits["routes"]["queued"] == 0
+
+
+def test_tiles_endpoint_filters_and_paginates(tmp_path, monkeypatch) -> None:
+    from migration_mcp.datasets import BIRDCAST_TILES_SUBDIR, clear_caches
+
+    for x in range(3):
+        path = tmp_path / BIRDCAST_TILES_SUBDIR / "2024-05-01" / "summary" / "3" / str(x) / "2.png"
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"png")
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    clear_caches()
+    client = TestClient(create_app())
+
+    page = client.get("/tiles", params={"date_from": "2024-05-01", "limit": 2}).json()
+    assert [tile["x"] for tile in page["tiles"]] == [0, 1]
+    rest = client.get("/tiles", params={"cursor": page["next_cursor"]}).json()
+    assert [tile["x"] for tile in rest["tiles"]] == [2]
+    assert rest["next_cursor"] is None
+    assert client.get("/tiles", params={"x_min": 2}).json()["tiles"][0]["x"] == 2
+    assert client.get("/tiles", params={"bbox": "-180,-85,180,85"}).json()["tiles"]
+    assert client.get("/tiles", params={"cursor": "bogus"}).status_code == 400
+    clear_caches()
+
+
+def test_datasets_endpoint_projects_fields(tmp_path, monkeypatch) -> None:
+    from migration_mcp.datasets import clear_caches, routes_dir
+
+    for name in ("grus_grus", "anser_anser"):
+        path = routes_dir(tmp_path) / f"{name}.geojson"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"type": "FeatureCollection", "metadata": {"species_code": name}, "features": []}
+        path.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    clear_caches()
+    client = TestClient(create_app())
+
+    page = client.get("/datasets", params={"fields": "species_code,source", "limit": 1}).json()
+    assert page["datasets"] == [{"species_code": "anser_anser", "source": "geojson"}]
+    assert page["next_cursor"]
+    assert client.get("/datasets", params={"fields": "bogus"}).status_code == 422
+    assert client.get("/datasets", params={"cursor": "bogus"}).status_code == 400
+    clear_caches()
+
+
+def test_routes_endpoint_streams_ndjson_and_geojson(tmp_path, monkeypatch) -> None:
+    from migration_mcp.datasets import clear_caches, routes_dir
+
+    count = 2500
+    write_route(
+        routes_dir(tmp_path) / "grus_grus.geojson",
+        coordinates=[[idx * 0.01, 50.0, 100.0] for idx in range(count)],
+        properties={"label": "crane"},
+    )
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    clear_caches()
+    client = TestClient(create_app())
+    body = {"species_code": "grus_grus", "num_waypoints": 500, "resample_mode": "arc_length"}
+
+    response = client.post("/routes", params={"stream": "ndjson", "batch_points": 200}, json=body)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["type"] == "header"
+    assert lines[0]["metadata"]["status"] == "dataset"
+    assert lines[-1] == {"type": "end", "count": 500}
+    batches = [line for line in lines if line["type"] == "batch"]
+    assert [batch["offset"] for batch in batches] == [0, 200, 400]
+    streamed = [coord for batch in batches for coord in batch["coordinates"]]
+
+    buffered = client.post("/routes", json=body).json()["geojson"]
+    assert streamed == buffered["features"][0]["geometry"]["coordinates"]
+
+    response = client.post("/routes", params={"stream": "geojson", "batch_points": 64}, json=body)
+    assert response.headers["content-type"].startswith("application/geo+json")
+    document = response.json()
+    assert document["metadata"]["species_code"] == "grus_grus"
+    assert document["metadata"]["route"]["status"] == "dataset"
+    assert document["features"] == buffered["features"]
+    clear_caches()
+
+
+def test_routes_endpoint_negotiates_compact_formats() -> None:
+    from migration_mcp.wire import DECKGL_MEDIA_TYPE, decode_deckgl_binary
+
+    client = TestClient(create_app())
+    body = {"num_waypoints": 200}
+
+    response = client.post("/routes", json=body, headers={"Accept": DECKGL_MEDIA_TYPE})
+    assert response.headers["content-type"] == DECKGL_MEDIA_TYPE
+    layer = decode_deckgl_binary(response.content)
+    assert layer["attributes"]["getPath"]["length"] == 200
+    assert layer["metadata"]["status"] == "surrogate"
+
+    response = client.post("/routes", params={"include": "geojson"}, json=body)
+    assert response.json()["deckgl"] == []
+    assert len(response.json()["geojson"]["features"][0]["geometry"]["coordinates"]) == 200
+
+    response = client.post("/routes", json=body, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["metadata"]["status"] == "surrogate"
+
+
+def test_metrics_endpoint() -> None:
+    client = TestClient(create_app())
+    client.post("/routes", json={"num_waypoints": 6})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'migration_stage_seconds_count{stage="serialize"}' in body
+    assert "# TYPE migration_route_cache_hits_total counter" in body
+    assert 'migration_limiter_completed_total{endpoint="routes"}' in body
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from migration_mcp import metrics
+from migration_mcp.core import generate_routes
+from migration_mcp.models import RouteRequest
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = metrics.Registry(buckets=(0.1, 1.0))
+    registry.inc("migration_routes_total", status="dataset", cache="hit")
+    registry.inc("migration_routes_total", 2, status="dataset", cache="hit")
+    registry.observe("migration_stage_seconds", 0.05, stage="resample")
+    registry.observe("migration_stage_seconds", 0.5, stage="resample")
+    registry.observe("migration_stage_seconds", 5.0, stage="resample")
+
+    text = registry.render([("migration_route_cache_entries", "gauge", {}, 4)])
+    lines = text.splitlines()
+    assert "# TYPE migration_routes_total counter" in lines
+    assert 'migration_routes_total{cache="hit",status="dataset"} 3' in lines
+    assert "# TYPE migration_stage_seconds histogram" in lines
+    assert 'migration_stage_seconds_bucket{stage="resample",le="0.1"} 1' in lines
+    assert 'migration_stage_seconds_bucket{stage="resample",le="1"} 2' in lines
+    assert 'migration_stage_seconds_bucket{stage="resample",le="+Inf"} 3' in lines
+    assert 'migration_stage_seconds_count{stage="resample"} 3' in lines
+    assert "migration_route_cache_entries 4" in lines
+
+
+def test_label_values_are_escaped() -> None:
+    registry = metrics.Registry()
+    registry.inc("migration_test_total", source='a"b\\c\nd')
+    assert 'migration_test_total{source="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_spans_feed_registry_and_collection(monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "REGISTRY", metrics.Registry())
+    with metrics.collect() as timings:
+        with metrics.span("resample"):
+            pass
+        with metrics.span("resample"):
+            pass
+    with metrics.span("resample"):
+        pass
+
+    assert set(timings) == {"resample"}
+    assert metrics.REGISTRY.value("migration_stage_seconds", stage="resample") == 3
+
+
+def test_disabled_metrics_record_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "REGISTRY", metrics.Registry())
+    monkeypatch.setenv(metrics.METRICS_ENV, "0")
+    with metrics.span("resample"):
+        pass
+    metrics.count("migration_routes_total", status="surrogate")
+    with metrics.collect() as timings, metrics.span("discover"):
+        pass
+
+    assert metrics.REGISTRY.render() == "\n"
+    assert set(timings) == {"discover"}
+
+
+def test_route_timings_and_outcomes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "REGISTRY", metrics.Registry())
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+
+    plain = generate_routes(RouteRequest(num_waypoints=5))
+    timed = generate_routes(
+        RouteRequest(species_code="unknown_bird", num_waypoints=5, timings=True),
+        fetch_missing=False,
+    )
+
+    assert "timings_ms" not in plain.metadata
+    assert {"discover", "surrogate", "geojson", "build_deckgl"} <= set(timed.metadata["timings_ms"])
+    registry = metrics.REGISTRY
+    assert registry.value("migration_routes_total", status="surrogate", cache="none") == 1
+    assert registry.value("migration_routes_total", status="fallback", cache="none") == 1
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import core, vector
+from migration_mcp.columnar import sidecar_path, wait_for_compiles
+from migration_mcp.core import _select_indices, generate_routes
+from migration_mcp.datasets import clear_caches, routes_dir
+from migration_mcp.models import RouteRequest
+from migration_mcp.resampling import (
+    ResampleSpec,
+    arc_length_from_distances,
+    arc_length_indices,
+    cumulative_distances,
+    douglas_peucker_indices,
+    douglas_peucker_ranking,
+    ranked_indices,
+    select_indices,
+    time_interval_indices,
+)
+from tests.conftest import write_route
+
+
+def test_arc_length_spreads_points_over_distance() -> None:
+    # 90 points bunched in a stopover near the origin, then 10 long flight legs.
+    lon = [idx * 1e-5 for idx in range(90)] + [float(leg) for leg in range(1, 11)]
+    lat = [0.0] * 100
+    indices = arc_length_indices(lon, lat, 11)
+    assert indices == [0, *range(90, 100)]
+    evenly = _select_indices(100, 11)
+    assert sum(idx >= 90 for idx in evenly) < 3
+
+
+def test_douglas_peucker_keeps_corners_and_honours_tolerance() -> None:
+    lon = [0.0, 0.5, 1.0, 1.0, 1.0, 1.0001]
+    lat = [0.0, 0.0, 0.0, 0.5, 1.0, 1.0]
+    assert douglas_peucker_indices(lon, lat, 3, None) == [0, 2, 5]
+    assert douglas_peucker_indices(lon, lat, 10, 1.0) == [0, 2, 4, 5]
+    assert douglas_peucker_indices(lon, lat, 10, 1e9) == [0, 5]
+
+
+def test_douglas_peucker_ranking_prefixes_are_levels() -> None:
+    lon = [idx * 0.01 * (1 + idx % 7) for idx in range(120)]
+    lat = [(idx % 13) * 0.02 for idx in range(120)]
+    order, ranks = douglas_peucker_ranking(lon, lat, 118)
+    assert sorted(order) == list(range(1, 119))
+    assert ranks == sorted(ranks, reverse=True)
+    for target in (2, 3, 10, 50, 200):
+        for tolerance in (None, 100.0, 1000.0):
+            assert ranked_indices(order, ranks, 120, target, tolerance) == (
+                douglas_peucker_indices(lon, lat, target, tolerance)
+            )
+
+
+def test_douglas_peucker_ranking_numpy_matches_pure_python(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    lon = [idx * 1e-3 * (1 + idx % 11) for idx in range(2000)]
+    lat = [(idx % 17) * 0.01 - (idx % 5) * 0.003 for idx in range(2000)]
+    monkeypatch.setenv(vector.NUMPY_ENV, "0")
+    expected = douglas_peucker_ranking(lon, lat, 300)
+    monkeypatch.setenv(vector.NUMPY_ENV, "1")
+    assert douglas_peucker_ranking(lon, lat, 300) == expected
+
+
+def test_arc_length_from_distance_slices() -> None:
+    lon = [idx * 1e-5 for idx in range(90)] + [float(leg) for leg in range(1, 11)]
+    lat = [0.0] * 100
+    cumulative = cumulative_distances(lon, lat)
+    assert arc_length_from_distances(cumulative, 11) == arc_length_indices(lon, lat, 11)
+    assert arc_length_from_distances(cumulative[89:], 5) == arc_length_indices(
+        lon[89:], lat[89:], 5
+    )
+    assert arc_length_from_distances(cumulative[:1], 5) is None
+
+
+def test_time_interval_picks_first_point_per_tick() -> None:
+    seconds = [0, 1, 2, 3, 50, 51, 100, 160, 170, 300]
+    assert time_interval_indices(seconds, 20, 60.0, _select_indices) == [0, 6, 7, 9]
+    capped = time_interval_indices(seconds, 3, 1.0, _select_indices)
+    assert capped is not None and len(capped) == 3 and capped[0] == 0 and capped[-1] == 9
+
+
+def test_time_interval_falls_back_without_timestamps() -> None:
+    spec = ResampleSpec(target=5, mode="time_interval", interval_s=10.0)
+    indices = select_indices(spec, 50, lambda: ([], []), None, _select_indices)
+    assert indices == _select_indices(50, 5)
+
+
+@pytest.mark.parametrize("mode", ["arc_length", "douglas_peucker", "time_interval"])
+def test_resample_modes_match_between_geojson_and_columnar(tmp_path: Path, mode: str) -> None:
+    coords = [[idx * 0.01 * (1 + idx % 7), (idx % 13) * 0.02, 100.0] for idx in range(200)]
+    timestamps = [f"2010-09-{1 + idx // 24:02d}T{idx % 24:02d}:00:00Z" for idx in range(200)]
+    path = write_route(
+        routes_dir(tmp_path) / "grus_grus.geojson", coordinates=coords, timestamps=timestamps
+    )
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(
+        species_code="grus_grus", data_root=str(tmp_path), num_waypoints=12, resample_mode=mode
+    )
+
+    first = generate_routes(request)
+    wait_for_compiles()
+    assert sidecar_path(path).exists()
+    core.ROUTE_CACHE.clear()
+    second = generate_routes(request)
+    assert first.metadata["resample_mode"] == mode
+    assert first.geojson == second.geojson
+    kept = first.geojson["features"][0]["geometry"]["coordinates"]
+    assert 2 <= len(kept) <= 12
+    assert list(kept[0]) == coords[0] and list(kept[-1]) == coords[-1]
+    clear_caches()
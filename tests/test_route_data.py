@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import core
+from migration_mcp.core import generate_routes
+from migration_mcp.datasets import clear_caches, routes_dir
+from migration_mcp.models import RouteRequest
+from migration_mcp.resampling import ResampleSpec
+from migration_mcp.route_data import RouteData, Track
+from tests.conftest import route_payload
+
+
+def _payload() -> dict:
+    return route_payload(
+        coordinates=[[idx * 0.5, idx * 0.25, 10.0] for idx in range(10)],
+        properties={"label": "crane"},
+        metadata={"tags": ["a"]},
+    )
+
+
+def test_views_share_arrays_without_exposing_state() -> None:
+    payload = _payload()
+    route = core._resample_geojson(payload, ResampleSpec(4))
+    assert payload == _payload()
+
+    first, second = route.geojson(), route.geojson()
+    assert first == second and first is not second
+    track = route.tracks[0]
+    assert first["features"][0]["geometry"]["coordinates"] is track.coordinates
+    assert route.tracks[0].deckgl()["path"] is track.path
+
+    first["metadata"]["tags"] = ["changed"]
+    first["features"][0]["properties"]["label"] = "changed"
+    assert route.geojson() == second
+    with pytest.raises(TypeError):
+        route.skeleton["metadata"]["species_code"] = "changed"
+
+
+def test_cached_routes_survive_response_mutation(tmp_path: Path) -> None:
+    path = routes_dir(tmp_path) / "grus_grus.geojson"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(_payload()), encoding="utf-8")
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(species_code="grus_grus", data_root=str(tmp_path), num_waypoints=4)
+
+    first = generate_routes(request)
+    first.geojson["features"].clear()
+    first.deckgl[0]["label"] = "changed"
+    second = generate_routes(request)
+    assert second.metadata["cache"] == "hit"
+    assert len(second.geojson["features"][0]["geometry"]["coordinates"]) == 4
+    assert second.deckgl[0]["label"] == "crane"
+    clear_caches()
+
+
+def test_features_without_coordinates_pass_through() -> None:
+    feature = {"type": "Feature", "properties": {"note": "x"}, "geometry": None}
+    route = RouteData.from_geojson({"features": [feature]}, [Track.from_feature(feature, 0)])
+    assert route.geojson() == {"features": [feature]}
+    assert core._build_deckgl(route) == []
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import core, serve
+from migration_mcp.__main__ import main
+from migration_mcp.columnar import sidecar_path
+from migration_mcp.datasets import (
+    _ROUTE_CACHE,
+    clear_caches,
+    discover_route_datasets,
+    invalidate_paths,
+    routes_dir,
+)
+from migration_mcp.shared import SHARED_STATE_ENV, CatalogGeneration, publish_change
+from tests.conftest import write_route
+
+
+def _write_route(root: Path, species: str) -> Path:
+    return write_route(routes_dir(root) / f"{species}.geojson", species=species, points=3)
+
+
+def test_generation_reports_changes_from_other_processes(tmp_path: Path) -> None:
+    ours = CatalogGeneration(tmp_path / "generation")
+    theirs = CatalogGeneration(tmp_path / "generation")
+    assert not ours.changed()
+    theirs.bump()
+    assert not theirs.changed()
+    assert ours.changed()
+    assert not ours.changed()
+    ours.close()
+    theirs.close()
+
+
+def test_concurrent_bumps_are_neither_lost_nor_hidden(tmp_path: Path) -> None:
+    generations = [CatalogGeneration(tmp_path / "generation") for _ in range(4)]
+    threads = [
+        threading.Thread(target=lambda g=generation: [g.bump() for _ in range(250)])
+        for generation in generations
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert generations[0].value == 1000
+
+    ours, theirs = generations[:2]
+    ours.changed()
+    theirs.changed()
+    theirs.bump()
+    ours.bump()
+    # Bumping ours must not swallow the sibling's change.
+    assert ours.changed()
+    assert theirs.changed()
+    for generation in generations:
+        generation.close()
+
+
+def test_unchanged_catalog_entries_are_not_published(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(SHARED_STATE_ENV, str(tmp_path / "generation"))
+    sibling = CatalogGeneration(tmp_path / "generation")
+    root = tmp_path / "data"
+    existing = _write_route(root, "grus_grus")
+    clear_caches()
+    discover_route_datasets(str(root))
+
+    assert not invalidate_paths([existing])
+    assert not sibling.changed()
+
+    added = _write_route(root, "ciconia_ciconia")
+    assert invalidate_paths([added])
+    assert sibling.changed()
+    sibling.close()
+    clear_caches()
+
+
+def test_workers_drop_catalogs_after_a_sibling_refresh(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(SHARED_STATE_ENV, str(tmp_path / "generation"))
+    root = tmp_path / "data"
+    _write_route(root, "grus_grus")
+    clear_caches()
+    assert list(discover_route_datasets(str(root))) == ["grus_grus"]
+    assert not core.sync_shared_catalog()
+
+    # Another worker fetches a route and publishes the change.
+    _write_route(root, "ciconia_ciconia")
+    CatalogGeneration(tmp_path / "generation").bump()
+    assert core.sync_shared_catalog()
+    assert str(root) not in _ROUTE_CACHE
+    assert sorted(discover_route_datasets(str(root))) == ["ciconia_ciconia", "grus_grus"]
+
+    # Changes made by this process are not reported back to it.
+    publish_change()
+    assert not core.sync_shared_catalog()
+    clear_caches()
+
+
+def test_serve_builds_the_catalog_once_and_shares_state(tmp_path: Path, monkeypatch) -> None:
+    uvicorn = pytest.importorskip("uvicorn")
+    path = _write_route(tmp_path, "grus_grus")
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    monkeypatch.delenv(SHARED_STATE_ENV, raising=False)
+    clear_caches()
+    calls: list[tuple[str, dict]] = []
+
+    def run(app: str, **kwargs) -> None:
+        calls.append((app, kwargs))
+        assert Path(os.environ[SHARED_STATE_ENV]).exists()
+        assert os.environ["MIGRATION_WATCH"] == "0"
+
+    monkeypatch.setattr(uvicorn, "run", run)
+    assert main(["serve", "--workers", "3", "--port", "9001"]) == 0
+    assert calls == [
+        (
+            serve.APP_FACTORY,
+            {"factory": True, "host": serve.DEFAULT_HOST, "port": 9001, "workers": 3},
+        )
+    ]
+    assert sidecar_path(path).exists()
+    assert SHARED_STATE_ENV not in os.environ
+    clear_caches()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from migration_mcp import catalog, spatial
+from migration_mcp.core import find_routes
+from migration_mcp.datasets import clear_caches, routes_dir
+from migration_mcp.models import RegionQuery
+from tests.conftest import write_route
+
+
+def _write_track(path: Path, species: str, coords: list[list[float]], start: int = 0) -> None:
+    hourly = [start + 3600 * idx for idx in range(len(coords))]
+    write_route(path, species=species, coordinates=coords, timestamps=hourly)
+
+
+@pytest.fixture()
+def data_root(tmp_path: Path) -> Iterator[Path]:
+    routes = routes_dir(tmp_path)
+    # A crane flying north along 10°E and a stork flying east along 40°N.
+    _write_track(
+        routes / "crane.geojson", "grus_grus", [[10.0, 30.0 + i * 0.2] for i in range(200)]
+    )
+    _write_track(
+        routes / "stork.geojson",
+        "ciconia_ciconia",
+        [[-20.0 + i * 0.25, 40.0] for i in range(200)],
+        start=10_000_000,
+    )
+    clear_caches()
+    yield tmp_path
+    clear_caches()
+
+
+def test_region_query_matches_crossing_routes(data_root: Path) -> None:
+    result = find_routes(RegionQuery(bbox=[5.0, 38.0, 15.0, 42.0]), data_root)
+    assert [route["species_code"] for route in result["routes"]] == [
+        "ciconia_ciconia",
+        "grus_grus",
+    ]
+    crane = result["routes"][1]
+    assert crane["bbox"] == [10.0, 30.0, 10.0, pytest.approx(69.8)]
+
+    result = find_routes(RegionQuery(bbox=[5.0, 55.0, 15.0, 60.0]), data_root)
+    assert [route["species_code"] for route in result["routes"]] == ["grus_grus"]
+    assert find_routes(RegionQuery(bbox=[100.0, 0.0, 110.0, 5.0]), data_root)["routes"] == []
+
+
+def test_time_window_and_clipping(data_root: Path) -> None:
+    query = RegionQuery(bbox=[5.0, 38.0, 15.0, 42.0], time_to="1970-01-03T00:00:00Z", clip=True)
+    result = find_routes(query, data_root)
+    assert [route["species_code"] for route in result["routes"]] == ["grus_grus"]
+    runs = result["routes"][0]["geometry"]["coordinates"]
+    assert len(runs) == 1
+    # Hourly fixes 0.2° apart: hours 40..48 fall inside both the box and the first two days.
+    assert [lat for _, lat in runs[0]] == pytest.approx([38.0 + 0.2 * i for i in range(9)])
+
+    with pytest.raises(ValueError):
+        find_routes(RegionQuery(bbox=[0, 0, 1, 1], time_from="yesterday"), data_root)
+
+
+def test_extents_are_persisted_and_reused(data_root: Path, monkeypatch) -> None:
+    assert len(spatial.spatial_index(str(data_root))) == 2
+    assert set(catalog.stored_extents(routes_dir(data_root))) == {"crane.geojson", "stork.geojson"}
+    assert all(
+        "extent" not in record for record in catalog.load_index(routes_dir(data_root)).values()
+    )
+
+    computed: list[Path] = []
+    monkeypatch.setattr(spatial, "route_extent", lambda path: computed.append(path))
+    spatial._INDEXES.clear()
+    clear_caches()
+    assert len(spatial.spatial_index(str(data_root))) == 2
+    assert computed == []
+
+
+def test_segments_and_clips_stop_at_individual_boundaries() -> None:
+    lon = [0.0, 1.0, 2.0, 10.0, 11.0]
+    extent = spatial.compute_extent(lon, [0.0] * 5, segment_points=2, features=[(0, 3), (3, 2)])
+    assert extent is not None
+    assert [segment[:2] for segment in extent.segments] == [(0, 2), (2, 3), (3, 5)]
+    # The last segment of the first bird does not reach over to the second bird.
+    assert extent.segments[1][2:5:2] == (2.0, 2.0)
+    assert extent.bbox == (0.0, 0.0, 11.0, 0.0)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+
+from migration_mcp.core import stream_route
+from migration_mcp.models import RouteRequest
+from migration_mcp.streaming import RouteStream, encode
+
+
+def test_geojson_encoding_matches_payload_and_closes_stream() -> None:
+    payload = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"timestamps": [0, 1, 2], "label": "x"},
+                "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1], [2, 2]]},
+            }
+        ],
+    }
+    closed: list[bool] = []
+    stream = RouteStream.from_payload(payload, {"status": "test"})
+    stream.close = lambda: closed.append(True)
+
+    document = json.loads(b"".join(encode(stream, "geojson", batch_points=2)))
+    assert document["features"] == payload["features"]
+    assert document["metadata"] == {"route": {"status": "test"}}
+    assert closed == [True]
+
+
+def test_surrogate_route_streams_as_ndjson() -> None:
+    stream = stream_route(RouteRequest(num_waypoints=7))
+    lines = [json.loads(line) for line in b"".join(encode(stream, "ndjson", 3)).splitlines()]
+    assert [line["type"] for line in lines] == ["header", "batch", "batch", "batch", "end"]
+    assert lines[0]["metadata"]["status"] == "surrogate"
+    assert sum(len(line.get("coordinates", [])) for line in lines) == 7
+    assert lines[1]["timestamps"] == [0.0, 1.0, 2.0]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from migration_mcp.core import list_tiles
+from migration_mcp.datasets import (
+    BIRDCAST_TILES_SUBDIR,
+    birdcast_tile_index,
+    clear_caches,
+    invalidate_paths,
+)
+from migration_mcp.models import TileQuery
+from migration_mcp.tile_index import decode_tile_cursor, lonlat_to_tile
+
+
+@pytest.fixture()
+def tiles_root(tmp_path: Path) -> Iterator[Path]:
+    root = tmp_path / BIRDCAST_TILES_SUBDIR
+    for date in ("2024-04-01", "2024-04-02", "2024-04-03"):
+        (root / date / "summary").mkdir(parents=True)
+        (root / date / "summary" / "mosaic.png").write_bytes(b"png")
+        for x in range(4):
+            for y in range(4):
+                path = root / date / "summary" / "2" / str(x) / f"{y}.png"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"png")
+    (root / "2024-04-02" / "density" / "2" / "1").mkdir(parents=True)
+    (root / "2024-04-02" / "density" / "2" / "1" / "1.png").write_bytes(b"png")
+    clear_caches()
+    yield root
+    clear_caches()
+
+
+def test_query_filters_by_date_product_and_xy(tmp_path: Path, tiles_root: Path) -> None:
+    index = birdcast_tile_index(str(tmp_path))
+    assert len(index) == 3 * 17 + 1
+
+    tiles, cursor = index.query(
+        date_from="2024-04-02", date_to="2024-04-02", product="summary", x_range=(1, 2)
+    )
+    assert cursor is None
+    assert {(tile.date, tile.x) for tile in tiles} == {("2024-04-02", 1), ("2024-04-02", 2)}
+    assert len(tiles) == 8
+
+    tiles, _ = index.query(product="density")
+    assert [(tile.x, tile.y) for tile in tiles] == [(1, 1)]
+
+
+def test_bbox_query_keeps_whole_extent_tiles(tmp_path: Path, tiles_root: Path) -> None:
+    # Western Europe at zoom 2 is tile (2, 1).
+    assert lonlat_to_tile(5.0, 48.0, 2) == (2, 1)
+    tiles, _ = birdcast_tile_index(str(tmp_path)).query(
+        date_from="2024-04-01", date_to="2024-04-01", bbox=(0.0, 40.0, 10.0, 55.0)
+    )
+    assert [(tile.level, tile.x, tile.y) for tile in tiles] == [(None, None, None), ("2", 2, 1)]
+
+
+def test_list_tiles_paginates_with_cursor(tmp_path: Path, tiles_root: Path) -> None:
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = list_tiles(tmp_path, TileQuery(limit=10, cursor=cursor))
+        seen.extend(str(tile["path"]) for tile in page["tiles"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 6
+    assert len(seen) == len(set(seen)) == 52
+
+    with pytest.raises(ValueError):
+        decode_tile_cursor("not-a-cursor")
+
+
+def test_cursor_does_not_skip_tiles_sharing_coordinates(tmp_path: Path) -> None:
+    folder = tmp_path / BIRDCAST_TILES_SUBDIR / "2024-05-01" / "summary"
+    (folder / "2" / "1").mkdir(parents=True)
+    for name in ("preview.geojson", "other.png", "2/1/2.png", "2/1/2.tif"):
+        (folder / name).write_bytes(b"tile")
+    clear_caches()
+    index = birdcast_tile_index(str(tmp_path))
+    seen: list[Path] = []
+    after = None
+    while True:
+        tiles, after = index.query(after=after, limit=1)
+        seen.extend(tile.path for tile in tiles)
+        if after is None:
+            break
+    assert len(seen) == len(set(seen)) == 4
+    clear_caches()
+
+
+def test_index_is_rebuilt_after_invalidation(tmp_path: Path, tiles_root: Path) -> None:
+    before = birdcast_tile_index(str(tmp_path))
+    assert birdcast_tile_index(str(tmp_path)) is before
+    path = tiles_root / "2024-04-04" / "summary" / "mosaic.png"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"png")
+    invalidate_paths([path])
+    after = birdcast_tile_index(str(tmp_path))
+    assert after is not before
+    assert after.dates[-1] == "2024-04-04"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from migration_mcp import core
+from migration_mcp.cache import PayloadCache
+from migration_mcp.datasets import birdcast_tiles_dir
+from migration_mcp.fastapi_app import create_app
+from migration_mcp.tile_server import open_tile
+
+
+def _write_tile(root: Path, name: str, body: bytes) -> Path:
+    path = birdcast_tiles_dir(root) / "2024-04-01" / "density" / "3" / "2" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+    return path
+
+
+def test_open_tile_resolves_extensions_and_caches_small_tiles(tmp_path: Path) -> None:
+    _write_tile(tmp_path, "5.png", b"png-bytes")
+    _write_tile(tmp_path, "6.tif", b"tiff" * 10)
+    tiles_root = birdcast_tiles_dir(tmp_path)
+    cache = PayloadCache(1024)
+
+    tile = open_tile(tiles_root, ("2024-04-01", "density", "3", "2", "5"), cache)
+    assert tile is not None and tile.body == b"png-bytes" and tile.media_type == "image/png"
+    assert open_tile(tiles_root, ("2024-04-01", "density", "3", "2", "5.png"), cache).body
+    assert cache.stats()["hits"] == 1
+
+    tiff = open_tile(tiles_root, ("2024-04-01", "density", "3", "2", "6"), cache)
+    assert tiff is not None and tiff.body is None and tiff.media_type == "image/tiff"
+    assert open_tile(tiles_root, ("2024-04-01", "density", "3", "2", "7"), cache) is None
+    assert open_tile(tiles_root, ("..", "density", "3", "2", "5"), cache) is None
+
+
+def test_tile_endpoint_conditional_and_range_requests(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("BIRD_MIGRATION_DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(core, "TILE_CACHE", PayloadCache(1024 * 1024))
+    _write_tile(tmp_path, "5.png", b"\x89PNG tile")
+    _write_tile(tmp_path, "6.tif", bytes(range(256)))
+    client = TestClient(create_app())
+
+    response = client.get("/tiles/2024-04-01/density/3/2/5.png")
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG tile"
+    assert response.headers["content-type"] == "image/png"
+    assert "max-age" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    revalidated = client.get("/tiles/2024-04-01/density/3/2/5", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    since = response.headers["last-modified"]
+    assert (
+        client.get(
+            "/tiles/2024-04-01/density/3/2/5.png", headers={"If-Modified-Since": since}
+        ).status_code
+        == 304
+    )
+    assert (
+        client.get(
+            "/tiles/2024-04-01/density/3/2/5.png", headers={"If-None-Match": '"stale"'}
+        ).status_code
+        == 200
+    )
+
+    ranged = client.get("/tiles/2024-04-01/density/3/2/6.tif", headers={"Range": "bytes=16-31"})
+    assert ranged.status_code == 206
+    assert ranged.content == bytes(range(16, 32))
+    assert ranged.headers["content-range"] == "bytes 16-31/256"
+    assert (
+        ranged.headers["etag"] == client.head("/tiles/2024-04-01/density/3/2/6.tif").headers["etag"]
+    )
+
+    assert client.get("/tiles/2024-04-01/density/3/2/9.png").status_code == 404
+    assert client.get("/tiles/2024-04-01/density/3/2/.hidden").status_code == 404
+    assert client.get("/metrics").text.count("migration_tile_cache_hits_total") == 2
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from migration_mcp import core
+from migration_mcp.core import generate_routes, stream_route
+from migration_mcp.datasets import clear_caches, routes_dir
+from migration_mcp.models import RouteRequest
+from migration_mcp.streaming import encode
+from migration_mcp.time_window import TimeWindow
+from tests.conftest import write_route
+
+DAY = 86_400.0
+
+
+def _epoch(year: int, month: int, day: int = 1) -> float:
+    return datetime(year, month, day, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize(
+    "window",
+    [
+        TimeWindow(start=_epoch(2020, 3, 10)),
+        TimeWindow(end=_epoch(2020, 6, 1)),
+        TimeWindow(_epoch(2020, 2, 1), _epoch(2021, 2, 1), "winter"),
+        TimeWindow(season="spring"),
+        TimeWindow(season="fall"),
+    ],
+)
+def test_bisected_runs_match_a_scan(window: TimeWindow) -> None:
+    seconds = [_epoch(2019, 11) + idx * 3 * DAY for idx in range(300)]
+    runs = window.runs(seconds, ordered=True)
+    assert runs == window.runs(seconds, ordered=False)
+    inside = [idx for start, stop in runs for idx in range(start, stop)]
+    assert inside
+    for idx in inside:
+        month = datetime.fromtimestamp(seconds[idx], timezone.utc).month
+        assert window.season != "winter" or month in (12, 1, 2)
+        assert window.season != "spring" or month in (3, 4, 5)
+        assert window.start is None or seconds[idx] >= window.start
+        assert window.end is None or seconds[idx] <= window.end
+
+    shuffled = seconds[:]
+    random.Random(7).shuffle(shuffled)
+    scanned = window.runs(shuffled, ordered=False)
+    assert sum(stop - start for start, stop in scanned) == len(inside)
+
+
+def test_route_requests_slice_before_resampling(tmp_path: Path) -> None:
+    # Two years of daily fixes; latitude encodes the day index.
+    stamps = [_epoch(2020, 1) + idx * DAY for idx in range(731)]
+    write_route(
+        routes_dir(tmp_path) / "grus_grus.geojson",
+        coordinates=[[0.0, idx * 0.01] for idx in range(731)],
+        timestamps=[
+            datetime.fromtimestamp(value, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            for value in stamps
+        ],
+    )
+    clear_caches()
+    core.ROUTE_CACHE.clear()
+    request = RouteRequest(
+        species_code="grus_grus",
+        data_root=str(tmp_path),
+        num_waypoints=10,
+        time_from="2020-03-01T00:00:00Z",
+        time_to="2020-05-31T00:00:00Z",
+    )
+
+    first = generate_routes(request)  # GeoJSON path; compiles the sidecar
+    core.ROUTE_CACHE.clear()
+    second = generate_routes(request)  # columnar path
+    assert first.geojson == second.geojson
+    feature = second.geojson["features"][0]
+    assert len(feature["geometry"]["coordinates"]) == 10
+    assert feature["properties"]["timestamps"][0] == "2020-03-01T00:00:00Z"
+    assert feature["properties"]["timestamps"][-1] == "2020-05-31T00:00:00Z"
+
+    autumn = generate_routes(
+        RouteRequest(species_code="grus_grus", data_root=str(tmp_path), season="autumn")
+    )
+    months = {stamp[5:7] for stamp in autumn.geojson["features"][0]["properties"]["timestamps"]}
+    assert months <= {"09", "10", "11"}
+
+    empty = request.model_copy(update={"time_from": "2030-01-01", "time_to": None})
+    assert generate_routes(empty).geojson["features"] == []
+    lines = b"".join(encode(stream_route(empty), "ndjson")).splitlines()
+    assert json.loads(lines[-1]) == {"type": "end", "count": 0}
+    clear_caches()
+
+
+def test_invalid_time_bounds_are_rejected() -> None:
+    with pytest.raises(ValidationError):
+        RouteRequest(time_from="last spring")
+    with pytest.raises(ValidationError):
+        RouteRequest(season="monsoon")
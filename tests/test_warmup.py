@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+from migration_mcp import warmup
+from migration_mcp.datasets import birdflow_dir, clear_caches, discover_route_datasets
+from migration_mcp.warmup import WarmupScheduler
+
+
+def _fake_birdflow(species: str, data_root: Path | None = None) -> Path | None:
+    if species == "unknown":
+        return None
+    target = birdflow_dir(data_root) / f"{species}.geojson"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"metadata": {"species_code": species}, "features": []}
+    target.write_text(json.dumps(payload), encoding="utf-8")
+    return target
+
+
+def test_warmup_prefetches_species_and_dates(tmp_path: Path, monkeypatch) -> None:
+    fetched_dates: list[str] = []
+    monkeypatch.setattr(warmup, "ensure_birdflow_route", _fake_birdflow)
+    monkeypatch.setattr(
+        warmup,
+        "ensure_birdcast_tile",
+        lambda value, product, root: fetched_dates.append(value) or None,
+    )
+    clear_caches()
+    scheduler = WarmupScheduler(
+        tmp_path,
+        species=["grus_grus", "unknown"],
+        days=2,
+        today=date(2026, 4, 2),
+        max_workers=2,
+    )
+    assert scheduler.progress()["state"] == "pending"
+    scheduler.start()
+    assert scheduler.wait(5)
+
+    progress = scheduler.progress()
+    assert progress["state"] == "done"
+    assert progress["total"] == progress["completed"] == 4
+    assert sorted(fetched_dates) == ["2026-04-01", "2026-04-02"]
+    assert sorted(progress["failed"]) == [
+        "birdcast:2026-04-01",
+        "birdcast:2026-04-02",
+        "birdflow:unknown",
+    ]
+    assert "grus_grus" in discover_route_datasets(str(tmp_path))
+    clear_caches()
+
+
+def test_warmup_records_task_errors_and_keeps_going(tmp_path: Path, monkeypatch) -> None:
+    def broken(value: str, product: str, root: Path) -> Path | None:
+        raise RuntimeError(f"bad payload for {value}")
+
+    monkeypatch.setattr(warmup, "ensure_birdflow_route", _fake_birdflow)
+    monkeypatch.setattr(warmup, "ensure_birdcast_tile", broken)
+    clear_caches()
+    scheduler = WarmupScheduler(
+        tmp_path, species=["grus_grus"], days=1, today=date(2026, 4, 2), max_workers=1
+    )
+    scheduler.start()
+    assert scheduler.wait(5)
+
+    progress = scheduler.progress()
+    assert progress["state"] == "done" and progress["completed"] == 2
+    assert progress["failed"] == ["birdcast:2026-04-02"]
+    assert progress["errors"] == {"birdcast:2026-04-02": "RuntimeError: bad payload for 2026-04-02"}
+    assert "grus_grus" in discover_route_datasets(str(tmp_path))
+    clear_caches()
+
+
+def test_stop_cancels_pending_tasks_and_joins(tmp_path: Path, monkeypatch) -> None:
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(value: str, product: str, root: Path) -> Path | None:
+        started.set()
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(warmup, "ensure_birdcast_tile", slow)
+    clear_caches()
+    scheduler = WarmupScheduler(tmp_path, species=[], days=5, today=date(2026, 4, 2), max_workers=1)
+    scheduler.start()
+    assert started.wait(5)
+    stopper = threading.Thread(target=scheduler.stop)
+    stopper.start()
+    release.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive() and scheduler.wait(0)
+    progress = scheduler.progress()
+    assert progress["state"] == "cancelled"
+    assert progress["completed"] == 1
+    clear_caches()
+
+
+def test_warmup_only_invalidates_downloaded_files(tmp_path: Path, monkeypatch) -> None:
+    _fake_birdflow("grus_grus", tmp_path)
+    invalidated: list[Path] = []
+    monkeypatch.setattr(warmup, "ensure_birdflow_route", _fake_birdflow)
+    monkeypatch.setattr(warmup, "ensure_birdcast_tile", lambda value, product, root: None)
+    monkeypatch.setattr(warmup, "invalidate_paths", invalidated.extend)
+    clear_caches()
+    scheduler = WarmupScheduler(
+        tmp_path, species=["grus_grus", "ciconia_ciconia"], days=0, max_workers=1
+    )
+    scheduler.start()
+    assert scheduler.wait(5)
+    assert invalidated == [birdflow_dir(tmp_path) / "ciconia_ciconia.geojson"]
+    clear_caches()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+
+from migration_mcp.wire import (
+    compress,
+    decode_deckgl_binary,
+    encode_deckgl_binary,
+    negotiate_encoding,
+    zstd_available,
+)
+
+LAYER = {
+    "path": [[10.0, 50.0], [10.5, 50.25], [11.0, 50.5]],
+    "timestamps": ["2024-04-01T00:00:00Z", "2024-04-01T01:00:00Z", "2024-04-01T02:00:00Z"],
+    "altitudes": [100.0, 150.0, 175.0],
+    "label": "crane",
+}
+
+
+@pytest.mark.parametrize("precision", ["float32", "float64"])
+def test_deckgl_binary_round_trip(precision: str) -> None:
+    body = encode_deckgl_binary([LAYER], {"status": "dataset"}, precision)
+    header = decode_deckgl_binary(body)
+    attributes = header["attributes"]
+    assert header["metadata"] == {"status": "dataset"}
+    assert header["labels"] == ["crane"]
+    assert header["startIndices"] == [0]
+    assert attributes["getPath"]["size"] == 2
+    assert attributes["getPath"]["value"] == [10.0, 50.0, 10.5, 50.25, 11.0, 50.5]
+    assert attributes["getAltitude"]["value"] == [100.0, 150.0, 175.0]
+    seconds = [header["time_origin"] + value for value in attributes["getTimestamps"]["value"]]
+    assert seconds == [1711929600.0, 1711933200.0, 1711936800.0]
+    assert all(attribute["offset"] % 8 == 0 for attribute in attributes.values())
+
+
+def test_deckgl_binary_concatenates_individuals() -> None:
+    other = {"path": [[0.0, 1.0], [2.0, 3.0]], "timestamps": [0, 1], "altitudes": [0.0, 0.0]}
+    body = encode_deckgl_binary([LAYER, {**other, "individual": "b"}], {}, "float64")
+    header = decode_deckgl_binary(body)
+    assert header["startIndices"] == [0, 3]
+    assert header["labels"] == ["crane", None]
+    assert header["individuals"] == [None, "b"]
+    assert header["attributes"]["getPath"]["length"] == 5
+    assert header["attributes"]["getTimestamps"]["value"][3:] == [0.0, 1.0]
+
+
+def test_encoding_negotiation_and_compression() -> None:
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, br") is None
+    assert negotiate_encoding(None) is None
+    expected = "zstd" if zstd_available() else "gzip"
+    assert negotiate_encoding("zstd, gzip") == expected
+
+    body = b'{"coordinates":' + b"[1.0,2.0]," * 500 + b"}"
+    packed, encoding = compress(body, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(packed) == body
+    assert len(packed) < len(body) // 5
+    assert compress(b"{}", "gzip") == (b"{}", None)